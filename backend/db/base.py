@@ -1,17 +1,67 @@
+import threading
+
 from db.duckdb_engine import DuckDBEngine
 from db.postgres_engine import PostgresEngine
 from db.mysql_engine import MySQLEngine
 
+# 엔진은 프로세스당 하나 (Postgres/MySQL 은 connection 풀을 요청 간에 공유)
+_ENGINE_CLASSES = {
+    "duckdb": DuckDBEngine,
+    "postgres": PostgresEngine,
+    "mysql": MySQLEngine,
+}
+_engines = {}
+_engines_lock = threading.Lock()
+
 
 def get_engine(name: str):
     """
-    요청된 엔진 이름에 따라 적절한 Engine 클래스를 반환.
+    요청된 엔진 이름에 따라 공유 Engine 인스턴스를 반환.
     FastAPI 라우터(sql.py)에서 호출.
     """
     name = name.lower()
 
-    if name == "duckdb":   return DuckDBEngine()
-    if name == "postgres": return PostgresEngine()
-    if name == "mysql":    return MySQLEngine()
+    if name not in _ENGINE_CLASSES:
+        raise ValueError(f"Unknown engine type: {name}")
+
+    with _engines_lock:
+        engine = _engines.get(name)
+        if engine is None:
+            engine = _engines[name] = _ENGINE_CLASSES[name]()
+    return engine
+
+
+def warm_up_engines(names) -> None:
+    """
+    풀을 쓰는 엔진의 connection 을 미리 열어 둔다 (첫 요청의 연결 지연 제거).
+    연결에 실패한 엔진은 건너뛴다 (첫 요청 때 다시 연결)
+    """
+    for name in names:
+        try:
+            engine = get_engine(name)
+        except ValueError:
+            continue
+        pool = getattr(engine, "pool", None)
+        if pool is not None:
+            pool.warm_up()
+
+
+def pool_stats() -> dict:
+    """이미 만들어진 엔진의 connection 풀 사용량 (엔진 이름 → stats)"""
+    with _engines_lock:
+        engines = dict(_engines)
+    return {
+        name: engine.pool.stats()
+        for name, engine in engines.items()
+        if getattr(engine, "pool", None) is not None
+    }
+
 
-    raise ValueError(f"Unknown engine type: {name}")
+def close_engines() -> None:
+    """앱 종료 시 풀에 남은 connection 정리"""
+    with _engines_lock:
+        for engine in _engines.values():
+            close = getattr(engine, "close", None)
+            if close is not None:
+                close()
+        _engines.clear()
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import math
+import statistics
+import time
+from collections import Counter
+from datetime import date, datetime, time as dtime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+from db.base import get_engine
+from db.executor import query_executor
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------
+# 엔진 간 결과 비교용 정규화
+# ----------------------------------------
+
+
+def _normalize_value(value: Any) -> Any:
+    """
+    엔진마다 다른 타입을 같은 값으로 맞춘다
+    - 숫자(int/float/Decimal) → 유효숫자 9자리 float (INT vs BIGINT vs NUMERIC)
+    - tz 있는 timestamp → UTC 기준 tz 없는 값 (Postgres now() vs DuckDB timestamp)
+    - 날짜/시간 → ISO 문자열
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        f = float(value)
+        if math.isnan(f) or math.isinf(f):
+            return str(f)
+        return float(f"{f:.9g}")
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, (date, dtime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def row_multiset(table: pa.Table) -> Counter:
+    """행 순서와 무관한 비교용 (정규화된 행 튜플 → 개수)"""
+    columns = [
+        [_normalize_value(v) for v in column.to_pylist()] for column in table.columns
+    ]
+    return Counter(zip(*columns))
+
+
+# ----------------------------------------
+# 벤치마크
+# ----------------------------------------
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    # p95: nearest-rank
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(p95, 3),
+        "mean": round(statistics.fmean(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+async def _bench_engine(
+    name: str, query: str, repeat: int, warmup: int, timeout: float
+) -> Dict[str, Any]:
+    """한 엔진에서 warmup 회 버리고 repeat 회 순서대로 실행 (ms)"""
+    engine = get_engine(name)
+    samples: List[float] = []
+    table: Optional[pa.Table] = None
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        # Arrow 로 받아 행별 변환 비용이 엔진 시간에 섞이지 않게
+        table = await query_executor.run(
+            name,
+            lambda job: engine.run(query, job, arrow=True, max_rows=settings.SQL_MAX_ROWS),
+            timeout,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    # SQL_MAX_ROWS 에서 끊긴 결과는 전체를 읽은 시간이 아니다 (비교도 잘린 결과끼리)
+    truncated = table.num_rows > settings.SQL_MAX_ROWS
+    return {
+        "latency_ms": _latency_stats(samples),
+        "samples_ms": [round(s, 3) for s in samples],
+        "rows": min(table.num_rows, settings.SQL_MAX_ROWS),
+        "truncated": truncated,
+        "columns": table.column_names,
+        "table": table.slice(0, settings.SQL_MAX_ROWS),
+    }
+
+
+async def run_bench(
+    query: str,
+    engines: List[str],
+    repeat: int,
+    warmup: int,
+    timeout: float,
+    concurrent: bool = True,
+) -> Dict[str, Any]:
+    """
+    같은 쿼리를 여러 엔진에서 반복 실행해 지연 시간 분포와 결과 일치 여부를 반환.
+    concurrent=True 면 엔진끼리는 동시에 (엔진 안에서는 순서대로) 돌린다.
+    결과 비교는 첫 번째로 성공한 엔진을 기준으로 행 순서를 무시하고 한다.
+    """
+    jobs = [_bench_engine(name, query, repeat, warmup, timeout) for name in engines]
+    if concurrent:
+        outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+    else:
+        outcomes = []
+        for job in jobs:
+            try:
+                outcomes.append(await job)
+            except Exception as e:
+                outcomes.append(e)
+
+    results: Dict[str, Any] = {}
+    tables: Dict[str, pa.Table] = {}
+    for name, outcome in zip(engines, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.info("bench failed (%s): %s", name, outcome)
+            results[name] = {"error": str(outcome)}
+        else:
+            tables[name] = outcome.pop("table")
+            results[name] = outcome
+
+    comparison: Dict[str, Any] = {"reference": None, "equal": {}}
+    if tables:
+        reference = next(iter(tables))
+        expected = row_multiset(tables[reference])
+        comparison["reference"] = reference
+        for name, table in tables.items():
+            comparison["equal"][name] = (
+                table.num_columns == tables[reference].num_columns
+                and row_multiset(table) == expected
+            )
+
+    return {
+        "query": query,
+        "repeat": repeat,
+        "warmup": warmup,
+        "concurrent": concurrent,
+        "engines": results,
+        "comparison": comparison,
+    }
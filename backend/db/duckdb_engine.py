@@ -1,19 +1,187 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 import duckdb
+import pyarrow as pa
 from settings import settings
+from db.profiling import StageTimer, normalize_duckdb
+
+
+class DuckDBManager:
+    """
+    프로세스 전역 DuckDB connection 관리자.
+    - DB 파일은 처음 쓸 때 한 번만 열고 계속 유지한다 (버퍼 캐시 재사용)
+    - 요청마다 cursor() 로 가벼운 connection 을 나눠 준다 (스레드별로 안전)
+    - reader(): READ ONLY 트랜잭션 안에서 실행 → 쓰기 시도는 에러
+    - writer(): 쓰기 cursor, 프로세스 안에서는 한 번에 하나씩만 (write-write 충돌 방지)
+
+    같은 프로세스의 generator 가 duckdb.connect(같은 경로)로 여는 connection 도
+    DuckDB 인스턴스 캐시를 통해 같은 DB 인스턴스를 공유한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._con = None
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        if self._con is None:
+            with self._open_lock:
+                if self._con is None:
+                    parent = os.path.dirname(self.path)
+                    if parent:
+                        os.makedirs(parent, exist_ok=True)
+                    con = duckdb.connect(self.path)
+                    self._apply_limits(con)
+                    self._con = con
+        return self._con
+
+    def _apply_limits(self, con: duckdb.DuckDBPyConnection) -> None:
+        # memory_limit / threads 는 DB 인스턴스 전역 설정 (generator 가 같은 인스턴스를 써도 적용)
+        # connect(config=...) 로 주면 같은 경로를 설정 없이 여는 generator 와 충돌하므로 SET GLOBAL
+        if settings.DUCKDB_MEMORY_LIMIT:
+            con.execute(f"SET GLOBAL memory_limit = '{settings.DUCKDB_MEMORY_LIMIT}'")
+        if settings.DUCKDB_THREADS > 0:
+            con.execute(f"SET GLOBAL threads = {int(settings.DUCKDB_THREADS)}")
+
+    @contextmanager
+    def reader(self):
+        cur = self._connection().cursor()
+        try:
+            cur.execute("BEGIN TRANSACTION READ ONLY")
+            yield cur
+        finally:
+            try:
+                cur.execute("ROLLBACK")
+            except duckdb.Error:
+                pass
+            cur.close()
+
+    @contextmanager
+    def writer(self):
+        with self._write_lock:
+            cur = self._connection().cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    def close(self) -> None:
+        with self._open_lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+
+duckdb_manager = DuckDBManager(settings.DUCKDB_PATH)
+
+
+def get_duckdb() -> DuckDBManager:
+    return duckdb_manager
+
+
+def _fetch_arrow(con, max_rows: Optional[int]) -> pa.Table:
+    """
+    execute() 뒤의 결과를 Arrow 로. max_rows 가 있으면 max_rows + 1 행까지만 읽고 멈춘다
+    (스트리밍 결과라 나머지는 만들어지지도 않음. 한 행 더 읽어서 잘렸는지 호출한 쪽이 안다)
+    """
+    if max_rows is None:
+        return con.fetch_arrow_table()
+    limit = max_rows + 1
+    to_reader = getattr(con, "to_arrow_reader", None) or con.fetch_record_batch
+    reader = to_reader(limit)
+    batches = []
+    n = 0
+    for batch in reader:
+        batches.append(batch)
+        n += batch.num_rows
+        if n >= limit:
+            break
+    return pa.Table.from_batches(batches, schema=reader.schema).slice(0, limit)
+
 
-duck_con = duckdb.connect(settings.DUCKDB_PATH, read_only=False)
 class DuckDBEngine:
     """
-    DuckDB는 connection.execute() 로 바로 pandas DataFrame 반환이 가능하므로
+    DuckDB는 connection.execute() 로 바로 DataFrame / Arrow 반환이 가능하므로
     Postgres/MySQL 과 달리 conn/cursor 개념이 필요 없다.
+    - connection(query) : 조회문이면 공유 DB 의 읽기 전용 cursor, 쓰기 문장이면 writer cursor
+      (with 블록 끝에서 정리)
+    - run(query, job, arrow, max_rows, read_only) : 취소 가능한 실행 (job.cancel() → cursor.interrupt())
+      read_only=True 면 쓰기 문장도 읽기 전용 cursor 에서 (실패한다. 채점용)
+      arrow=True 면 dict 변환 없이 pyarrow.Table 그대로
+      max_rows 가 있으면 최대 max_rows + 1 행만 가져온다 (넘쳤는지는 호출한 쪽이 판단)
+    - stream(query, job, batch_rows) : 컬럼 목록 → fetchmany 배치 순서로 yield
+    - profile(query, job) : 실행 결과 + 연산자 프로파일 + 단계별 시간 (한 번만 실행)
     """
 
-    def connect(self):
-        return duckdb.connect(settings.DUCKDB_PATH)
+    def connection(self, query: Optional[str] = None):
+        # query_cache 가 이 모듈을 import 하므로 여기서
+        from db.query_cache import is_read_only, normalize_sql
+
+        if query is None or is_read_only(normalize_sql(query)):
+            return duckdb_manager.reader()
+        return duckdb_manager.writer()
+
+    def run(
+        self,
+        query: str,
+        job,
+        arrow: bool = False,
+        max_rows: Optional[int] = None,
+        read_only: bool = False,
+    ):
+        con_ctx = duckdb_manager.reader() if read_only else self.connection(query)
+        with con_ctx as con, job.bound(con.interrupt):
+            con.execute(query)
+            table = _fetch_arrow(con, max_rows)
+        if arrow:
+            return table
+        # pandas 를 거치면 정수 컬럼의 NULL 이 NaN(→ 나머지도 float)이 된다
+        return {
+            "columns": table.column_names,
+            "rows": table.to_pylist(),
+        }
+
+    def stream(self, query: str, job, batch_rows: int):
+        with self.connection(query) as con, job.bound(con.interrupt):
+            con.execute(query)
+            yield [d[0] for d in con.description or []]
+            while True:
+                rows = con.fetchmany(batch_rows)
+                if not rows:
+                    break
+                yield rows
+
+    def profile(self, query: str, job, max_rows: Optional[int] = None):
+        timer = StageTimer()
+        start = time.perf_counter()
+        with self.connection(query) as con, job.bound(con.interrupt):
+            timer.since("connect", start)
+            # cursor 별 설정이라 다른 요청에는 영향 없음
+            con.execute("SET enable_profiling = 'no_output'")
+            with timer.stage("execute"):
+                con.execute(query)
+            with timer.stage("fetch"):
+                table = _fetch_arrow(con, max_rows)
+            raw = json.loads(con.get_profiling_information(format="json"))
+        with timer.stage("convert"):
+            rows = table.to_pylist()
+        return {
+            "columns": table.column_names,
+            "rows": rows,
+            "timings": timer.as_dict(),
+            "plan": normalize_duckdb(raw),
+            "raw_plan": raw,
+        }
 
     def execute(self, query: str):
-        con = self.connect()
-        df = con.execute(query).df()
-        con.close()
+        with self.connection(query) as con:
+            return con.execute(query).df()
 
-        return df
+    def close(self) -> None:
+        duckdb_manager.close()
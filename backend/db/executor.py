@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 연결이 끊겼는지 / 제한 시간이 지났는지 확인하는 주기(초)
+_POLL_SECONDS = 0.25
+
+# 취소 후 워커 스레드가 정리(반납)될 때까지 기다리는 최대 시간(초)
+_CANCEL_GRACE_SECONDS = 5.0
+
+_END = object()
+
+
+class QueryCancelled(Exception):
+    """클라이언트 연결이 끊겨 쿼리를 취소함"""
+
+
+class QueryTimeout(Exception):
+    """제한 시간 안에 쿼리가 끝나지 않음 (엔진 쪽 실행도 취소됨)"""
+
+
+class QueryBusy(Exception):
+    """제한 시간 안에 엔진의 동시 실행 슬롯을 얻지 못함"""
+
+
+class QueryJob:
+    """
+    워커 스레드에서 도는 쿼리 하나의 취소 핸들.
+    엔진은 실행 직전에 bound(cancel_fn) 로 취소 방법을 등록하고,
+    이벤트 루프 쪽은 cancel() 로 그 함수를 호출한다.
+    (DuckDB interrupt / Postgres cancel / MySQL KILL QUERY)
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.cancelled = False
+        self._cancel_fn: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def bound(self, cancel_fn: Callable[[], None]):
+        # 블록을 벗어나면 해제: 풀로 돌아간 connection 의 다음 쿼리를 취소하지 않도록
+        # (엔진은 connection 을 반납하기 전에 이 블록을 벗어난다)
+        with self._lock:
+            if self.cancelled:
+                raise QueryCancelled("query cancelled before start")
+            self._cancel_fn = cancel_fn
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._cancel_fn = None
+
+    def cancel(self) -> None:
+        # 락을 잡은 채로 호출: 실행이 막 끝난 쪽은 bound() 를 벗어나지 못하고 기다린다.
+        # 락 밖에서 부르면 그 사이 connection 이 풀로 돌아가 다른 요청의 쿼리를 취소할 수 있다
+        with self._lock:
+            self.cancelled = True
+            if self._cancel_fn is None:
+                return
+            try:
+                self._cancel_fn()
+            except Exception as e:
+                logger.warning("query cancel failed: %s", e)
+
+
+class QueryExecutor:
+    """
+    blocking DB 호출을 이벤트 루프 밖의 bounded 스레드 풀에서 실행.
+    - 엔진별 동시 실행 상한 (asyncio.Semaphore, 슬롯은 스레드가 실제로 끝날 때 반납)
+    - 요청당 제한 시간: 넘으면 엔진 쪽 실행을 취소하고 QueryTimeout
+    - is_disconnected() 가 True 가 되면 취소하고 QueryCancelled
+    - stream(): 엔진의 동기 제너레이터를 배치 단위로 스레드에서 당겨 온다
+      (제한 시간은 배치 하나를 가져오는 데 걸리는 시간에 적용)
+    """
+
+    def __init__(self, workers: int, limits: Dict[str, int]):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sql")
+        self._limits = {name: asyncio.Semaphore(n) for name, n in limits.items()}
+
+    async def run(
+        self,
+        engine_name: str,
+        fn: Callable[[QueryJob], Any],
+        timeout: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Any:
+        deadline = time.monotonic() + timeout
+        limit = await self._acquire(engine_name, timeout)
+
+        job = QueryJob(max(deadline - time.monotonic(), 0.001))
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool, fn, job)
+        except BaseException:
+            limit.release()
+            raise
+        future.add_done_callback(lambda _: limit.release())
+
+        return await self._wait(job, future, deadline, timeout, is_disconnected)
+
+    async def stream(
+        self,
+        engine_name: str,
+        fn: Callable[[QueryJob], Iterator[Any]],
+        timeout: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        fn(job) 이 돌려주는 동기 제너레이터의 항목을 하나씩 비동기로 yield.
+        다 읽기 전에 닫히면(클라이언트 끊김 등) 진행 중인 fetch 를 취소하고
+        제너레이터를 스레드에서 close() 해 cursor/connection 을 정리한다.
+        슬롯은 그 정리가 끝난 뒤에 반납된다.
+        """
+        limit = await self._acquire(engine_name, timeout)
+        loop = asyncio.get_running_loop()
+        job = QueryJob(timeout)
+        pending: Optional[asyncio.Future] = None
+        it = None
+        try:
+            it = fn(job)
+            while True:
+                pending = loop.run_in_executor(self._pool, next, it, _END)
+                deadline = time.monotonic() + timeout
+                item = await self._wait(job, pending, deadline, timeout, is_disconnected)
+                pending = None
+                if item is _END:
+                    break
+                yield item
+        finally:
+            self._close_stream(loop, job, it, pending, limit)
+
+    def _close_stream(self, loop, job, it, pending, limit) -> None:
+        # async generator 가 취소되는 중일 수 있어 await 없이 정리를 예약만 한다
+        def release() -> None:
+            loop.call_soon_threadsafe(limit.release)
+
+        def close(_=None) -> None:
+            if it is None:
+                release()
+                return
+            self._pool.submit(it.close).add_done_callback(lambda _: release())
+
+        if pending is not None and not pending.done():
+            loop.run_in_executor(None, job.cancel)
+            pending.add_done_callback(close)
+        else:
+            close()
+
+    async def _acquire(self, engine_name: str, timeout: float) -> asyncio.Semaphore:
+        limit = self._limits[engine_name]
+        # 대기열에서 보낸 시간도 제한 시간에 포함
+        try:
+            await asyncio.wait_for(limit.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise QueryBusy(f"{engine_name} is busy (no free slot within {timeout:g}s)")
+        return limit
+
+    async def _wait(
+        self,
+        job: QueryJob,
+        future: asyncio.Future,
+        deadline: float,
+        timeout: float,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+    ) -> Any:
+        while True:
+            remaining = deadline - time.monotonic()
+            done, _ = await asyncio.wait({future}, timeout=min(_POLL_SECONDS, max(remaining, 0)))
+            if done:
+                return future.result()
+
+            if remaining <= 0:
+                await self._cancel(job, future)
+                raise QueryTimeout(f"query timed out after {timeout:g}s")
+
+            if is_disconnected is not None and await is_disconnected():
+                await self._cancel(job, future)
+                raise QueryCancelled("client disconnected")
+
+    async def _cancel(self, job: QueryJob, future: asyncio.Future) -> None:
+        # 취소 요청은 네트워크 왕복(pg cancel / KILL QUERY)이 있을 수 있어 스레드에서
+        await asyncio.get_running_loop().run_in_executor(None, job.cancel)
+        await asyncio.wait({future}, timeout=_CANCEL_GRACE_SECONDS)
+        if future.done() and not future.cancelled():
+            future.exception()  # 취소로 생긴 예외는 여기서 소비
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+query_executor = QueryExecutor(
+    settings.SQL_WORKERS,
+    {
+        "duckdb": settings.SQL_MAX_CONCURRENT_DUCKDB,
+        "postgres": settings.SQL_MAX_CONCURRENT_POSTGRES,
+        "mysql": settings.SQL_MAX_CONCURRENT_MYSQL,
+    },
+)
@@ -1,15 +1,56 @@
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 import mysql.connector
 from settings import settings
+from db.pool import ConnectionPool
+from db.profiling import StageTimer, normalize_mysql
+from utils.arrow import rows_to_table
+
+
+def _ping(conn) -> bool:
+    # is_connected() 는 내부적으로 ping 을 보낸다 (재접속은 하지 않음)
+    return conn.is_connected()
+
+
+def _explainable(query: str) -> bool:
+    # EXPLAIN ANALYZE 는 조회문에만 (DML 을 두 번 실행하지 않게)
+    head = query.lstrip().split(None, 1)[0].lower() if query.strip() else ""
+    return head in ("select", "with", "table", "(")
+
+
+def _reset(conn) -> None:
+    # 읽지 않은 결과가 남아 있으면 rollback 이 실패 → 풀에서 버린다
+    conn.rollback()
 
 
 class MySQLEngine:
     """
     MySQL 실행 엔진
-    - connect() : MySQL Connection 반환
+    - connect() : 풀에서 MySQL Connection 을 꺼냄 (다 쓰면 release(conn))
+    - connection() : with 블록용 (자동 반납)
     - execute(conn, query) : dict 형식 결과 반환
+    - execute_arrow(conn, query) : pyarrow.Table 반환 (튜플 → 컬럼 배열, 행별 dict 없음)
+    - run(query, job, arrow, max_rows) : 취소 가능한 실행 (job.cancel() → 별도 connection 에서 KILL QUERY)
+      max_rows 가 있으면 unbuffered cursor 로 max_rows + 1 행만 읽고, 남은 결과는
+      KILL QUERY 후 connection 째 버린다 (읽지 않은 결과가 남은 connection 은 재사용 불가)
+    - stream(query, job, batch_rows) : unbuffered cursor 로 배치씩 yield
+    - profile(query, job) : 실행 결과 + EXPLAIN ANALYZE (TREE) 계획 + 단계별 시간
     """
 
-    def connect(self):
+    def __init__(self):
+        self.pool = ConnectionPool(
+            self._connect,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            idle_timeout=settings.DB_POOL_IDLE_TIMEOUT,
+            acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+            health_check=_ping if settings.DB_POOL_HEALTH_CHECK else None,
+            reset=_reset,
+        )
+
+    def _connect(self):
         return mysql.connector.connect(
             host=settings.MYSQL_HOST,
             port=settings.MYSQL_PORT,
@@ -18,6 +59,168 @@ class MySQLEngine:
             password=settings.MYSQL_PASS,
         )
 
+    def connect(self):
+        return self.pool.acquire()
+
+    def release(self, conn) -> None:
+        self.pool.release(conn)
+
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as conn:
+            yield conn
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _kill_query(self, connection_id: int) -> None:
+        # 실행 중인 connection 은 블록되어 있으므로 풀 밖의 새 connection 으로
+        killer = self._connect()
+        try:
+            cur = killer.cursor()
+            cur.execute(f"KILL QUERY {int(connection_id)}")
+            cur.close()
+        finally:
+            killer.close()
+
+    def run(self, query: str, job, arrow: bool = False, max_rows: Optional[int] = None):
+        conn = self.pool.acquire()
+        exhausted = True
+        try:
+            # 서버 쪽 안전망 (SELECT 에만 적용). 풀 connection 이라 매번 다시 설정
+            cur = conn.cursor()
+            cur.execute(
+                "SET SESSION max_execution_time = %s", (int(job.timeout * 1000),)
+            )
+            cur.close()
+
+            connection_id = conn.connection_id
+            with job.bound(lambda: self._kill_query(connection_id)):
+                if max_rows is None:
+                    if arrow:
+                        return self.execute_arrow(conn, query)
+                    return self.execute(conn, query)
+                columns, rows, exhausted = self._fetch_limited(conn, query, max_rows)
+                if not exhausted:
+                    # 서버가 나머지 결과를 계속 만들지 않게
+                    self._kill_query(connection_id)
+        finally:
+            self.pool.release(conn, broken=not exhausted)
+
+        if arrow:
+            return rows_to_table(columns, rows)
+        return {
+            "columns": columns,
+            "rows": [dict(zip(columns, row)) for row in rows],
+        }
+
+    def _fetch_limited(self, conn, query: str, max_rows: int):
+        """(columns, rows, 결과를 끝까지 읽었는지)"""
+        cur = conn.cursor(buffered=False)
+        cur.execute(query)
+        if cur.description is None:
+            conn.commit()
+            cur.close()
+            return [], [], True
+
+        columns = [col[0] for col in cur.description]
+        rows = cur.fetchmany(max_rows + 1)
+        if len(rows) <= max_rows:
+            # 요청보다 적게 왔으면 EOF 까지 읽은 것
+            cur.close()
+            return columns, rows, True
+        return columns, rows, False
+
+    def stream(self, query: str, job, batch_rows: int):
+        conn = self.pool.acquire()
+        exhausted = False
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "SET SESSION max_execution_time = %s", (int(job.timeout * 1000),)
+            )
+            cur.close()
+
+            connection_id = conn.connection_id
+            with job.bound(lambda: self._kill_query(connection_id)):
+                # unbuffered(기본값): 행은 fetchmany 할 때마다 서버에서 읽어 온다
+                cur = conn.cursor(buffered=False)
+                cur.execute(query)
+                if cur.description is None:
+                    conn.commit()
+                    exhausted = True
+                    yield []
+                    return
+
+                yield [col[0] for col in cur.description]
+                while True:
+                    rows = cur.fetchmany(batch_rows)
+                    if not rows:
+                        break
+                    yield rows
+                exhausted = True
+                cur.close()
+        finally:
+            # 다 읽지 못한 결과가 남은 connection 은 재사용할 수 없어 버린다
+            self.pool.release(conn, broken=not exhausted)
+
+    def profile(self, query: str, job, max_rows: Optional[int] = None):
+        timer = StageTimer()
+        start = time.perf_counter()
+        conn = self.pool.acquire()
+        exhausted = True
+        try:
+            timer.since("connect", start)
+            cur = conn.cursor()
+            cur.execute(
+                "SET SESSION max_execution_time = %s", (int(job.timeout * 1000),)
+            )
+            cur.close()
+
+            connection_id = conn.connection_id
+            with job.bound(lambda: self._kill_query(connection_id)):
+                raw = None
+                if _explainable(query):
+                    # EXPLAIN ANALYZE 는 쿼리를 한 번 더 실행한다.
+                    # 본 실행이 max_rows 에서 끊기면 그 connection 을 더 못 쓰므로 먼저 돌린다
+                    cur = conn.cursor()
+                    try:
+                        with timer.stage("explain"):
+                            cur.execute("EXPLAIN ANALYZE " + query)
+                            raw = cur.fetchone()[0]
+                    finally:
+                        cur.close()
+
+                if max_rows is None:
+                    cur = conn.cursor()
+                    try:
+                        with timer.stage("execute"):
+                            cur.execute(query)
+                        columns = [col[0] for col in cur.description or []]
+                        with timer.stage("fetch"):
+                            rows = cur.fetchall() if cur.description else []
+                    finally:
+                        cur.close()
+                    if not columns:
+                        conn.commit()
+                else:
+                    with timer.stage("execute"):
+                        columns, rows, exhausted = self._fetch_limited(conn, query, max_rows)
+                    if not exhausted:
+                        self._kill_query(connection_id)
+        finally:
+            self.pool.release(conn, broken=not exhausted)
+
+        with timer.stage("convert"):
+            rows = [dict(zip(columns, row)) for row in rows]
+        return {
+            "columns": columns,
+            "rows": rows,
+            "timings": timer.as_dict(),
+            "plan": normalize_mysql(raw) if raw else None,
+            "raw_plan": raw,
+        }
+
     def execute(self, conn, query: str):
         cur = conn.cursor()
 
@@ -43,3 +246,20 @@ class MySQLEngine:
 
         finally:
             cur.close()
+
+    def execute_arrow(self, conn, query: str):
+        # 행별 dict 없이 튜플 → 컬럼 단위 Arrow 배열
+        cur = conn.cursor()
+
+        try:
+            cur.execute(query)
+
+            if cur.description:
+                columns = [col[0] for col in cur.description]
+                return rows_to_table(columns, cur.fetchall())
+
+            conn.commit()
+            return rows_to_table([], [])
+
+        finally:
+            cur.close()
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Iterator, Optional, Tuple
+
+
+class PoolTimeout(Exception):
+    """acquire_timeout 안에 빈 connection 을 얻지 못함"""
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 범용 connection 풀 (Postgres / MySQL 공용).
+
+    - min_size: 미리 열어 두고 idle 정리 후에도 유지하는 connection 수
+    - max_size: 동시에 열 수 있는 최대 connection 수 (넘으면 대기)
+    - idle_timeout: 이 시간(초) 이상 놀던 connection 은 min_size 를 넘는 만큼 닫는다
+    - health_check: 꺼낼 때 살아 있는지 확인하는 함수 (False/예외면 버리고 새로 연다)
+    - reset: 돌려받을 때 트랜잭션 정리 (실패하면 그 connection 은 버린다)
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        acquire_timeout: float = 30.0,
+        health_check: Optional[Callable[[Any], bool]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("pool requires 1 <= max_size and min_size <= max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self._health_check = health_check
+        self._reset = reset
+
+        # (connection, 반납 시각) — 최근 반납한 것부터 꺼낸다
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ----------------------------------------
+    # 내부 유틸
+    # ----------------------------------------
+
+    def _discard(self, conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn: Any) -> bool:
+        if self._health_check is None:
+            return True
+        try:
+            return bool(self._health_check(conn))
+        except Exception:
+            return False
+
+    def _prune_idle(self) -> None:
+        # _cond 를 잡은 상태에서 호출. 오래된 것(왼쪽)부터 min_size 까지만 남긴다
+        now = time.monotonic()
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._discard(conn)
+
+    # ----------------------------------------
+    # public API
+    # ----------------------------------------
+
+    def acquire(self) -> Any:
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                self._prune_idle()
+
+                conn = None
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                elif self._size < self.max_size:
+                    # 자리를 먼저 잡고 실제 연결은 락 밖에서
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"no free connection within {self.acquire_timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if conn is not None:
+                if self._is_healthy(conn):
+                    return conn
+                # 끊긴 connection: 버리고 자리는 새 connection 으로 채운다
+                self._discard(conn)
+
+            try:
+                return self._connect()
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+
+    def release(self, conn: Any, broken: bool = False) -> None:
+        if not broken and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                broken = True
+
+        with self._cond:
+            if broken or self._closed:
+                self._size -= 1
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        with pool.connection() as conn: ...
+        블록 안에서 예외가 나도 반납한다 (reset 에서 rollback).
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def warm_up(self) -> None:
+        """min_size 만큼 미리 연결 (실패해도 첫 요청 때 다시 시도)"""
+        conns = []
+        try:
+            for _ in range(self.min_size):
+                conns.append(self.acquire())
+        except Exception:
+            pass
+        finally:
+            for conn in conns:
+                self.release(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
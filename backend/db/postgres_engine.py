@@ -1,16 +1,77 @@
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from settings import settings
+from db.pool import ConnectionPool
+from db.profiling import StageTimer, normalize_postgres
+from utils.arrow import rows_to_table
+
+
+def _ping(conn) -> bool:
+    if conn.closed:
+        return False
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+    conn.rollback()
+    return True
+
+
+def _set_limits(conn, timeout: float) -> None:
+    """
+    서버 쪽 안전망: 취소 요청이 유실돼도 statement_timeout 에서 끊긴다.
+    lock_timeout: 전체 재생성(테이블을 한 트랜잭션에서 다시 만들고 적재) 중에는
+    테이블 락에 막히므로 제한 시간까지 기다리지 않고 빨리 실패한다.
+    (SET LOCAL 은 이 트랜잭션에만 적용, 반납 시 rollback 으로 원복)
+    """
+    lock_timeout = settings.SQL_PG_LOCK_TIMEOUT_SECONDS
+    lock_timeout = min(lock_timeout, timeout) if lock_timeout > 0 else timeout
+    with conn.cursor() as cur:
+        cur.execute("SET LOCAL statement_timeout = %s", (int(timeout * 1000),))
+        cur.execute("SET LOCAL lock_timeout = %s", (int(lock_timeout * 1000),))
+
+
+def _returns_rows(query: str) -> bool:
+    # named cursor(DECLARE ... CURSOR FOR) 는 SELECT 류에만 쓸 수 있다
+    head = query.lstrip().split(None, 1)[0].lower() if query.strip() else ""
+    return head in ("select", "with", "values", "table", "(")
+
+
+def _reset(conn) -> None:
+    # 반납 전에 열린 트랜잭션 정리 (idle in transaction 방지)
+    if conn.closed:
+        raise psycopg2.InterfaceError("connection already closed")
+    conn.rollback()
 
 
 class PostgresEngine:
     """
     PostgreSQL 실행 엔진
-    - connect() : connection 반환
+    - connect() : 풀에서 connection 을 꺼냄 (다 쓰면 release(conn))
+    - connection() : with 블록용 (자동 반납)
     - execute(conn, query) : dict 형식 결과 반환
+    - execute_arrow(conn, query) : pyarrow.Table 반환 (튜플 → 컬럼 배열, 행별 dict 없음)
+    - run(query, job, arrow, max_rows) : 취소 가능한 실행 (job.cancel() → cancel 요청 = pg_cancel_backend)
+      max_rows 가 있으면 조회문은 server-side cursor 로 max_rows + 1 행만 가져온다
+      (기본 cursor 는 결과 전체를 클라이언트 메모리로 받아 버린다)
+    - stream(query, job, batch_rows) : server-side(named) cursor 로 배치씩 yield
+    - profile(query, job) : 실행 결과 + EXPLAIN (ANALYZE, BUFFERS) 계획 + 단계별 시간
     """
 
-    def connect(self):
+    def __init__(self):
+        self.pool = ConnectionPool(
+            self._connect,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            idle_timeout=settings.DB_POOL_IDLE_TIMEOUT,
+            acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+            health_check=_ping if settings.DB_POOL_HEALTH_CHECK else None,
+            reset=_reset,
+        )
+
+    def _connect(self):
         return psycopg2.connect(
             host=settings.PG_HOST,
             port=settings.PG_PORT,
@@ -19,6 +80,109 @@ class PostgresEngine:
             password=settings.PG_PASS,
         )
 
+    def connect(self):
+        return self.pool.acquire()
+
+    def release(self, conn) -> None:
+        self.pool.release(conn)
+
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as conn:
+            yield conn
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def run(self, query: str, job, arrow: bool = False, max_rows: Optional[int] = None):
+        with self.connection() as conn, job.bound(conn.cancel):
+            _set_limits(conn, job.timeout)
+            if max_rows is not None and _returns_rows(query):
+                columns, rows = self._fetch_limited(conn, query, max_rows)
+                if arrow:
+                    return rows_to_table(columns, rows)
+                return {
+                    "columns": columns,
+                    "rows": [dict(zip(columns, row)) for row in rows],
+                }
+            if arrow:
+                return self.execute_arrow(conn, query)
+            return self.execute(conn, query)
+
+    def _fetch_limited(self, conn, query: str, max_rows: int):
+        # named cursor: 서버가 FETCH 한 만큼만 보낸다
+        with conn.cursor(name="sql_run") as cur:
+            cur.execute(query)
+            rows = cur.fetchmany(max_rows + 1)
+            columns = [col.name for col in cur.description or []]
+        return columns, rows
+
+    def stream(self, query: str, job, batch_rows: int):
+        with self.connection() as conn, job.bound(conn.cancel):
+            # statement_timeout 은 FETCH 한 번마다 적용된다
+            _set_limits(conn, job.timeout)
+
+            if not _returns_rows(query):
+                # named cursor 를 못 쓰는 문장 (EXPLAIN / SHOW / INSERT ... RETURNING / CALL 등):
+                # 일반 cursor 로 실행해 결과가 있으면 한 번에 내보낸다
+                with conn.cursor() as cur:
+                    cur.execute(query)
+                    columns = [col.name for col in cur.description or []]
+                    rows = cur.fetchall() if cur.description else []
+                conn.commit()
+                yield columns
+                if rows:
+                    yield rows
+                return
+
+            with conn.cursor(name="sql_stream") as cur:
+                cur.itersize = batch_rows
+                cur.execute(query)
+                # named cursor 는 첫 FETCH 뒤에야 description 이 채워진다
+                rows = cur.fetchmany(batch_rows)
+                yield [col.name for col in cur.description or []]
+                while rows:
+                    yield rows
+                    rows = cur.fetchmany(batch_rows)
+
+    def profile(self, query: str, job, max_rows: Optional[int] = None):
+        timer = StageTimer()
+        start = time.perf_counter()
+        with self.connection() as conn, job.bound(conn.cancel):
+            timer.since("connect", start)
+            _set_limits(conn, job.timeout)
+
+            # 조회문은 named cursor (max_rows + 1 행까지만 받는다)
+            named = max_rows is not None and _returns_rows(query)
+            with conn.cursor(name="sql_profile") if named else conn.cursor() as cur:
+                with timer.stage("execute"):
+                    cur.execute(query)
+                with timer.stage("fetch"):
+                    if named:
+                        rows = cur.fetchmany(max_rows + 1)
+                    else:
+                        rows = cur.fetchall() if cur.description else []
+                columns = [col.name for col in cur.description or []]
+
+            raw = None
+            if _returns_rows(query):
+                # EXPLAIN ANALYZE 는 쿼리를 한 번 더 실행한다 (조회문만)
+                with conn.cursor() as cur, timer.stage("explain"):
+                    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query)
+                    raw = cur.fetchone()[0]
+            else:
+                conn.commit()
+
+        with timer.stage("convert"):
+            rows = [dict(zip(columns, row)) for row in rows]
+        return {
+            "columns": columns,
+            "rows": rows,
+            "timings": timer.as_dict(),
+            "plan": normalize_postgres(raw) if raw else None,
+            "raw_plan": raw,
+        }
+
     def execute(self, conn, query: str):
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
@@ -44,3 +208,14 @@ class PostgresEngine:
 
         finally:
             cur.close()
+
+    def execute_arrow(self, conn, query: str):
+        # 기본 cursor 는 튜플을 돌려준다 → 컬럼 단위로 Arrow 배열
+        with conn.cursor() as cur:
+            cur.execute(query)
+            if cur.description:
+                columns = [col.name for col in cur.description]
+                return rows_to_table(columns, cur.fetchall())
+
+            conn.commit()
+            return rows_to_table([], [])
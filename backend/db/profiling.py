@@ -0,0 +1,182 @@
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# ----------------------------------------
+# 단계별 타이머 (connect / execute / fetch / serialize ...)
+# ----------------------------------------
+
+
+class StageTimer:
+    """
+    with timer.stage("execute"): ...
+    같은 이름으로 여러 번 재면 누적. 결과는 ms 단위 dict.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def since(self, name: str, start: float) -> None:
+        """with 로 감싸기 어려운 구간 (예: with 문 진입 = connection 획득)"""
+        elapsed = (time.perf_counter() - start) * 1000
+        self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(ms, 3) for name, ms in self.timings.items()}
+
+
+# ----------------------------------------
+# 엔진별 실행 계획 → 공통 구조
+#   {"operator", "detail", "rows", "loops", "time_ms", "children": [...]}
+#   time_ms 는 엔진이 알려 주는 연산자 시간 (Postgres/MySQL 은 자식 포함 누적)
+# ----------------------------------------
+
+
+def _node(
+    operator: str,
+    detail: Optional[str] = None,
+    rows: Optional[int] = None,
+    time_ms: Optional[float] = None,
+    loops: Optional[int] = None,
+    children: Optional[List[dict]] = None,
+    **extra: Any,
+) -> dict:
+    node = {
+        "operator": operator,
+        "detail": detail,
+        "rows": rows,
+        "loops": loops,
+        "time_ms": None if time_ms is None else round(time_ms, 3),
+        "children": children or [],
+    }
+    node.update({k: v for k, v in extra.items() if v is not None})
+    return node
+
+
+def normalize_duckdb(profile: dict) -> dict:
+    """
+    DuckDB 프로파일 JSON (enable_profiling='json' / get_profiling_information).
+    버전에 따라 키 이름이 달라서 둘 다 본다 (name/operator_name, timing/operator_timing ...)
+    """
+
+    def convert(op: dict) -> dict:
+        extra = op.get("extra_info")
+        if isinstance(extra, dict):
+            extra = ", ".join(f"{k}: {v}" for k, v in extra.items()) or None
+        timing = op.get("operator_timing", op.get("timing"))
+        return _node(
+            operator=op.get("operator_name") or op.get("name") or op.get("operator_type", "?"),
+            detail=(extra or "").strip() or None,
+            rows=op.get("operator_cardinality", op.get("cardinality")),
+            time_ms=None if timing is None else timing * 1000,
+            children=[convert(c) for c in op.get("children", [])],
+        )
+
+    latency = profile.get("latency", profile.get("timing"))
+    root = _node(
+        operator="QUERY",
+        rows=profile.get("rows_returned"),
+        time_ms=None if latency is None else latency * 1000,
+        children=[convert(c) for c in profile.get("children", [])],
+    )
+    return {
+        "total_ms": root["time_ms"],
+        "planning_ms": None,
+        "root": root,
+    }
+
+
+def normalize_postgres(explain: list) -> dict:
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) 결과"""
+
+    def fmt(value: Any) -> str:
+        # Sort Key / Group Key 는 리스트
+        return ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+
+    def convert(plan: dict) -> dict:
+        detail = ", ".join(
+            f"{key}: {fmt(plan[key])}"
+            for key in (
+                "Relation Name", "Index Name", "Join Type", "Strategy",
+                "Hash Cond", "Index Cond", "Filter", "Sort Key", "Group Key",
+            )
+            if plan.get(key)
+        )
+        return _node(
+            operator=plan.get("Node Type", "?"),
+            detail=detail or None,
+            rows=plan.get("Actual Rows"),
+            loops=plan.get("Actual Loops"),
+            time_ms=plan.get("Actual Total Time"),
+            children=[convert(c) for c in plan.get("Plans", [])],
+            estimated_rows=plan.get("Plan Rows"),
+            shared_hit_blocks=plan.get("Shared Hit Blocks"),
+            shared_read_blocks=plan.get("Shared Read Blocks"),
+        )
+
+    top = explain[0] if explain else {}
+    return {
+        "total_ms": top.get("Execution Time"),
+        "planning_ms": top.get("Planning Time"),
+        "root": convert(top.get("Plan", {})),
+    }
+
+
+# -> Table scan on events  (cost=1.2 rows=10) (actual time=0.05..0.3 rows=10 loops=1)
+_MYSQL_LINE = re.compile(r"^(?P<indent>\s*)-> (?P<body>.*)$")
+_MYSQL_ACTUAL = re.compile(
+    r"\(actual time=(?P<first>[\d.]+)\.\.(?P<last>[\d.]+) rows=(?P<rows>[\d.e+]+) loops=(?P<loops>\d+)\)"
+)
+_MYSQL_COST = re.compile(r"\s*\(cost=[^)]*\)")
+
+
+def normalize_mysql(tree: str) -> dict:
+    """EXPLAIN ANALYZE (FORMAT=TREE) 텍스트. 들여쓰기 깊이로 부모/자식을 잇는다"""
+    root = _node(operator="QUERY")
+    stack = [(-1, root)]
+    for line in tree.splitlines():
+        m = _MYSQL_LINE.match(line)
+        if not m:
+            continue
+        depth = len(m.group("indent"))
+        body = m.group("body")
+
+        rows = time_ms = loops = None
+        actual = _MYSQL_ACTUAL.search(body)
+        if actual:
+            # MySQL 의 actual time 은 loop 당 평균 → 전체 시간으로 환산
+            loops = int(actual.group("loops"))
+            time_ms = float(actual.group("last")) * loops
+            rows = int(float(actual.group("rows")) * loops)
+            body = body[: actual.start()]
+        elif "(never executed)" in body:
+            body = body.replace("(never executed)", "")
+            rows, loops = 0, 0
+        body = _MYSQL_COST.sub("", body).strip()
+
+        operator, _, detail = body.partition(": ")
+        node = _node(operator=operator, detail=detail or None, rows=rows, time_ms=time_ms, loops=loops)
+
+        while stack[-1][0] >= depth:
+            stack.pop()
+        stack[-1][1]["children"].append(node)
+        stack.append((depth, node))
+
+    top = root["children"][0] if root["children"] else root
+    root["time_ms"] = top["time_ms"]
+    root["rows"] = top["rows"]
+    return {
+        "total_ms": root["time_ms"],
+        "planning_ms": None,
+        "root": root,
+    }
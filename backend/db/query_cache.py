@@ -0,0 +1,358 @@
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+from db.duckdb_engine import get_duckdb
+from settings import settings
+from utils.serialize import dumps
+
+# 캐시해도 되는 문장의 첫 키워드 (조회만 하는 문장: 결과 / 실행 계획 / 메타데이터)
+_READ_KEYWORDS = {
+    "select", "with", "values", "table", "from",
+    "explain", "show", "describe", "desc", "summarize",
+}
+# 정보만 보여 주는 PRAGMA (PRAGMA threads = 4 같은 설정 변경은 쓰기로 본다)
+_READ_PRAGMAS = {
+    "table_info", "show", "show_tables", "show_tables_expanded", "database_list",
+    "database_size", "storage_info", "metadata_info", "version", "platform",
+    "functions", "collations", "user_agent",
+}
+_PRAGMA = re.compile(r"pragma\s+(\w+)\s*(?:\(|$)")
+# 문장 어디에 있든 읽기 전용으로 보지 않는 키워드 (WITH x AS (DELETE ...) 같은 CTE 포함)
+_WRITE = re.compile(
+    r"\b(insert|update|delete|merge|upsert|create|drop|alter|truncate"
+    r"|copy|grant|revoke|call|set|pragma|attach|detach|install|load|export"
+    r"|import|checkpoint|vacuum|lock)\b"
+)
+# EXPLAIN ANALYZE 는 실제로 실행한 시간이 결과라 매번 다르다 (캐시하지 않음)
+_EXPLAIN_ANALYZE = re.compile(r"^explain\s*\(?\s*analy[sz]e\b")
+# 실행할 때마다 값이 달라지는 함수 (캐시하지 않음)
+_VOLATILE = re.compile(
+    r"\b(random|rand|uuid|gen_random_uuid|setseed|now|current_date|current_time"
+    r"|current_timestamp|localtime|localtimestamp|sysdate|curdate|curtime"
+    r"|unix_timestamp|utc_timestamp|clock_timestamp|statement_timestamp"
+    r"|transaction_timestamp|timeofday|get_current_time|today|nextval)\b"
+)
+# 문자열/따옴표 식별자 | 주석 | 공백
+_TOKENS = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`)"
+    r"|(--[^\n]*|/\*.*?\*/)"
+    r"|(\s+)",
+    re.S,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    캐시 키용 SQL 정규화.
+    주석 제거, 공백 한 칸으로, 끝의 ; 제거, 따옴표 밖은 소문자.
+    (문자열 리터럴과 따옴표 식별자는 그대로 둔다)
+    """
+    parts = []
+    pos = 0
+    for m in _TOKENS.finditer(query):
+        if m.start() > pos:
+            parts.append(query[pos:m.start()].lower())
+        if m.group(1):
+            parts.append(m.group(1))
+        elif not parts or parts[-1] != " ":
+            # 주석/공백이 이어져도 한 칸 (리터럴 안의 공백은 건드리지 않는다)
+            parts.append(" ")
+        pos = m.end()
+    parts.append(query[pos:].lower())
+    sql = "".join(parts).strip()
+    return sql.rstrip("; ").strip()
+
+
+def _bare(sql: str) -> str:
+    # 문자열 리터럴을 지운 뒤에 검사 ('delete' 같은 값 때문에 놓치지 않게)
+    return _TOKENS.sub(" ", sql)
+
+
+def is_read_only(sql: str) -> bool:
+    """
+    정규화된 SQL 이 읽기 전용 단일 문장인지. 애매하면 False.
+    EXPLAIN ANALYZE 는 문장을 실제로 실행하므로 뒤의 문장이 쓰기면 쓰기.
+    """
+    bare = _bare(sql).strip()
+    if not bare or ";" in bare:
+        return False
+    first = bare.split(None, 1)[0].lstrip("(")
+    if first == "pragma":
+        m = _PRAGMA.match(bare)
+        if m is None or m.group(1) not in _READ_PRAGMAS:
+            return False
+        bare = bare[m.end(1):]
+    elif first not in _READ_KEYWORDS:
+        return False
+    return _WRITE.search(bare) is None
+
+
+def is_cacheable(sql: str) -> bool:
+    """
+    읽기 전용이고 결과가 매번 같은지.
+    애매하면 False (캐시하지 않을 뿐 실행에는 영향 없음).
+    """
+    bare = _bare(sql)
+    return (
+        is_read_only(sql)
+        and _VOLATILE.search(bare) is None
+        and _EXPLAIN_ANALYZE.match(bare.strip()) is None
+    )
+
+
+class CachedResult:
+    """
+    완료된 결과. 행은 JSON 으로 인코딩된 한 줄씩 (응답 때 다시 직렬화하지 않는다)
+    """
+
+    __slots__ = ("columns", "lines", "nbytes", "truncated")
+
+    def __init__(self, columns: List[str], lines: List[bytes], truncated: bool = False):
+        self.columns = columns
+        self.lines = lines
+        # 결과 크기 상한(SQL_MAX_ROWS / SQL_MAX_RESPONSE_BYTES)에서 잘린 결과인지
+        self.truncated = truncated
+        # 대략적인 메모리 사용량 (bytes 객체 오버헤드 포함)
+        self.nbytes = sum(len(line) for line in lines) + 40 * len(lines)
+
+    @classmethod
+    def from_rows(
+        cls,
+        columns: List[str],
+        rows: List[dict],
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> "CachedResult":
+        """
+        행을 JSON 줄로 인코딩. max_rows 를 넘는 행(엔진은 한 행 더 가져온다)과
+        max_bytes 를 넘기는 행부터는 버리고 truncated 로 표시
+        """
+        truncated = max_rows is not None and len(rows) > max_rows
+        if truncated:
+            rows = rows[:max_rows]
+        lines = []
+        size = 0
+        for row in rows:
+            line = dumps(row).encode()
+            size += len(line) + 2
+            if max_bytes is not None and size > max_bytes:
+                truncated = True
+                break
+            lines.append(line)
+        return cls(columns, lines, truncated)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.lines)
+
+    def rows_json(self) -> bytes:
+        return b"[" + b", ".join(self.lines) + b"]"
+
+    def body(self) -> bytes:
+        """{columns, rows, truncated} 응답 JSON"""
+        return (
+            b'{"columns": ' + dumps(self.columns).encode()
+            + b', "rows": ' + self.rows_json()
+            + b', "truncated": ' + dumps(self.truncated).encode() + b"}"
+        )
+
+
+# (엔진, 정규화 SQL, 데이터셋 버전, 엔진별 세대)
+CacheKey = Tuple[str, str, int, int]
+
+
+class QueryCache:
+    """
+    SQL 결과 캐시 (메모리 상한 LRU).
+    키: (엔진, 정규화된 SQL, 현재 dataset_versions.version_id, 엔진별 세대)
+
+    - 버전은 version_check 초마다 DuckDB 에서 (워커 스레드로) 다시 읽고, 바뀌면 전부 비운다
+    - 같은 프로세스의 데이터 생성은 suspended() 로 감싸서 생성 중에는 캐시를 끄고
+      끝나면 곧바로 새 버전으로 넘어간다
+    - max_entry_bytes 보다 큰 결과는 담지 않는다
+    - /sql/run 의 쓰기 문장 (Postgres/MySQL 은 커밋된다) 은 invalidate(engine) 으로
+      그 엔진의 세대를 올린다. 세대가 바뀌기 전에 시작한 조회 결과는 담지 않는다
+    - 담는 값은 nbytes 만 있으면 된다 (CachedResult, 채점용 Arrow 결과 등)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        version_check: float,
+        enabled: bool = True,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.version_check = version_check
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[CacheKey, CachedResult]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+        self._suspended = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ----------------------------------------
+    # 데이터셋 버전
+    # ----------------------------------------
+
+    def _read_version(self) -> int:
+        try:
+            with get_duckdb().reader() as con:
+                row = con.execute(
+                    "SELECT COALESCE(MAX(version_id), 0) FROM dataset_versions"
+                ).fetchone()
+            return int(row[0])
+        except duckdb.CatalogException:
+            return 0
+
+    async def _current_version(self) -> int:
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked < self.version_check:
+            return self._version
+        # 생성 중인 writer 등에 막혀도 이벤트 루프는 멈추지 않게 스레드에서 읽는다
+        version = await asyncio.to_thread(self._read_version)
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            self._version_checked = now
+        return version
+
+    def _clear(self) -> None:
+        # _lock 을 잡은 상태에서 호출
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def invalidate(self, engine: Optional[str] = None) -> None:
+        """
+        engine 이 없으면 전부 비우고 다음 조회 때 버전을 다시 읽는다.
+        engine 이 있으면 그 엔진의 항목만 비우고 세대를 올린다 (실행 중인 조회의 put 도 버려짐)
+        """
+        with self._lock:
+            if engine is None:
+                self._clear()
+                self._version = None
+                return
+            self._generations[engine] = self._generations.get(engine, 0) + 1
+            stale = [key for key in self._entries if key[0] == engine]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).nbytes
+            if stale:
+                self.invalidations += 1
+
+    @contextmanager
+    def suspended(self):
+        """
+        데이터를 다시 쓰는 동안 캐시 사용 중지.
+        with query_cache.suspended(): generate_data(...)
+        """
+        with self._lock:
+            self._suspended += 1
+            self._clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._suspended -= 1
+                self._clear()
+                self._version = None
+
+    # ----------------------------------------
+    # 조회 / 저장
+    # ----------------------------------------
+
+    async def key(self, engine: str, query: str) -> Optional[CacheKey]:
+        """캐시 대상이 아니면 None (버전을 다시 읽어야 하면 스레드에서)"""
+        if not self.enabled or self._suspended:
+            return None
+        sql = normalize_sql(query)
+        if not is_cacheable(sql):
+            return None
+        version = await self._current_version()
+        with self._lock:
+            generation = self._generations.get(engine, 0)
+        return (engine, sql, version, generation)
+
+    def get(self, key: Optional[CacheKey]) -> Optional[CachedResult]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Optional[CacheKey], entry: CachedResult) -> None:
+        if key is None or entry.nbytes > self.max_entry_bytes:
+            return
+        with self._lock:
+            # 실행하는 사이에 버전/세대가 바뀌었거나 생성이 시작됐으면 버린다
+            if (
+                self._suspended
+                or key[2] != self._version
+                or key[3] != self._generations.get(key[0], 0)
+            ):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "suspended": bool(self._suspended),
+                "dataset_version": self._version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entry_bytes": self.max_entry_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+query_cache = QueryCache(
+    max_bytes=settings.SQL_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.SQL_CACHE_MAX_ENTRY_BYTES,
+    version_check=settings.SQL_CACHE_VERSION_CHECK_SECONDS,
+    enabled=settings.SQL_CACHE_ENABLED,
+)
+
+# 채점 정답 결과 (sql_eval). 정답 하나가 크고 여러 제출이 같이 쓰므로 따로 둔다
+eval_cache = QueryCache(
+    max_bytes=settings.SQL_EVAL_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.SQL_EVAL_CACHE_MAX_ENTRY_BYTES,
+    version_check=settings.SQL_CACHE_VERSION_CHECK_SECONDS,
+    enabled=settings.SQL_CACHE_ENABLED,
+)
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+from db.executor import QueryTimeout
+from settings import settings
+from utils.serialize import dumps
+
+logger = logging.getLogger(__name__)
+
+# 스필 파일 쓰기 진행 상황: (누적 행 수, 누적 바이트, 새로 끝난 페이지들의 시작 오프셋, 상한에서 잘렸는지)
+SpillProgress = Tuple[int, int, List[int], bool]
+
+
+class ResultExpired(Exception):
+    """handle 이 없거나 TTL/LRU 로 만료됨"""
+
+
+def spill_rows(
+    batches: Iterator,
+    path: str,
+    page_size: int,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Iterator:
+    """
+    엔진 stream() 의 결과를 JSON 한 줄(행 = {컬럼: 값})씩 path 에 기록.
+    워커 스레드에서 돌도록 executor.stream 에 그대로 넘긴다.
+    처음에 컬럼 목록, 이후 배치마다 SpillProgress 를 yield.
+    max_rows / max_bytes 에 닿으면 거기서 멈추고 엔진 쪽 cursor 를 닫는다 (truncated=True).
+    """
+    try:
+        columns = next(batches)
+        yield columns
+
+        row_count = 0
+        size = 0
+        truncated = False
+        with open(path, "wb") as f:
+            for rows in batches:
+                new_offsets: List[int] = []
+                lines = []
+                for row in rows:
+                    if (max_rows is not None and row_count >= max_rows) or (
+                        max_bytes is not None and size >= max_bytes
+                    ):
+                        truncated = True
+                        break
+                    if row_count and row_count % page_size == 0:
+                        new_offsets.append(size)
+                    line = (dumps(dict(zip(columns, row))) + "\n").encode()
+                    lines.append(line)
+                    size += len(line)
+                    row_count += 1
+                f.write(b"".join(lines))
+                f.flush()
+                yield row_count, size, new_offsets, truncated
+                if truncated:
+                    break
+    finally:
+        batches.close()
+
+
+class ResultSet:
+    """
+    한 번 실행한 쿼리의 결과 (스필 파일 + 페이지 오프셋).
+    첫 페이지 이후는 백그라운드에서 계속 채워지고, 페이지 요청은
+    그 페이지가 다 써질 때까지만 기다린다.
+    """
+
+    def __init__(self, handle: str, engine: str, columns: List[str], page_size: int, path: str):
+        self.handle = handle
+        self.engine = engine
+        self.columns = columns
+        self.page_size = page_size
+        self.path = path
+
+        self.offsets = [0]   # offsets[i] = i 번째 페이지의 시작 바이트
+        self.size = 0        # 지금까지 기록된 바이트
+        self.row_count = 0
+        self.done = False
+        self.truncated = False  # 스필 상한(행/바이트)에서 잘림
+        self.error: Optional[str] = None
+
+        self.last_access = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    def _page_ready(self, page: int) -> bool:
+        return self.done or len(self.offsets) > page + 1
+
+    async def update(
+        self, row_count: int, size: int, new_offsets: List[int], truncated: bool = False
+    ) -> None:
+        async with self._changed:
+            self.offsets.extend(new_offsets)
+            self.row_count = row_count
+            self.size = size
+            self.truncated = truncated
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[str] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def wait_for_page(self, page: int, timeout: float) -> None:
+        async with self._changed:
+            await asyncio.wait_for(
+                self._changed.wait_for(lambda: self._page_ready(page)), timeout
+            )
+
+    def _read_page(self, page: int) -> bytes:
+        start = self.offsets[page]
+        end = self.offsets[page + 1] if len(self.offsets) > page + 1 else self.size
+        if end <= start:
+            return b""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    async def page_body(self, page: int) -> bytes:
+        """
+        페이지 응답 JSON. 스필 파일의 줄을 다시 파싱하지 않고 그대로 이어 붙인다.
+        """
+        if page >= len(self.offsets):
+            chunk = b""
+        else:
+            chunk = await asyncio.to_thread(self._read_page, page)
+
+        has_more = not (self.done and (page + 1) * self.page_size >= self.row_count)
+        meta = dumps(
+            {
+                "handle": self.handle,
+                "engine": self.engine,
+                "page": page,
+                "page_size": self.page_size,
+                "columns": self.columns,
+                "total_rows": self.row_count if self.done else None,
+                "has_more": has_more,
+                "truncated": self.truncated,
+                "error": self.error,
+            }
+        ).encode()
+        # JSON 문자열 안의 줄바꿈은 이스케이프되므로 줄 구분자는 행 구분자뿐
+        rows = chunk[:-1].replace(b"\n", b",")
+        return meta[:-1] + b', "rows": [' + rows + b"]}"
+
+    def read_lines(self) -> List[bytes]:
+        """완료된 결과의 행 JSON 목록 (결과 캐시에 담을 때)"""
+        with open(self.path, "rb") as f:
+            return f.read().splitlines()
+
+    def remove(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class MemoryResultSet(ResultSet):
+    """
+    이미 메모리에 있는 결과(결과 캐시 적중)로 만든 handle. 스필 파일 없이 바로 완료 상태.
+    """
+
+    def __init__(self, handle: str, engine: str, columns: List[str], page_size: int, lines: List[bytes]):
+        super().__init__(handle, engine, columns, page_size, path="")
+        self.lines = lines
+        self.offsets = list(range(0, len(lines), page_size)) or [0]
+        self.row_count = len(lines)
+        self.done = True
+
+    def _read_page(self, page: int) -> bytes:
+        start = page * self.page_size
+        chunk = self.lines[start:start + self.page_size]
+        return b"\n".join(chunk) + b"\n" if chunk else b""
+
+    def read_lines(self) -> List[bytes]:
+        return self.lines
+
+    def remove(self) -> None:
+        self.lines = []
+
+
+class ResultStore:
+    """
+    결과 handle 보관소.
+    - ttl: 마지막 접근 후 이 시간(초)이 지나면 만료
+    - max_handles: 넘으면 가장 오래 안 쓴 것부터 만료 (LRU)
+    만료되면 아직 채우는 중인 쿼리도 취소하고 스필 파일을 지운다.
+    """
+
+    def __init__(self, root: str, ttl: float, max_handles: int):
+        self.root = root
+        self.ttl = ttl
+        self.max_handles = max_handles
+        self._results: "OrderedDict[str, ResultSet]" = OrderedDict()
+
+        # 이전 프로세스가 남긴 스필 파일 정리
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root, exist_ok=True)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for handle in list(self._results):
+            rs = self._results[handle]
+            if now - rs.last_access > self.ttl:
+                del self._results[handle]
+                rs.remove()
+        while len(self._results) > self.max_handles:
+            _, rs = self._results.popitem(last=False)
+            rs.remove()
+
+    def get(self, handle: str) -> ResultSet:
+        self._expire()
+        rs = self._results.get(handle)
+        if rs is None:
+            raise ResultExpired(f"result {handle} not found or expired")
+        rs.last_access = time.monotonic()
+        self._results.move_to_end(handle)
+        return rs
+
+    async def open(
+        self,
+        engine: str,
+        start: Callable[[str], AsyncIterator],
+        page_size: int,
+        timeout: float,
+        on_complete: Optional[Callable[[ResultSet], Awaitable[None]]] = None,
+    ) -> ResultSet:
+        """
+        start(path) 로 스필 스트림을 시작하고 첫 페이지가 준비되면 반환.
+        첫 항목(컬럼 목록) 전에 난 에러는 그대로 올린다.
+        on_complete(rs): 에러 없이 끝까지 채워지면 호출 (결과 캐시 저장 등)
+        """
+        self._expire()
+        handle = uuid.uuid4().hex
+        path = os.path.join(self.root, f"{handle}.jsonl")
+
+        progress = start(path)
+        columns = await progress.__anext__()
+
+        rs = ResultSet(handle, engine, columns, page_size, path)
+        self._results[handle] = rs
+        self._expire()
+        rs.task = asyncio.create_task(self._fill(rs, progress, on_complete))
+        try:
+            await rs.wait_for_page(0, timeout)
+        except asyncio.TimeoutError:
+            self._results.pop(handle, None)
+            rs.remove()
+            raise QueryTimeout(f"first page not ready within {timeout:g}s")
+        return rs
+
+    def add(self, engine: str, columns: List[str], page_size: int, lines: List[bytes]) -> ResultSet:
+        """이미 완료된 결과(메모리)를 handle 로 등록"""
+        self._expire()
+        rs = MemoryResultSet(uuid.uuid4().hex, engine, columns, page_size, lines)
+        self._results[rs.handle] = rs
+        self._expire()
+        return rs
+
+    async def _fill(self, rs: ResultSet, progress: AsyncIterator, on_complete) -> None:
+        error = None
+        try:
+            async for progress_item in progress:
+                await rs.update(*progress_item)
+        except asyncio.CancelledError:
+            error = "result expired"
+            raise
+        except Exception as e:
+            error = str(e)
+        finally:
+            await progress.aclose()
+            await rs.finish(error)
+
+        if error is None and on_complete is not None:
+            try:
+                await on_complete(rs)
+            except Exception as e:
+                logger.exception("result on_complete failed")
+
+    def close(self) -> None:
+        for rs in self._results.values():
+            rs.remove()
+        self._results.clear()
+
+
+result_store = ResultStore(
+    settings.SQL_RESULT_DIR,
+    ttl=settings.SQL_RESULT_TTL_SECONDS,
+    max_handles=settings.SQL_RESULT_MAX_HANDLES,
+)
@@ -1,4 +1,5 @@
 import sys, os
+import threading
 if "settings" in sys.modules:
     del sys.modules["settings"]
 
@@ -20,6 +21,10 @@ from routers import (
     dataset,
     sql_eval
 )
+from db.base import close_engines, warm_up_engines
+from db.executor import query_executor
+from db.results import result_store
+from settings import settings
 
 app = FastAPI(title="Analytics Training Lab API")
 
@@ -45,6 +50,23 @@ app.include_router(dataset.router, prefix="/datasets", tags=["datasets"])
 app.include_router(sql_eval.router, prefix="/sql/eval", tags=["sql-eval"])
 
 
+@app.on_event("startup")
+def warm_up_pools():
+    # 연결이 안 되는 DB 때문에 기동이 늦어지지 않게 백그라운드에서
+    names = [n.strip() for n in settings.DB_POOL_WARM_UP.split(",") if n.strip()]
+    if names:
+        threading.Thread(
+            target=warm_up_engines, args=(names,), name="pool-warm-up", daemon=True
+        ).start()
+
+
+@app.on_event("shutdown")
+def shutdown_engines():
+    result_store.close()
+    query_executor.shutdown()
+    close_engines()
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -1,14 +1,11 @@
-import os
-import duckdb
 import plotly.graph_objects as go
 
-DB_PATH = os.getenv("DUCKDB_PATH", "db/event_log.duckdb")
+from db.duckdb_engine import get_duckdb
 
 
 def revenue_timeseries():
-    con = duckdb.connect(DB_PATH)
-    df = con.execute("SELECT date, revenue FROM daily_metrics ORDER BY date").df()
-    con.close()
+    with get_duckdb().reader() as con:
+        df = con.execute("SELECT date, revenue FROM daily_metrics ORDER BY date").df()
 
     fig = go.Figure()
     fig.add_trace(
@@ -1,21 +1,25 @@
-import os
 import duckdb
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
 
-DB_PATH = os.getenv("DUCKDB_PATH", "db/event_log.duckdb")
+from db.duckdb_engine import get_duckdb
+from utils.arrow import ARROW_MEDIA_TYPE, table_to_ipc, wants_arrow
 
 router = APIRouter()
 
 
-def _con():
-    return duckdb.connect(DB_PATH)
-
-
 @router.get("/daily-metrics")
-async def daily_metrics():
-    con = _con()
-    df = con.execute("SELECT * FROM daily_metrics ORDER BY date").df()
-    con.close()
+async def daily_metrics(request: Request):
+    # Accept: application/vnd.apache.arrow.stream 이면 Arrow IPC stream 으로
+    if wants_arrow(request):
+        with get_duckdb().reader() as con:
+            table = con.execute(
+                "SELECT * FROM daily_metrics ORDER BY date"
+            ).fetch_arrow_table()
+        return Response(table_to_ipc(table), media_type=ARROW_MEDIA_TYPE)
+
+    with get_duckdb().reader() as con:
+        df = con.execute("SELECT * FROM daily_metrics ORDER BY date").df()
     return {
         "columns": list(df.columns),
         "rows": df.to_dict(orient="records")
@@ -23,42 +27,61 @@ async def daily_metrics():
 
 @router.get("/summary")
 def analytics_summary():
-    con = duckdb.connect(DB_PATH)
+    with get_duckdb().reader() as con:
+        return _summary(con)
 
-    # 데이터가 있다고 가정하는 기본 쿼리들
-    try:
-        total_users = con.execute("SELECT COUNT(DISTINCT user_id) FROM events").fetchone()[0]
-        total_events = con.execute("SELECT COUNT(*) FROM events").fetchone()[0]
-    except:
-        {
-        "total_users": 0,
-        "total_events": 0,
-        "start_date": None,
-        "end_date": None,
-        "recent_dau": 0,
-        "recent_revenue": 0  # 추후 확장
-    }    
 
-    dates = con.execute("""
-        SELECT MIN(event_time), MAX(event_time) FROM events
-    """).fetchone()
+# 데이터 생성 때 계산해 둔 요약 (현재 데이터셋 버전의 것만)
+_PRECOMPUTED_SQL = """
+    SELECT total_users, total_events, start_time, end_time
+    FROM events_summary
+    WHERE version_id = (SELECT MAX(version_id) FROM dataset_versions)
+"""
 
-    start_date = str(dates[0]) if dates[0] else None
-    end_date = str(dates[1]) if dates[1] else None
+# 요약이 없을 때: events 를 한 번만 훑어서
+_AGGREGATE_SQL = """
+    SELECT COUNT(DISTINCT user_id), COUNT(*), MIN(event_time), MAX(event_time)
+    FROM events
+"""
 
-    recent_dau = con.execute("""
-        SELECT COUNT(DISTINCT user_id)
-        FROM events
-        WHERE event_time >= NOW() - INTERVAL 1 DAY
-    """).fetchone()[0]
 
-    con.close()
+def _summary(con):
+    """
+    전체 통계는 events_summary 에서 읽는다 (데이터셋 크기와 무관).
+    recent_dau 는 현재 시각 기준이라 매번 계산하지만, event_time 범위 조건이라
+    DuckDB 가 min/max 통계로 최근 row group 만 읽는다.
+    (NOW() 는 TIMESTAMPTZ: 그대로 비교하면 event_time 전체를 변환하느라 다 읽으므로 경계값을 캐스팅)
+    """
+    try:
+        row = con.execute(_PRECOMPUTED_SQL).fetchone()
+    except duckdb.CatalogException:
+        row = None
+
+    try:
+        if row is None:
+            row = con.execute(_AGGREGATE_SQL).fetchone()
+        recent_dau = con.execute("""
+            SELECT COUNT(DISTINCT user_id)
+            FROM events
+            WHERE event_time >= CAST(NOW() - INTERVAL 1 DAY AS TIMESTAMP)
+        """).fetchone()[0]
+    except duckdb.CatalogException:
+        # 아직 데이터가 없음
+        return {
+            "total_users": 0,
+            "total_events": 0,
+            "start_date": None,
+            "end_date": None,
+            "recent_dau": 0,
+            "recent_revenue": 0  # 추후 확장
+        }
 
+    total_users, total_events, start_time, end_time = row
     return {
         "total_users": total_users,
         "total_events": total_events,
-        "start_date": start_date,
-        "end_date": end_date,
+        "start_date": str(start_time) if start_time else None,
+        "end_date": str(end_time) if end_time else None,
         "recent_dau": recent_dau,
         "recent_revenue": 0  # 추후 확장
-    }
\ No newline at end of file
+    }
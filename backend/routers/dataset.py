@@ -1,27 +1,29 @@
 from fastapi import APIRouter
-import os
-import duckdb
 
-DB_PATH = os.getenv("DUCKDB_PATH", "db/event_log.duckdb")
+from db.duckdb_engine import get_duckdb
 
 router = APIRouter()
 
 @router.get("/versions")
 async def list_versions():
-    con = duckdb.connect(DB_PATH)
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS dataset_versions (
-          version_id BIGINT,
-          created_at TIMESTAMP,
-          generator_type VARCHAR,
-          start_date DATE,
-          end_date DATE,
-          n_users BIGINT,
-          n_events BIGINT
+    with get_duckdb().writer() as con:
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS dataset_versions (
+              version_id BIGINT,
+              created_at TIMESTAMP,
+              generator_type VARCHAR,
+              start_date DATE,
+              end_date DATE,
+              n_users BIGINT,
+              n_events BIGINT,
+              config_hash VARCHAR
+            )
+        """)
+    # pandas 를 거치면 NULL(append 의 config_hash 등)이 NaN 이 되어 JSON 직렬화가 깨진다
+    with get_duckdb().reader() as con:
+        cur = con.execute(
+            "SELECT * FROM dataset_versions ORDER BY created_at DESC"
         )
-    """)
-    df = con.execute(
-        "SELECT * FROM dataset_versions ORDER BY created_at DESC"
-    ).df()
-    con.close()
-    return {"versions": df.to_dict(orient="records")}
+        columns = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+    return {"versions": [dict(zip(columns, row)) for row in rows]}
@@ -1,24 +1,56 @@
+import os
+from typing import Literal, Optional
+
 from fastapi import APIRouter, BackgroundTasks
+from db.query_cache import eval_cache, query_cache
 from generator.data_generator_advanced import generate_data
 from utils.progress import set_progress, get_progress, reset_progress
 
 router = APIRouter()
 
 
+def _generate(**kwargs) -> None:
+    # 생성 중에는 SQL 결과/채점 정답 캐시를 끄고, 끝나면 새 데이터셋 버전으로 다시 시작
+    with query_cache.suspended(), eval_cache.suspended():
+        generate_data(**kwargs)
+
+
 @router.post("/create")
-async def create_dataset(background: BackgroundTasks):
+async def create_dataset(
+    background: BackgroundTasks,
+    engine: Literal["python", "numpy"] = "numpy",
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    mode: Literal["full", "append"] = "full",
+    use_cache: bool = True,
+    storage_schema: Optional[Literal["text", "compact"]] = None,
+):
     """
     프론트가 호출하는 API
     - 즉시 응답
     - 백엔드에서 데이터 생성은 비동기로 실행
+    - engine: 이벤트 생성 엔진 (기본 numpy 벡터 엔진)
+    - workers: 생성 프로세스 수 (numpy 엔진 기본값 = CPU 코어 수)
+    - seed: 재현용 시드 (같은 seed면 workers와 무관하게 같은 데이터)
+    - mode: full(전체 재생성) / append(마지막 버전 이후 ~ 오늘까지만 추가)
+    - use_cache: 같은 설정(config hash)의 스냅샷이 있으면 생성 대신 복원
+    - storage_schema: text(uuid/문자열) / compact(정수 session_id + ENUM), 기본은 STORAGE_SCHEMA
     """
+    if workers is None:
+        workers = (os.cpu_count() or 1) if engine == "numpy" else 1
 
     reset_progress()
 
     background.add_task(
-        generate_data,
+        _generate,
         save_to=("duckdb", "postgres", "mysql"),
-        progress_callback=set_progress
+        progress_callback=set_progress,
+        event_engine=engine,
+        workers=workers,
+        seed=seed,
+        mode=mode,
+        use_cache=use_cache,
+        storage_schema=storage_schema,
     )
 
     return {"status": "started", "message": "데이터 생성 시작됨"}
@@ -1,10 +1,8 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 from datetime import datetime
-import os
-import duckdb
 
-DB_PATH = os.getenv("DUCKDB_PATH", "db/event_log.duckdb")
+from db.duckdb_engine import get_duckdb
 
 router = APIRouter()
 
@@ -15,8 +13,7 @@ class HistoryIn(BaseModel):
   correct: bool | None = None
 
 
-def ensure_table():
-  con = duckdb.connect(DB_PATH)
+def ensure_table(con):
   con.execute("""
     CREATE TABLE IF NOT EXISTS query_history (
       id BIGINT,
@@ -27,38 +24,37 @@ def ensure_table():
       correct BOOLEAN
     )
   """)
-  con.close()
 
 
 @router.post("/add")
 async def add_history(item: HistoryIn):
-  ensure_table()
-  con = duckdb.connect(DB_PATH)
-  # id는 max+1 방식
-  cur_max = con.execute("SELECT COALESCE(MAX(id), 0) FROM query_history").fetchone()[0]
-  new_id = cur_max + 1
-
-  con.execute(
-    "INSERT INTO query_history VALUES (?, ?, ?, ?, ?, ?)",
-    (
-      new_id,
-      datetime.utcnow(),
-      item.engine,
-      item.query,
-      item.problem,
-      item.correct,
-    ),
-  )
-  con.close()
+  # writer 는 프로세스 안에서 하나씩만 → max+1 id 가 겹치지 않는다
+  with get_duckdb().writer() as con:
+    ensure_table(con)
+    # id는 max+1 방식
+    cur_max = con.execute("SELECT COALESCE(MAX(id), 0) FROM query_history").fetchone()[0]
+    new_id = cur_max + 1
+
+    con.execute(
+      "INSERT INTO query_history VALUES (?, ?, ?, ?, ?, ?)",
+      (
+        new_id,
+        datetime.utcnow(),
+        item.engine,
+        item.query,
+        item.problem,
+        item.correct,
+      ),
+    )
   return {"status": "ok", "id": new_id}
 
 
 @router.get("/list")
 async def list_history(limit: int = 30):
-  ensure_table()
-  con = duckdb.connect(DB_PATH)
-  df = con.execute(
-    "SELECT * FROM query_history ORDER BY created_at DESC LIMIT ?", [limit]
-  ).df()
-  con.close()
+  with get_duckdb().writer() as con:
+    ensure_table(con)
+  with get_duckdb().reader() as con:
+    df = con.execute(
+      "SELECT * FROM query_history ORDER BY created_at DESC LIMIT ?", [limit]
+    ).df()
   return {"items": df.to_dict(orient="records")}
@@ -1,60 +1,429 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import logging
+import time
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Literal
-from db.base import get_engine
+from typing import List, Literal, Optional
+from db.base import get_engine, pool_stats
+from db.bench import run_bench
+from db.executor import QueryBusy, QueryCancelled, QueryTimeout, query_executor
+from db.profiling import StageTimer
+from db.query_cache import CachedResult, is_read_only, normalize_sql, query_cache
+from db.results import ResultExpired, result_store, spill_rows
+from settings import settings
+from utils.arrow import ARROW_MEDIA_TYPE, limit_table, table_to_ipc, wants_arrow
+from utils.serialize import dumps
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EngineName = Literal["duckdb", "postgres", "mysql"]
+# 결과 캐시 적중 여부 (hit / miss, 캐시 대상이 아니면 헤더 없음)
+CACHE_HEADER = "X-Query-Cache"
+# Arrow 응답은 본문에 플래그를 둘 곳이 없어 헤더로 (true 면 상한에서 잘림)
+TRUNCATED_HEADER = "X-Result-Truncated"
+
 class SQLRequest(BaseModel):
-    engine: Literal["duckdb", "postgres", "mysql"]
+    engine: EngineName
+    query: str
+    # 요청별 제한 시간(초). SQL_TIMEOUT_SECONDS 보다 길게는 못 잡는다
+    timeout: Optional[float] = None
+    # True 거나 Accept: application/x-ndjson 이면 NDJSON 스트리밍 응답
+    stream: bool = False
+    # True(기본)면 첫 페이지 + handle, False 면 전체 결과를 한 번에
+    paginate: bool = True
+    page_size: Optional[int] = None
+    # True 면 실행 계획/연산자 시간 + 백엔드 단계별 시간(profile)을 함께 반환 (캐시 안 씀)
+    profile: bool = False
+
+
+class BenchRequest(BaseModel):
     query: str
+    engines: List[EngineName] = ["duckdb", "postgres", "mysql"]
+    # 엔진마다 warmup 회 버리고 repeat 회 측정
+    repeat: int = 5
+    warmup: int = 1
+    # False 면 엔진을 하나씩 차례로 (서로 CPU 를 뺏지 않게)
+    concurrent: bool = True
+    timeout: Optional[float] = None
+
+
+def _ndjson(obj) -> str:
+    return dumps(obj) + "\n"
+
+
+def _error_status(e: Exception) -> int:
+    if isinstance(e, QueryBusy):
+        return 503
+    if isinstance(e, QueryTimeout):
+        return 504
+    if isinstance(e, QueryCancelled):
+        # 응답을 받을 클라이언트가 없다 (nginx 관례의 499)
+        return 499
+    return 400
 
 
 @router.post("/run")
-async def run_sql(req: SQLRequest):
+async def run_sql(req: SQLRequest, request: Request):
     """
     엔진 종류에 상관없이 SQL 실행 결과를
     { columns: [...], rows: [...] } 형태로 통일하여 반환
+
+    실행은 워커 스레드 풀에서 (이벤트 루프는 막히지 않음)
+    - 엔진별 동시 실행 상한을 넘으면 대기, 제한 시간 안에 못 잡으면 503
+    - 제한 시간을 넘기면 엔진 쪽 쿼리까지 취소하고 504
+    - 클라이언트가 연결을 끊으면 쿼리를 취소
+    - 읽기 전용 문장은 (엔진, 정규화 SQL, 데이터셋 버전) 기준으로 결과 캐시
+      그 밖의 문장은 실행 전과 끝난 뒤에 그 엔진의 캐시를 비운다 (Postgres/MySQL 은 커밋됨)
+    - Accept: application/vnd.apache.arrow.stream 이면 전체 결과를 Arrow IPC stream 으로
+    - 결과 크기 상한: 한 번에 돌려주는 결과는 SQL_MAX_ROWS 행 / SQL_MAX_RESPONSE_BYTES,
+      페이지 handle 은 SQL_RESULT_MAX_ROWS 행 / SQL_RESULT_MAX_BYTES 까지 (넘으면 truncated: true)
     """
+    timeout = settings.SQL_TIMEOUT_SECONDS
+    if req.timeout is not None:
+        timeout = max(0.1, min(req.timeout, timeout))
+
+    writes = not is_read_only(normalize_sql(req.query))
+    if writes:
+        query_cache.invalidate(req.engine)
+
+    if req.stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        # 스트리밍/페이지 경로는 응답한 뒤에도 실행이 이어지므로 끝날 때 다시 비운다
+        return await _stream_sql(req, timeout, writes)
+    if req.paginate and not req.profile and not wants_arrow(request):
+        cache_key = None if writes else await query_cache.key(req.engine, req.query)
+        return await _paged_sql(req, timeout, cache_key, query_cache.get(cache_key), writes)
+
+    try:
+        return await _run_sql(req, timeout, request)
+    finally:
+        if writes:
+            query_cache.invalidate(req.engine)
+
+
+async def _run_sql(req: SQLRequest, timeout: float, request: Request) -> Response:
+    """한 번에 끝나는 경로: Arrow / profile / 전체 결과(paginate=false)"""
+    if wants_arrow(request):
+        return await _arrow_sql(req, timeout, request)
+    if req.profile:
+        return await _profile_sql(req, timeout, request)
+
+    cache_key = await query_cache.key(req.engine, req.query)
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        if cached.row_count > settings.SQL_MAX_ROWS:
+            # 페이지 경로에서 담긴 결과는 SQL_MAX_ROWS 보다 길 수 있다
+            cached = CachedResult(cached.columns, cached.lines[: settings.SQL_MAX_ROWS], True)
+        return Response(
+            cached.body(), media_type="application/json", headers={CACHE_HEADER: "hit"}
+        )
 
     try:
         engine = get_engine(req.engine)
+        result = await query_executor.run(
+            req.engine,
+            lambda job: engine.run(req.query, job, max_rows=settings.SQL_MAX_ROWS),
+            timeout,
+            is_disconnected=request.is_disconnected,
+        )
+    except Exception as e:
+        logger.info("query failed (%s): %s", req.engine, e)
+        raise HTTPException(status_code=_error_status(e), detail=str(e))
+
+    logger.debug("query (%s) fetched %d rows", req.engine, len(result["rows"]))
+    entry = CachedResult.from_rows(
+        result["columns"],
+        result["rows"],
+        max_rows=settings.SQL_MAX_ROWS,
+        max_bytes=settings.SQL_MAX_RESPONSE_BYTES,
+    )
+    query_cache.put(cache_key, entry)
+    headers = {CACHE_HEADER: "miss"} if cache_key is not None else None
+    return Response(entry.body(), media_type="application/json", headers=headers)
+
+async def _arrow_sql(req: SQLRequest, timeout: float, request: Request) -> Response:
+    """
+    결과 전체를 Arrow IPC stream 한 덩어리로 (행별 Python 객체/JSON 인코딩 없음).
+    컬럼 타입이 그대로 유지되므로 int64 는 프론트에서 BigInt 로 읽힌다.
+    상한에서 잘리면 X-Result-Truncated: true
+    """
+    try:
+        engine = get_engine(req.engine)
+        table = await query_executor.run(
+            req.engine,
+            lambda job: engine.run(
+                req.query, job, arrow=True, max_rows=settings.SQL_MAX_ROWS
+            ),
+            timeout,
+            is_disconnected=request.is_disconnected,
+        )
+        table, truncated = limit_table(
+            table, settings.SQL_MAX_ROWS, settings.SQL_MAX_RESPONSE_BYTES
+        )
+        body = await asyncio.to_thread(table_to_ipc, table)
+    except Exception as e:
+        logger.info("query failed (%s): %s", req.engine, e)
+        raise HTTPException(status_code=_error_status(e), detail=str(e))
+
+    logger.debug("query (%s) fetched %d rows (arrow)", req.engine, table.num_rows)
+    return Response(
+        body,
+        media_type=ARROW_MEDIA_TYPE,
+        headers={TRUNCATED_HEADER: "true" if truncated else "false"},
+    )
+
+
+async def _profile_sql(req: SQLRequest, timeout: float, request: Request) -> Response:
+    """
+    프로파일 모드: 전체 결과 + profile
+      profile.timings_ms : wait(실행 슬롯 대기 + 스레드 전환) / connect / execute / fetch /
+                           convert(행 → dict) / explain(Postgres·MySQL 의 EXPLAIN ANALYZE 재실행) /
+                           serialize(JSON 인코딩) / total
+      profile.plan       : {total_ms, planning_ms, root} — root 는 엔진과 상관없이
+                           {operator, detail, rows, loops, time_ms, children} 트리
+      profile.raw_plan   : 엔진이 돌려준 원본 (DuckDB/Postgres JSON, MySQL TREE 텍스트)
+    DuckDB 는 같은 실행에서 프로파일을 얻고, Postgres/MySQL 은 조회문일 때만 EXPLAIN ANALYZE 를 한 번 더 돌린다.
+    """
+    timer = StageTimer()
+    start = time.perf_counter()
+    try:
+        engine = get_engine(req.engine)
+        result = await query_executor.run(
+            req.engine,
+            lambda job: engine.profile(req.query, job, max_rows=settings.SQL_MAX_ROWS),
+            timeout,
+            is_disconnected=request.is_disconnected,
+        )
+    except Exception as e:
+        logger.info("query failed (%s): %s", req.engine, e)
+        raise HTTPException(status_code=_error_status(e), detail=str(e))
+    timer.since("wait", start)
+    # 엔진 안에서 잰 구간을 빼면 남는 것이 대기 시간
+    timer.timings["wait"] -= sum(result["timings"].values())
+
+    with timer.stage("serialize"):
+        encoded = CachedResult.from_rows(
+            result["columns"],
+            result["rows"],
+            max_rows=settings.SQL_MAX_ROWS,
+            max_bytes=settings.SQL_MAX_RESPONSE_BYTES,
+        )
+        rows_body = encoded.rows_json()
+    timings = timer.as_dict()
+    timings = {"wait": timings.pop("wait"), **result["timings"], **timings}
+    timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+
+    profile = {
+        "engine": req.engine,
+        "timings_ms": timings,
+        "plan": result["plan"],
+        "raw_plan": result["raw_plan"],
+    }
+    logger.debug("query profiled (%s): %s", req.engine, timings)
+    body = (
+        b'{"columns": ' + dumps(result["columns"]).encode()
+        + b', "rows": ' + rows_body
+        + b', "truncated": ' + dumps(encoded.truncated).encode()
+        + b', "profile": ' + dumps(profile).encode() + b"}"
+    )
+    return Response(body, media_type="application/json")
+
+
+async def _stream_sql(req: SQLRequest, timeout: float, writes: bool = False) -> StreamingResponse:
+    """
+    결과를 NDJSON 으로 흘려보낸다 (서버 쪽 cursor 에서 배치씩 읽어 바로 기록).
+      {"columns": [...]}
+      [값, 값, ...]            ← 행마다 한 줄 (컬럼 순서)
+      {"done": true, "row_count": N}   또는 도중 실패 시 {"error": "...", "row_count": N}
+    첫 배치(컬럼 목록) 전에 실패하면 일반 요청과 같은 HTTP 에러로 응답한다.
+    제한 시간은 배치 하나를 가져오는 데 걸리는 시간에 적용된다.
+    """
+    engine = get_engine(req.engine)
+    batches = query_executor.stream(
+        req.engine,
+        lambda job: engine.stream(req.query, job, settings.SQL_STREAM_BATCH_ROWS),
+        timeout,
+    )
+    try:
+        columns = await batches.__anext__()
+    except Exception as e:
+        logger.info("query failed (%s): %s", req.engine, e)
+        if writes:
+            query_cache.invalidate(req.engine)
+        raise HTTPException(status_code=_error_status(e), detail=str(e))
+
+    async def body():
+        row_count = 0
+        try:
+            yield _ndjson({"columns": columns})
+            async for rows in batches:
+                row_count += len(rows)
+                yield "".join(_ndjson(list(row)) for row in rows)
+            yield _ndjson({"done": True, "row_count": row_count})
+        except Exception as e:
+            logger.info("stream failed (%s): %s", req.engine, e)
+            yield _ndjson({"error": str(e), "row_count": row_count})
+        finally:
+            # 클라이언트가 중간에 끊으면 여기서 cursor/connection 정리
+            await batches.aclose()
+            if writes:
+                query_cache.invalidate(req.engine)
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _paged_sql(
+    req: SQLRequest,
+    timeout: float,
+    cache_key=None,
+    cached: Optional[CachedResult] = None,
+    writes: bool = False,
+) -> Response:
+    """
+    결과 전체를 스필 파일에 쓰면서 첫 페이지가 차는 즉시 응답.
+    나머지는 백그라운드에서 계속 채워지고 /sql/results/{handle}?page=N 으로 읽는다.
+    응답: {handle, page, page_size, columns, rows, total_rows(다 읽기 전엔 null), has_more, truncated, error}
+    """
+    page_size = req.page_size or settings.SQL_PAGE_SIZE
+    page_size = max(1, min(page_size, settings.SQL_PAGE_SIZE * 10))
+
+    # 잘린 캐시 결과(한 번에 돌려주는 경로의 작은 상한)는 페이지 경로에서 쓰지 않는다
+    if cached is not None and not cached.truncated:
+        rs = result_store.add(req.engine, cached.columns, page_size, cached.lines)
+        return Response(
+            await rs.page_body(0), media_type="application/json", headers={CACHE_HEADER: "hit"}
+        )
 
-        # DuckDB 엔진
-        if req.engine == "duckdb":
-            con = engine.connect()
-            result = con.execute(req.query)
-            print(f"{result=}")
-            # DuckDB는 fetchdf가 가장 빠름
-            df = result.fetchdf()
-
-            return {
-                "columns": list(df.columns),
-                "rows": df.to_dict(orient="records")
-            }
-        else:
-            # Postgres / MySQL 엔진
-            conn = engine.connect()
-            try:
-                result = engine.execute(conn, req.query)
-            finally:
-                conn.close()
-            print(f"{result=}")
-            if isinstance(result, dict):
-                cols = result.get("columns", [])
-                rows = result.get("rows", [])
-            else:
-                cols, rows = result
-                rows = [dict(zip(cols, r)) for r in rows]
-
-            return {
-                "columns": cols,
-                "rows": rows
-            }
-        print(f"Query successful. Fetched {len(rows)} rows.")
+    async def save_to_cache(rs) -> None:
+        if rs.truncated or rs.size > query_cache.max_entry_bytes:
+            return
+        lines = await asyncio.to_thread(rs.read_lines)
+        query_cache.put(cache_key, CachedResult(rs.columns, lines))
+
+    def start(path: str):
+        return query_executor.stream(
+            req.engine,
+            lambda job: spill_rows(
+                engine.stream(req.query, job, settings.SQL_STREAM_BATCH_ROWS),
+                path,
+                page_size,
+                max_rows=settings.SQL_RESULT_MAX_ROWS,
+                max_bytes=settings.SQL_RESULT_MAX_BYTES,
+            ),
+            timeout,
+        )
+
+    async def after_write(rs) -> None:
+        query_cache.invalidate(req.engine)
+
+    on_complete = None
+    if writes:
+        on_complete = after_write
+    elif cache_key is not None:
+        on_complete = save_to_cache
+
+    try:
+        engine = get_engine(req.engine)
+        rs = await result_store.open(
+            req.engine,
+            start,
+            page_size,
+            timeout,
+            on_complete=on_complete,
+        )
     except Exception as e:
-        print(e)
-        raise HTTPException(status_code=400, detail=str(e))
+        logger.info("query failed (%s): %s", req.engine, e)
+        if writes:
+            query_cache.invalidate(req.engine)
+        raise HTTPException(status_code=_error_status(e), detail=str(e))
+
+    headers = {CACHE_HEADER: "miss"} if cache_key is not None else None
+    return Response(await rs.page_body(0), media_type="application/json", headers=headers)
+
+
+@router.post("/bench")
+async def bench_sql(req: BenchRequest):
+    """
+    같은 쿼리를 선택한 엔진들에서 반복 실행해 비교
+    - engines.<name>.latency_ms : min / median / p95 / mean / max (ms, 실행 슬롯 대기 포함)
+    - engines.<name>.rows       : 반환 행 수 (실패한 엔진은 {"error": ...})
+    - comparison.equal          : 기준 엔진과 결과가 같은지 (행 순서 무시, 숫자/시간 타입 차이 정규화)
+    조회문만 허용 (같은 문장을 여러 번 실행하므로)
+    """
+    if not is_read_only(normalize_sql(req.query)):
+        raise HTTPException(status_code=400, detail="bench only runs read-only statements")
+    engines = list(dict.fromkeys(req.engines))
+    if not engines:
+        raise HTTPException(status_code=400, detail="no engines selected")
+    if req.repeat < 1 or req.warmup < 0:
+        raise HTTPException(status_code=400, detail="repeat must be >= 1 and warmup >= 0")
+    if req.repeat + req.warmup > settings.SQL_BENCH_MAX_REPEAT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"repeat + warmup must be <= {settings.SQL_BENCH_MAX_REPEAT}",
+        )
+
+    timeout = settings.SQL_TIMEOUT_SECONDS
+    if req.timeout is not None:
+        timeout = max(0.1, min(req.timeout, timeout))
+
+    return await run_bench(
+        req.query,
+        engines,
+        repeat=req.repeat,
+        warmup=req.warmup,
+        timeout=timeout,
+        concurrent=req.concurrent,
+    )
+
+
+@router.get("/results/{handle}")
+async def result_page(handle: str, page: int = 0):
+    """
+    /sql/run 이 돌려준 handle 의 page 번째 페이지 (0부터).
+    아직 채우는 중인 페이지면 다 써질 때까지 기다린다 (SQL_TIMEOUT_SECONDS).
+    """
+    try:
+        rs = result_store.get(handle)
+    except ResultExpired as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if page < 0:
+        raise HTTPException(status_code=400, detail="page must be >= 0")
+
+    try:
+        await rs.wait_for_page(page, settings.SQL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"page {page} is still loading")
+
+    if page > 0 and page * rs.page_size >= rs.row_count:
+        if rs.error:
+            raise HTTPException(status_code=400, detail=rs.error)
+        raise HTTPException(status_code=404, detail=f"page {page} out of range")
+
+    return Response(await rs.page_body(page), media_type="application/json")
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """결과 캐시 적중률 / 사용량"""
+    return query_cache.stats()
+
+
+@router.get("/pool/stats")
+async def connection_pool_stats():
+    """Postgres / MySQL connection 풀 사용량"""
+    return pool_stats()
+
+
+@router.delete("/cache")
+async def clear_cache():
+    query_cache.invalidate()
+    return query_cache.stats()
+
 
 @router.get("/history/test")
 async def test():
@@ -1,49 +1,233 @@
-import os
-from fastapi import APIRouter
-import duckdb
-from pydantic import BaseModel
-import pandas as pd
+import asyncio
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from db.base import get_engine
+from db.duckdb_engine import get_duckdb
+from db.executor import query_executor
+from db.query_cache import CacheKey, eval_cache
+from settings import settings
+from utils.compare import compare_arrow
+
+logger = logging.getLogger(__name__)
 
-DB_PATH = os.getenv("DB_PATH", "db/event_log.duckdb")
 router = APIRouter()
 
-con = duckdb.connect(DB_PATH)
-class EvalRequest(BaseModel):
+class EvalOptions(BaseModel):
+    # 행 순서까지 맞아야 정답인 문제 (ORDER BY 문제)
+    check_order: bool = False
+    # 숫자 비교 허용 오차 (이 자릿수에서 반올림해 비교)
+    float_tolerance: float = Field(default=1e-6, ge=0)
+    # missing_rows / extra_rows 로 돌려줄 최대 행 수
+    sample_size: int = Field(default=20, ge=0, le=1000)
+    # 쿼리별 제한 시간(초). SQL_TIMEOUT_SECONDS 보다 길게는 못 잡는다
+    timeout: Optional[float] = None
+
+class EvalRequest(EvalOptions):
     expected: str
     user: str
 
-def run_sql(q):
-    # con = duckdb.connect("db/event_log.duckdb")
-    df = con.execute(q).df()
-    con.close()
-    return df
+class Submission(BaseModel):
+    # 제출자 식별용 (학번 등). 결과에 그대로 돌려준다
+    id: Optional[str] = None
+    query: str
 
-@router.post("/eval")
-async def evaluate_sql(req: EvalRequest):
+class BatchEvalRequest(EvalOptions):
+    expected: str
+    submissions: List[Submission]
+    sample_size: int = Field(default=5, ge=0, le=1000)
+    # 동시에 채점할 제출 수. SQL_EVAL_BATCH_CONCURRENCY 보다 크게는 못 잡는다
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
+class ExpectedAnswer:
+    """eval_cache 에 담는 정답 결과"""
+
+    __slots__ = ("table", "nbytes")
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self.nbytes = table.nbytes
+
+# 실행 중인 정답 쿼리 (같은 키로 동시에 들어온 제출은 이걸 같이 기다린다)
+_inflight: Dict[CacheKey, "asyncio.Task[pa.Table]"] = {}
+
+# ----------------------------------------
+# 실행
+# ----------------------------------------
+
+def _fetch(query: str, timeout: float, max_rows: Optional[int] = None):
+    """
+    워커 풀에서 DuckDB 로 실행해 Arrow 테이블로 (취소/제한 시간은 query_executor).
+    채점 쿼리는 쓰기 문장이어도 읽기 전용 cursor 에서 실행한다 (데이터를 못 바꾸게).
+    max_rows 가 있으면 max_rows + 1 행까지만 읽는다
+    """
+    engine = get_engine("duckdb")
+    return query_executor.run(
+        "duckdb",
+        lambda job: engine.run(query, job, arrow=True, max_rows=max_rows, read_only=True),
+        timeout,
+    )
+
+def _fetch_user(query: str, timeout: float):
+    # 제출 쿼리는 무엇을 쓰든 SQL_EVAL_MAX_ROWS 를 넘겨 메모리에 올리지 않는다
+    return _fetch(query, timeout, max_rows=settings.SQL_EVAL_MAX_ROWS)
+
+async def expected_answer(query: str, timeout: float) -> pa.Table:
+    """
+    정답 쿼리 결과. (정규화 SQL, 데이터셋 버전) 으로 캐시하고,
+    캐시에 없으면 한 번만 실행해서 동시에 기다리는 제출들이 같이 쓴다.
+    """
+    key = await eval_cache.key("duckdb", query)
+    cached = eval_cache.get(key)
+    if cached is not None:
+        return cached.table
+    if key is None:
+        return await _fetch(query, timeout)
+
+    task = _inflight.get(key)
+    if task is None:
+
+        async def load() -> pa.Table:
+            table = await _fetch(query, timeout)
+            eval_cache.put(key, ExpectedAnswer(table))
+            return table
+
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # 한 제출이 취소돼도 다른 제출이 기다리는 실행은 계속되도록
+    return await asyncio.shield(task)
+
+def _compare(job, expected: pa.Table, user: pa.Table, req: EvalOptions):
+    with get_duckdb().reader() as con, job.bound(con.interrupt):
+        return compare_arrow(
+            con,
+            expected,
+            user,
+            check_order=req.check_order,
+            float_tolerance=req.float_tolerance,
+            sample_size=req.sample_size,
+        )
+
+async def _grade(expected: pa.Table, user: pa.Table, req: EvalOptions, timeout: float) -> dict:
+    if user.num_rows > settings.SQL_EVAL_MAX_ROWS:
+        # 끝까지 읽지 않은 결과라 비교하지 않는다
+        return {
+            "correct": False,
+            "truncated": True,
+            "error": f"User SQL Error: result exceeds {settings.SQL_EVAL_MAX_ROWS} rows",
+        }
+
+    # 정답 여부 + 상세 diff (다중집합 차이, 다른 행은 샘플만)
     try:
-        expected_df = run_sql(req.expected)
+        return await query_executor.run(
+            "duckdb", lambda job: _compare(job, expected, user, req), timeout
+        )
     except Exception as e:
-        return {"error": f"Expected SQL Error: {str(e)}"}
+        logger.warning("compare failed: %s", e)
+        return {"correct": False, "error": f"Compare Error: {str(e)}"}
 
+async def evaluate(req: EvalRequest, timeout: float) -> dict:
+    """
+    정답 쿼리(캐시 없을 때)와 제출 쿼리를 워커 풀에서 동시에 실행하고,
+    두 결과를 DuckDB 안에서 비교한다.
+    """
+    expected, user = await asyncio.gather(
+        expected_answer(req.expected, timeout),
+        _fetch_user(req.user, timeout),
+        return_exceptions=True,
+    )
+    if isinstance(expected, BaseException):
+        return {"error": f"Expected SQL Error: {str(expected)}"}
+    if isinstance(user, BaseException):
+        return {"correct": False, "error": f"User SQL Error: {str(user)}"}
+    return await _grade(expected, user, req, timeout)
+
+async def evaluate_batch(req: BatchEvalRequest, timeout: float, concurrency: int) -> dict:
+    """
+    정답 쿼리는 한 번만 (캐시) 실행하고, 제출들은 concurrency 개씩 동시에 채점.
+    제한 시간은 제출 쿼리 하나하나에 적용된다. 결과는 제출 순서대로.
+    """
+    started = time.perf_counter()
     try:
-        user_df = run_sql(req.user)
+        expected = await expected_answer(req.expected, timeout)
     except Exception as e:
-        return {"correct": False, "error": f"User SQL Error: {str(e)}"}
+        return {"error": f"Expected SQL Error: {str(e)}"}
+    expected_ms = (time.perf_counter() - started) * 1000
 
-    # 정답 여부 판단
-    correct = user_df.equals(expected_df)
+    slots = asyncio.Semaphore(concurrency)
 
-    # 상세 diff
-    missing = expected_df.merge(user_df, how="left", indicator=True)
-    missing_rows = missing[missing["_merge"] == "left_only"]
+    async def grade_one(index: int, submission: Submission) -> dict:
+        async with slots:
+            start = time.perf_counter()
+            try:
+                user = await _fetch_user(submission.query, timeout)
+            except Exception as e:
+                result = {"correct": False, "error": f"User SQL Error: {str(e)}"}
+            else:
+                result = await _grade(expected, user, req, timeout)
+            elapsed = (time.perf_counter() - start) * 1000
+        return {"index": index, "id": submission.id, "elapsed_ms": round(elapsed, 3), **result}
 
-    extra = user_df.merge(expected_df, how="left", indicator=True)
-    extra_rows = extra[extra["_merge"] == "left_only"]
+    results = await asyncio.gather(
+        *(grade_one(i, s) for i, s in enumerate(req.submissions))
+    )
 
+    elapsed = [r["elapsed_ms"] for r in results]
+    # 실행/비교 자체가 실패한 제출 (컬럼 개수가 다른 건 비교는 된 오답)
+    errors = sum(1 for r in results if "user_rows" not in r)
+    correct = sum(1 for r in results if r.get("correct"))
     return {
-        "correct": correct,
-        "expected_rows": len(expected_df),
-        "user_rows": len(user_df),
-        "missing_rows": missing_rows.to_dict(orient="records"),
-        "extra_rows": extra_rows.to_dict(orient="records"),
+        "expected_rows": expected.num_rows,
+        "summary": {
+            "submissions": len(results),
+            "correct": correct,
+            "incorrect": len(results) - correct - errors,
+            "errors": errors,
+        },
+        "timing": {
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+            "expected_ms": round(expected_ms, 3),
+            "concurrency": concurrency,
+            "submission_ms": {
+                "mean": round(statistics.fmean(elapsed), 3),
+                "median": round(statistics.median(elapsed), 3),
+                "max": round(max(elapsed), 3),
+            } if elapsed else None,
+        },
+        "results": results,
     }
+
+def _timeout(req: EvalOptions) -> float:
+    timeout = settings.SQL_TIMEOUT_SECONDS
+    if req.timeout is not None:
+        timeout = max(0.1, min(req.timeout, timeout))
+    return timeout
+
+@router.post("/eval")
+async def evaluate_sql(req: EvalRequest):
+    return await evaluate(req, _timeout(req))
+
+@router.post("/batch")
+async def evaluate_sql_batch(req: BatchEvalRequest):
+    """
+    한 문제(정답 쿼리)에 대한 여러 제출을 한 번에 채점.
+    제출별 판정 + 전체 소요 시간을 돌려준다.
+    """
+    if not req.submissions:
+        raise HTTPException(status_code=400, detail="no submissions")
+    if len(req.submissions) > settings.SQL_EVAL_BATCH_MAX_SUBMISSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"at most {settings.SQL_EVAL_BATCH_MAX_SUBMISSIONS} submissions per batch",
+        )
+    concurrency = settings.SQL_EVAL_BATCH_CONCURRENCY
+    if req.concurrency is not None:
+        concurrency = min(req.concurrency, concurrency)
+    return await evaluate_batch(req, _timeout(req), concurrency)
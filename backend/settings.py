@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +10,9 @@ class Settings(BaseSettings):
 
     # DuckDB
     DUCKDB_PATH: str = os.getenv("DUCKDB_PATH", "/app/db/event_log.duckdb")
+    # DB 인스턴스 전체에 적용 (DuckDB 는 connection/쿼리별 메모리 한도가 없다). 빈 값/0 이면 DuckDB 기본값
+    DUCKDB_MEMORY_LIMIT: str = os.getenv("DUCKDB_MEMORY_LIMIT", "2GB")
+    DUCKDB_THREADS: int = int(os.getenv("DUCKDB_THREADS", 0))
 
     # PostgreSQL
     PG_HOST: str = os.getenv("PG_HOST", "postgres")
@@ -23,6 +27,61 @@ class Settings(BaseSettings):
     MYSQL_USER: str = os.getenv("MYSQL_USER", "analytics")
     MYSQL_PASS: str = os.getenv("MYSQL_PASS", "analytics123")
     MYSQL_DB: str = os.getenv("MYSQL_DB", "analytics")
+
+    # Connection pool (Postgres / MySQL 엔진별로 하나씩)
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+    DB_POOL_IDLE_TIMEOUT: float = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))
+    DB_POOL_ACQUIRE_TIMEOUT: float = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", 30))
+    DB_POOL_HEALTH_CHECK: bool = os.getenv("DB_POOL_HEALTH_CHECK", "true").lower() == "true"
+    # 앱 시작 때 min_size 만큼 미리 연결해 둘 엔진 (쉼표 구분, 빈 값이면 안 함)
+    DB_POOL_WARM_UP: str = os.getenv("DB_POOL_WARM_UP", "postgres,mysql")
+
+    # SQL 실행 (/sql/run): 워커 스레드 수, 엔진별 동시 실행 상한, 요청당 제한 시간(초)
+    SQL_WORKERS: int = int(os.getenv("SQL_WORKERS", 20))
+    SQL_MAX_CONCURRENT_DUCKDB: int = int(os.getenv("SQL_MAX_CONCURRENT_DUCKDB", 4))
+    SQL_MAX_CONCURRENT_POSTGRES: int = int(os.getenv("SQL_MAX_CONCURRENT_POSTGRES", 8))
+    SQL_MAX_CONCURRENT_MYSQL: int = int(os.getenv("SQL_MAX_CONCURRENT_MYSQL", 8))
+    SQL_TIMEOUT_SECONDS: float = float(os.getenv("SQL_TIMEOUT_SECONDS", 30))
+    # Postgres 조회가 테이블 락(데이터 재생성 중)을 기다리는 최대 시간(초). 0 이면 제한 시간까지
+    SQL_PG_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("SQL_PG_LOCK_TIMEOUT_SECONDS", 5))
+    # 스트리밍 응답에서 한 번에 가져와 내보내는 행 수
+    SQL_STREAM_BATCH_ROWS: int = int(os.getenv("SQL_STREAM_BATCH_ROWS", 1000))
+
+    # 페이지 단위 결과 (/sql/run 첫 페이지 + /sql/results/{handle}?page=N)
+    SQL_PAGE_SIZE: int = int(os.getenv("SQL_PAGE_SIZE", 500))
+    SQL_RESULT_DIR: str = os.getenv(
+        "SQL_RESULT_DIR", os.path.join(tempfile.gettempdir(), "sql_results")
+    )
+    SQL_RESULT_TTL_SECONDS: float = float(os.getenv("SQL_RESULT_TTL_SECONDS", 600))
+    SQL_RESULT_MAX_HANDLES: int = int(os.getenv("SQL_RESULT_MAX_HANDLES", 100))
+
+    # 결과 크기 상한 (넘으면 잘라서 truncated: true)
+    # - 한 번에 돌려주는 결과 (paginate=false / profile / Arrow / bench): 행 수 + 직렬화 바이트
+    # - 페이지 handle 의 스필 파일: 전체 행 수 + 바이트
+    SQL_MAX_ROWS: int = int(os.getenv("SQL_MAX_ROWS", 10_000))
+    SQL_MAX_RESPONSE_BYTES: int = int(os.getenv("SQL_MAX_RESPONSE_BYTES", 32 * 1024 * 1024))
+    SQL_RESULT_MAX_ROWS: int = int(os.getenv("SQL_RESULT_MAX_ROWS", 1_000_000))
+    SQL_RESULT_MAX_BYTES: int = int(os.getenv("SQL_RESULT_MAX_BYTES", 512 * 1024 * 1024))
+
+    # 결과 캐시: (엔진, 정규화 SQL, 데이터셋 버전) → 결과. 읽기 전용 문장만, 메모리 상한 LRU
+    SQL_CACHE_ENABLED: bool = os.getenv("SQL_CACHE_ENABLED", "true").lower() == "true"
+    SQL_CACHE_MAX_BYTES: int = int(os.getenv("SQL_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    SQL_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("SQL_CACHE_MAX_ENTRY_BYTES", 16 * 1024 * 1024))
+    # 다른 프로세스가 데이터를 다시 만든 경우를 위해 버전을 다시 읽는 주기(초)
+    SQL_CACHE_VERSION_CHECK_SECONDS: float = float(os.getenv("SQL_CACHE_VERSION_CHECK_SECONDS", 5))
+
+    # 엔진 비교 벤치마크 (/sql/bench): 엔진당 최대 반복 횟수 (warmup 포함)
+    SQL_BENCH_MAX_REPEAT: int = int(os.getenv("SQL_BENCH_MAX_REPEAT", 20))
+
+    # 채점 (/sql/eval): 정답 쿼리 결과(Arrow) 캐시. (정규화 SQL, 데이터셋 버전) 단위
+    SQL_EVAL_CACHE_MAX_BYTES: int = int(os.getenv("SQL_EVAL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    SQL_EVAL_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("SQL_EVAL_CACHE_MAX_ENTRY_BYTES", 128 * 1024 * 1024))
+    # 채점할 제출 쿼리 결과의 최대 행 수 (넘으면 더 읽지 않고 오류로 처리)
+    SQL_EVAL_MAX_ROWS: int = int(os.getenv("SQL_EVAL_MAX_ROWS", 1_000_000))
+    # 일괄 채점 (/sql/eval/batch): 한 번에 받는 제출 수 / 동시에 채점하는 제출 수
+    SQL_EVAL_BATCH_MAX_SUBMISSIONS: int = int(os.getenv("SQL_EVAL_BATCH_MAX_SUBMISSIONS", 500))
+    SQL_EVAL_BATCH_CONCURRENCY: int = int(os.getenv("SQL_EVAL_BATCH_CONCURRENCY", 4))
     
     # Gemini API Key
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
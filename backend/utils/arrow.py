@@ -0,0 +1,58 @@
+from typing import List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+from fastapi import Request
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(request: Request) -> bool:
+    """Accept 헤더로 Arrow IPC stream 을 요청했는지"""
+    return ARROW_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def rows_to_table(columns: List[str], rows: Sequence[tuple]) -> pa.Table:
+    """
+    DB 드라이버가 돌려준 튜플 목록을 컬럼 단위로 묶어 Arrow Table 로.
+    행마다 dict 를 만들지 않고 컬럼마다 pa.array 한 번 (타입은 pyarrow 가 추론).
+    """
+    if rows:
+        arrays = [pa.array(values) for values in zip(*rows)]
+    else:
+        arrays = [pa.array([], pa.null()) for _ in columns]
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def limit_table(
+    table: pa.Table, max_rows: Optional[int] = None, max_bytes: Optional[int] = None
+) -> Tuple[pa.Table, bool]:
+    """
+    행 수 / 메모리 크기 상한으로 자르기 → (table, 잘렸는지).
+    바이트 상한은 행 크기가 고르다고 보고 비율로 자른다 (slice 는 복사 없음).
+    """
+    truncated = False
+    if max_rows is not None and table.num_rows > max_rows:
+        table = table.slice(0, max_rows)
+        truncated = True
+    if max_bytes is not None and table.num_rows and table.nbytes > max_bytes:
+        keep = int(table.num_rows * max_bytes / table.nbytes)
+        table = table.slice(0, keep)
+        truncated = True
+    return table, truncated
+
+
+def _decimals_to_float(table: pa.Table) -> pa.Table:
+    # JSON 응답(json_default)과 같게 DECIMAL/NUMERIC 은 float 로 (JS 쪽 decimal 지원이 빈약)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table
+
+
+def table_to_ipc(table: pa.Table) -> bytes:
+    """Arrow IPC stream 포맷 (프론트는 apache-arrow 의 tableFromIPC 로 읽는다)"""
+    table = _decimals_to_float(table)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,243 @@
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+
+# ----------------------------------------
+# 채점용 결과 비교 (DuckDB 안에서)
+#   두 결과(임시 테이블 / 등록한 Arrow 테이블)의 다중집합 차이(EXCEPT ALL 양방향)를 엔진 안에서 계산.
+#   backend 로는 개수와 샘플 행만 가져온다 (pandas 로 전체를 올리지 않음)
+# ----------------------------------------
+
+_INTEGER = re.compile(r"^U?(TINYINT|SMALLINT|INTEGER|BIGINT|HUGEINT)$")
+_NUMERIC = re.compile(r"^(FLOAT|DOUBLE|DECIMAL\(.*\))$")
+_TIMESTAMP = {"TIMESTAMP", "TIMESTAMP_S", "TIMESTAMP_MS", "TIMESTAMP_NS", "TIMESTAMP WITH TIME ZONE"}
+
+
+def normalize_column_name(name: Any) -> str:
+    """대소문자/공백/따옴표 차이는 같은 컬럼으로 본다"""
+    return str(name).strip().strip('"`').lower()
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def match_columns(expected: List[str], actual: List[str]) -> Tuple[Optional[List[int]], str]:
+    """
+    expected 의 i 번째 컬럼과 비교할 actual 컬럼 위치 목록 → (위치 목록, 방식)
+    - name     : 정규화한 이름 집합이 같으면 이름으로 (컬럼 순서 무시)
+    - position : 이름이 달라도(별칭 차이) 개수가 같으면 위치로
+    - mismatch : 컬럼 개수가 다름 → (None, "mismatch")
+    """
+    exp_names = [normalize_column_name(c) for c in expected]
+    act_names = [normalize_column_name(c) for c in actual]
+
+    if len(exp_names) != len(act_names):
+        return None, "mismatch"
+
+    unique = len(set(exp_names)) == len(exp_names) == len(set(act_names))
+    if unique and set(exp_names) == set(act_names):
+        return [act_names.index(name) for name in exp_names], "name"
+    return list(range(len(exp_names))), "position"
+
+
+def _kind(column_type: str) -> str:
+    if _INTEGER.match(column_type):
+        return "integer"
+    if _NUMERIC.match(column_type):
+        return "number"
+    if column_type in _TIMESTAMP:
+        return "timestamp"
+    return column_type
+
+
+def _canonical(ref: str, column_type: str, kind: str, decimals: int) -> str:
+    """
+    엔진/작성 방식에 따른 표현 차이를 없앤 식
+    - 실수/DECIMAL (한쪽이라도) → DOUBLE, decimals 자리 반올림 (INT vs DOUBLE, 부동소수 오차)
+      양쪽 다 정수면 그대로 (INTEGER vs BIGINT 는 DuckDB 가 맞춰 준다)
+    - timestamp → UTC 기준 TIMESTAMP
+    - 양쪽 종류가 다르면 (kind="text") 문자열로
+    """
+    if kind == "number":
+        return f"round(CAST({ref} AS DOUBLE), {decimals}) + 0.0"  # + 0.0: -0.0 → 0.0
+    if kind == "timestamp":
+        if column_type == "TIMESTAMP WITH TIME ZONE":
+            return f"timezone('UTC', {ref})"
+        return f"CAST({ref} AS TIMESTAMP)"
+    if kind == "text":
+        return f"CAST({ref} AS VARCHAR)"
+    return ref
+
+
+def positional_names(count: int) -> List[str]:
+    return [f"c{i}" for i in range(count)]
+
+
+def unique_names(names: List[str]) -> List[str]:
+    """같은 이름이 또 나오면 _2, _3 ... 을 붙인다 (샘플 행 dict 에서 겹치지 않게)"""
+    seen: Dict[str, int] = {}
+    out = []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        out.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return out
+
+
+def _records(con, sql: str) -> List[dict]:
+    cur = con.execute(sql)
+    names = [d[0] for d in cur.description]
+    # NaN 은 JSON 에 못 실으니 None 으로
+    return [
+        {
+            name: None if isinstance(v, float) and math.isnan(v) else v
+            for name, v in zip(names, row)
+        }
+        for row in cur.fetchall()
+    ]
+
+
+# ----------------------------------------
+# 비교
+# ----------------------------------------
+
+
+def compare_tables(
+    con,
+    expected: str,
+    actual: str,
+    check_order: bool = False,
+    float_tolerance: float = 1e-6,
+    sample_size: int = 20,
+    column_names: Optional[List[str]] = None,
+    column_match: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    같은 cursor 에서 보이는 두 테이블을 다중집합으로 비교 (행 순서/컬럼 순서/부동소수 오차 무시).
+    check_order=True 면 행 순서까지 같아야 정답.
+    다른 행은 개수만 세고, 실제 행은 sample_size 개까지만 꺼낸다.
+    - column_names: 샘플 행의 키로 쓸 이름 (기본: expected 테이블의 컬럼 이름)
+    - column_match: 컬럼 매칭을 호출한 쪽이 이미 했으면 그 방식 (결과에 그대로)
+    """
+    exp_table, act_table = quote_ident(expected), quote_ident(actual)
+    exp_cols = con.execute(f"DESCRIBE {exp_table}").fetchall()
+    act_cols = con.execute(f"DESCRIBE {act_table}").fetchall()
+
+    def count(source: str) -> int:
+        return con.execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0]
+
+    result: Dict[str, Any] = {
+        "correct": False,
+        "expected_rows": count(exp_table),
+        "user_rows": count(act_table),
+        "column_match": None,
+        "missing_count": 0,
+        "extra_count": 0,
+        "order_matches": None,
+        "missing_rows": [],
+        "extra_rows": [],
+    }
+
+    order, matched_by = match_columns([c[0] for c in exp_cols], [c[0] for c in act_cols])
+    result["column_match"] = column_match if order is not None and column_match else matched_by
+    if order is None:
+        result["error"] = (
+            f"column count differs: expected {len(exp_cols)}, got {len(act_cols)}"
+        )
+        return result
+
+    decimals = max(0, round(-math.log10(float_tolerance))) if float_tolerance > 0 else 12
+    exp_exprs: List[str] = []
+    act_exprs: List[str] = []
+    exp_select: List[str] = []
+    for (exp_name, exp_type, *_), pos in zip(exp_cols, order):
+        act_name, act_type = act_cols[pos][:2]
+        exp_kind, act_kind = _kind(exp_type), _kind(act_type)
+        if {exp_kind, act_kind} == {"integer", "number"}:
+            exp_kind = act_kind = "number"
+        elif exp_kind != act_kind:
+            exp_kind = act_kind = "text"
+        exp_expr = _canonical(f"e.{quote_ident(exp_name)}", exp_type, exp_kind, decimals)
+        act_expr = _canonical(f"u.{quote_ident(act_name)}", act_type, act_kind, decimals)
+        exp_exprs.append(exp_expr)
+        act_exprs.append(act_expr)
+        exp_select.append(f"{exp_expr} AS {quote_ident(exp_name)}")
+
+    # EXCEPT ALL 을 양방향으로 두 번 돌리는 대신 한 번의 GROUP BY 로:
+    # 행마다 +1(정답) / -1(제출) 을 더해서 0 이 아닌 행만 남긴다
+    #   __diff > 0 : 정답에만 있는 행 (그만큼 빠짐) / __diff < 0 : 제출에만 있는 행
+    names = ", ".join(quote_ident(c[0]) for c in exp_cols)
+    diff_table = quote_ident(f"{expected}_diff")
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE {diff_table} AS "
+        f"SELECT {names}, CAST(SUM(__side) AS BIGINT) AS __diff FROM ("
+        f"SELECT {', '.join(exp_select)}, 1 AS __side FROM {exp_table} e "
+        f"UNION ALL SELECT {', '.join(act_exprs)}, -1 FROM {act_table} u"
+        f") GROUP BY ALL HAVING SUM(__side) <> 0"
+    )
+    missing, extra = con.execute(
+        f"SELECT COALESCE(SUM(__diff) FILTER (WHERE __diff > 0), 0), "
+        f"COALESCE(-SUM(__diff) FILTER (WHERE __diff < 0), 0) FROM {diff_table}"
+    ).fetchone()
+    result["missing_count"], result["extra_count"] = int(missing), int(extra)
+    same_rows = result["missing_count"] == 0 and result["extra_count"] == 0
+
+    if same_rows:
+        # 두 테이블 모두 결과 순서 그대로이므로 POSITIONAL JOIN 으로 같은 위치끼리 비교
+        differs = count(
+            f"{exp_table} e POSITIONAL JOIN {act_table} u "
+            f"WHERE row({', '.join(exp_exprs)}) IS DISTINCT FROM row({', '.join(act_exprs)})"
+        )
+        result["order_matches"] = differs == 0
+
+    result["correct"] = same_rows and (not check_order or result["order_matches"])
+    if sample_size > 0:
+        # 중복 행은 차이 개수만큼 반복 (range)
+        labels = unique_names(column_names or [c[0] for c in exp_cols])
+        sample_cols = ", ".join(
+            f"{quote_ident(c[0])} AS {quote_ident(label)}" for c, label in zip(exp_cols, labels)
+        )
+        sample_sql = (
+            f"SELECT {sample_cols} FROM {diff_table}, range({{}}) "
+            f"WHERE __diff {{}} 0 LIMIT {int(sample_size)}"
+        )
+        if result["missing_count"]:
+            result["missing_rows"] = _records(con, sample_sql.format("__diff", ">"))
+        if result["extra_count"]:
+            result["extra_rows"] = _records(con, sample_sql.format("-__diff", "<"))
+    return result
+
+
+def compare_arrow(
+    con,
+    expected: pa.Table,
+    actual: pa.Table,
+    check_order: bool = False,
+    float_tolerance: float = 1e-6,
+    sample_size: int = 20,
+) -> Dict[str, Any]:
+    """
+    두 Arrow 결과를 con 에 등록해서 compare_tables 로 비교.
+    컬럼 매칭은 원래 이름으로 먼저 하고, 등록할 때는 양쪽을 위치 이름(c0..cN)으로 바꾼다
+    (SELECT 1 x, 1 x 처럼 이름이 겹치는 결과도 DuckDB 에서 참조할 수 있게).
+    등록한 테이블은 이 cursor 에서만 보인다 (복사 없이 스캔)
+    """
+    order, column_match = match_columns(expected.column_names, actual.column_names)
+    if order is not None:
+        actual = actual.select(order)
+    con.register(
+        "eval_expected", expected.rename_columns(positional_names(expected.num_columns))
+    )
+    con.register("eval_user", actual.rename_columns(positional_names(actual.num_columns)))
+    return compare_tables(
+        con,
+        "eval_expected",
+        "eval_user",
+        check_order=check_order,
+        float_tolerance=float_tolerance,
+        sample_size=sample_size,
+        column_names=expected.column_names,
+        column_match=column_match,
+    )
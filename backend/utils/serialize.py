@@ -0,0 +1,42 @@
+import json
+import math
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any
+
+
+def _finite(value: Any) -> Any:
+    """NaN / Infinity 는 JSON 에 없는 값이므로 None(null) 으로 (dict / list 안까지)"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """
+    DB 드라이버가 돌려주는 값 중 json 기본 인코더가 모르는 타입 처리
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return _finite(float(value))
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return str(value)
+
+
+def dumps(obj: Any) -> str:
+    """
+    JSON 문자열. 비유한 실수는 bare NaN 토큰(잘못된 JSON) 대신 null 로 쓴다.
+    allow_nan=False 로 먼저 시도하고, 걸리면 그때만 값을 훑어서 바꾼다
+    """
+    try:
+        return json.dumps(obj, default=json_default, ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        return json.dumps(
+            _finite(obj), default=json_default, ensure_ascii=False, allow_nan=False
+        )
@@ -1,4 +1,5 @@
 import axios from "axios";
+import { DataType, tableFromIPC } from "apache-arrow";
 
 export const API_URL = process.env.NEXT_PUBLIC_API_URL;
 
@@ -19,4 +20,56 @@ api.interceptors.response.use(
   }
 );
 
+// ----------------------------------------
+// Arrow IPC 응답 (/sql/run, /analytics/daily-metrics)
+// ----------------------------------------
+
+export const ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream";
+
+export type TableResult = {
+  columns: string[];
+  rows: Record<string, any>[];
+};
+
+// JSON 응답과 같은 모양으로: int64 는 Number(범위 밖이면 문자열), 날짜는 ISO 문자열
+const toPlain = (value: any, type: DataType): any => {
+  if (value === null || value === undefined) return null;
+  if (typeof value === "bigint") {
+    return Number.isSafeInteger(Number(value)) ? Number(value) : value.toString();
+  }
+  if (DataType.isTimestamp(type) || DataType.isDate(type)) {
+    return new Date(Number(value)).toISOString();
+  }
+  return value;
+};
+
+export const decodeArrow = (buf: ArrayBuffer): TableResult => {
+  const table = tableFromIPC(new Uint8Array(buf));
+  const fields = table.schema.fields;
+  const columns = fields.map((f) => f.name);
+  // 컬럼 벡터를 한 번씩만 순회해서 행 객체로
+  const rows: Record<string, any>[] = Array.from({ length: table.numRows }, () => ({}));
+  fields.forEach((f, i) => {
+    const vector = table.getChildAt(i);
+    if (!vector) return;
+    let r = 0;
+    for (const value of vector) {
+      rows[r++][f.name] = toPlain(value, f.type);
+    }
+  });
+  return { columns, rows };
+};
+
+// Accept: Arrow 로 요청하고 디코드. data 가 있으면 POST, 없으면 GET
+export const fetchArrow = async (url: string, data?: any): Promise<TableResult> => {
+  const res = await api.request<ArrayBuffer>({
+    url,
+    method: data === undefined ? "get" : "post",
+    data,
+    responseType: "arraybuffer",
+    headers: { Accept: ARROW_MEDIA_TYPE },
+  });
+  return decodeArrow(res.data);
+};
+
 export default api;
@@ -20,17 +20,57 @@ type HistoryItem = {
   correct?: boolean | null;
 };
 
+type PlanNode = {
+  operator: string;
+  detail?: string | null;
+  rows?: number | null;
+  loops?: number | null;
+  time_ms?: number | null;
+  children: PlanNode[];
+};
+
+type QueryProfile = {
+  engine: string;
+  timings_ms: Record<string, number>;
+  plan: { total_ms?: number | null; planning_ms?: number | null; root: PlanNode } | null;
+};
+
 type SqlResult = {
   columns: string[];
   rows: Record<string, any>[];
+  // 서버 페이지네이션 (/sql/results/{handle}?page=N)
+  handle?: string;
+  page?: number;
+  page_size?: number;
+  total_rows?: number | null;
+  has_more?: boolean;
+  // 서버 결과 크기 상한에서 잘림
+  truncated?: boolean;
+  profile?: QueryProfile;
 };
 
+// 실행 계획 트리를 들여쓰기 목록으로
+const PlanTree = ({ node, depth = 0 }: { node: PlanNode; depth?: number }) => (
+  <>
+    <div className="flex gap-3 font-mono" style={{ paddingLeft: depth * 16 }}>
+      <span className="text-draculaAccent">{node.operator}</span>
+      {node.rows != null && <span>rows={node.rows}</span>}
+      {node.time_ms != null && <span>{node.time_ms.toFixed(2)}ms</span>}
+      {node.detail && <span className="text-slate-400 truncate">{node.detail}</span>}
+    </div>
+    {node.children.map((child, i) => (
+      <PlanTree key={i} node={child} depth={depth + 1} />
+    ))}
+  </>
+);
+
 export default function SqlConsole() {
   const [engine, setEngine] = useState<Engine>("duckdb");
   const [sql, setSql] = useState<string>("SELECT * FROM events LIMIT 100;");
   const [result, setResult] = useState<SqlResult | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [profile, setProfile] = useState(false);
 
   const [activeLeftTab, setActiveLeftTab] = useState<"problem" | "schema" | "history">("problem");
   const [problem, setProblem] = useState<string>("");
@@ -83,6 +123,7 @@ export default function SqlConsole() {
       const res = await api.post<SqlResult>('/sql/run', {
         engine,
         query: sql,
+        profile,
       });
       console.log("SQL Result:")
       console.log(res);
@@ -99,7 +140,25 @@ export default function SqlConsole() {
     } finally {
       setLoading(false);
     }
-  }, [engine, sql, problem, loading]);
+  }, [engine, sql, problem, loading, profile]);
+
+  const loadPage = async (page: number) => {
+    if (!result?.handle || loading) return;
+    setLoading(true);
+    setError(null);
+    try {
+      const res = await api.get<SqlResult>(`/sql/results/${result.handle}`, {
+        params: { page },
+      });
+      setResult(res.data);
+    } catch (e: any) {
+      setError(e?.response?.data?.detail || e.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const pageStart = result?.handle ? (result.page ?? 0) * (result.page_size ?? 0) : 0;
 
   useEffect(() => {
     const handleKeyDown = (e: KeyboardEvent) => {
@@ -136,6 +195,15 @@ export default function SqlConsole() {
               <option value="mysql">MySQL</option>
             </select>
 
+            <label className="flex items-center gap-1 text-xs text-slate-400">
+              <input
+                type="checkbox"
+                checked={profile}
+                onChange={(e) => setProfile(e.target.checked)}
+              />
+              프로파일
+            </label>
+
             <button
               onClick={runSql}
               className="rounded-md bg-draculaAccent px-3 py-1 text-sm font-semibold text-black"
@@ -242,7 +310,41 @@ export default function SqlConsole() {
             <PanelResizeHandle className="h-1 bg-draculaBorder" />
             <Panel defaultSize={45} minSize={20}>
               <div className="h-full rounded-lg border border-draculaBorder bg-draculaCard p-3 text-sm flex flex-col overflow-hidden">
-                <h2 className="mb-2 text-sm font-semibold">결과</h2>
+                <div className="mb-2 flex items-center justify-between">
+                  <h2 className="text-sm font-semibold">
+                    결과
+                    {result?.truncated && (
+                      <span className="ml-2 text-xs font-normal text-yellow-400">
+                        결과가 커서 일부만 표시됩니다 (서버 상한)
+                      </span>
+                    )}
+                  </h2>
+                  {result?.handle && (
+                    <div className="flex items-center gap-2 text-xs text-slate-400">
+                      <span>
+                        {result.rows.length > 0
+                          ? `${pageStart + 1}–${pageStart + result.rows.length}`
+                          : "0"}
+                        {" / "}
+                        {result.total_rows ?? "집계 중..."}행
+                      </span>
+                      <button
+                        className="rounded border border-draculaBorder px-2 py-0.5 disabled:opacity-40"
+                        onClick={() => loadPage((result.page ?? 0) - 1)}
+                        disabled={loading || !result.page}
+                      >
+                        이전
+                      </button>
+                      <button
+                        className="rounded border border-draculaBorder px-2 py-0.5 disabled:opacity-40"
+                        onClick={() => loadPage((result.page ?? 0) + 1)}
+                        disabled={loading || !result.has_more}
+                      >
+                        다음
+                      </button>
+                    </div>
+                  )}
+                </div>
                 {error && (
                   <div className="mb-2 text-red-400 text-xs">에러: {error}</div>
                 )}
@@ -277,6 +379,22 @@ export default function SqlConsole() {
                         ))}
                       </tbody>
                     </table>
+                    {result.profile && (
+                      <div className="mt-3 border-t border-draculaBorder pt-2 text-xs">
+                        <div className="mb-1 flex flex-wrap gap-3 text-slate-400">
+                          {Object.entries(result.profile.timings_ms).map(([k, v]) => (
+                            <span key={k}>
+                              {k}: {v.toFixed(1)}ms
+                            </span>
+                          ))}
+                        </div>
+                        {result.profile.plan ? (
+                          <PlanTree node={result.profile.plan.root} />
+                        ) : (
+                          <div className="text-slate-400">실행 계획 없음 (조회문이 아님)</div>
+                        )}
+                      </div>
+                    )}
                   </div>
                 ) : !error && (
                   <div className="text-slate-400 text-xs">
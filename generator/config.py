@@ -1,23 +1,28 @@
+import hashlib
+import json
 import os
+from dataclasses import asdict, dataclass, replace
 from datetime import date, timedelta
 import random
+from typing import Optional, Tuple
 
 DATASET_DIR = os.getenv("DATASET_DIR", "db")
 DATASET_META_PATH = os.path.join(DATASET_DIR, "datasets.json")
 
-# ------------------------------
-# 자동 기간 설정
-# ------------------------------
-TOTAL_DAYS = random.randint(180, 220)   # 약 6~7개월
-TODAY = date.today()
-START_DATE = TODAY - timedelta(days=TOTAL_DAYS)
-END_DATE = TODAY
+# 생성 로직이 바뀌어 같은 설정이라도 결과가 달라지면 올린다 (config hash 에 포함)
+GENERATOR_VERSION = 3
+
+# 기본 시드: 같은 시드 + 같은 종료일이면 같은 기간/프로모션/데이터
+GENERATION_SEED = int(os.getenv("GENERATION_SEED", 42))
 
 # ------------------------------
 # User 설정
 # ------------------------------
-N_USERS = 50000               # 사용자 수
-NEW_USERS_DAILY = (50, 300)   # 하루 신규 가입자 범위
+N_USERS = int(os.getenv("N_USERS", 50000))   # 최대 사용자 수
+NEW_USERS_DAILY = (                            # 하루 신규 가입자 범위
+    int(os.getenv("NEW_USERS_DAILY_MIN", 50)),
+    int(os.getenv("NEW_USERS_DAILY_MAX", 300)),
+)
 
 # ------------------------------
 # 이벤트 확률
@@ -34,20 +39,111 @@ PROB_PURCHASE = 0.12
 DEVICES = ["web", "android", "ios"]
 CHANNELS = ["organic", "ads", "email", "push"]
 
+PROMOTION_BOOST = 3.0  # 구매율 × 3 증가
+
 # ------------------------------
-# 프로모션 일자 자동 생성
+# 저장 스키마
 # ------------------------------
-PROMOTION_DAYS = random.sample(
-    [START_DATE + timedelta(days=i) for i in range(TOTAL_DAYS)],
-    k=random.randint(8, 15)
-)
+# text:    session_id = uuid 문자열, event_name/device/channel = 문자열 컬럼
+# compact: session_id = BIGINT(YYYYMMDD × SESSIONS_PER_DAY + 일련번호),
+#          event_name/device/channel = ENUM (DuckDB/Postgres/MySQL 공통)
+STORAGE_SCHEMAS = ("text", "compact")
+STORAGE_SCHEMA = os.getenv("STORAGE_SCHEMA", "text")
+SESSIONS_PER_DAY = 1_000_000
 
-PROMOTION_BOOST = 3.0  # 구매율 × 3 증가
+
+# ------------------------------
+# 생성 설정 (seed 로 기간·프로모션 일자 결정)
+# ------------------------------
+@dataclass(frozen=True)
+class GenerationConfig:
+    """
+    데이터셋 하나를 완전히 결정하는 생성 설정.
+    from_seed() 로 만들면 기간(TOTAL_DAYS)과 프로모션 일자가 seed 에서 파생된다.
+    config_hash() 가 같으면 같은 데이터셋으로 보고 스냅샷을 재사용한다.
+    """
+
+    seed: int
+    start_date: date
+    end_date: date
+    promotion_days: Tuple[date, ...]
+    n_users: int = N_USERS
+    new_users_daily: Tuple[int, int] = NEW_USERS_DAILY
+    event_engine: str = "numpy"
+    storage_schema: str = STORAGE_SCHEMA
+
+    @classmethod
+    def from_seed(
+        cls,
+        seed: int = GENERATION_SEED,
+        end_date: Optional[date] = None,
+        total_days: Optional[int] = None,
+        **overrides,
+    ) -> "GenerationConfig":
+        """
+        end_date 를 주지 않으면 date.today() 이고, end_date 는 config_hash 에 들어간다.
+        → 같은 seed 라도 날짜가 바뀌면 다른 데이터셋 (스냅샷 재사용은 같은 날 안에서만)
+        """
+        rng = random.Random(seed)
+        if total_days is None:
+            total_days = rng.randint(180, 220)   # 약 6~7개월
+        if end_date is None:
+            end_date = date.today()
+        start_date = end_date - timedelta(days=total_days)
+        promotion_days = rng.sample(
+            [start_date + timedelta(days=i) for i in range(total_days)],
+            k=min(total_days, rng.randint(8, 15)),
+        )
+        return cls(
+            seed=seed,
+            start_date=start_date,
+            end_date=end_date,
+            promotion_days=tuple(sorted(promotion_days)),
+            **overrides,
+        )
+
+    @property
+    def total_days(self) -> int:
+        return (self.end_date - self.start_date).days
+
+    @property
+    def compact(self) -> bool:
+        return self.storage_schema == "compact"
+
+    def with_end_date(self, end_date: date) -> "GenerationConfig":
+        return replace(self, end_date=end_date)
+
+    def config_hash(self) -> str:
+        # 설정값 + 결과에 영향을 주는 코드 상수 (바뀌면 다른 데이터셋)
+        payload = {
+            "config": asdict(self),
+            "generator_version": GENERATOR_VERSION,
+            "probs": [PROB_VIEW, PROB_CART, PROB_CHECKOUT, PROB_PURCHASE],
+            "promotion_boost": PROMOTION_BOOST,
+            "devices": DEVICES,
+            "channels": CHANNELS,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+# ------------------------------
+# 기본 기간 설정 (모듈 상수는 기본 설정에서 파생)
+# ------------------------------
+DEFAULT_CONFIG = GenerationConfig.from_seed(GENERATION_SEED)
+
+TOTAL_DAYS = DEFAULT_CONFIG.total_days
+TODAY = DEFAULT_CONFIG.end_date
+START_DATE = DEFAULT_CONFIG.start_date
+END_DATE = DEFAULT_CONFIG.end_date
+PROMOTION_DAYS = list(DEFAULT_CONFIG.promotion_days)
 
 # ------------------------------
 # DB 정보
 # ------------------------------
 DUCKDB_PATH = os.getenv("DUCKDB_PATH", "db/event_log.duckdb")
+PARQUET_DIR = os.getenv("PARQUET_DIR", os.path.join(DATASET_DIR, "parquet"))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(DATASET_DIR, "snapshots"))
 
 PG_CONFIG = {
     "host": os.getenv("PG_HOST", "postgres"),
@@ -1,7 +1,9 @@
 import os
 import random
-from datetime import timedelta, datetime
-from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Optional
+from itertools import chain
+from dataclasses import replace
+from datetime import date, timedelta, datetime
+from typing import Callable, Collection, Iterable, List, Sequence, Tuple, Optional
 
 import duckdb
 import psycopg2
@@ -9,25 +11,42 @@ import mysql.connector
 from tqdm import tqdm
 
 from generator.config import (
+    CHANNELS,
+    DEFAULT_CONFIG,
+    DEVICES,
+    GENERATION_SEED,
+    GenerationConfig,
     START_DATE,
     END_DATE,
-    N_USERS,
-    NEW_USERS_DAILY,
     PROB_VISIT,
     PROB_VIEW,
     PROB_CART,
     PROB_CHECKOUT,
     PROB_PURCHASE,
-    DEVICES,
-    CHANNELS,
     PROMOTION_DAYS,
     PROMOTION_BOOST,
     DUCKDB_PATH,
+    PARQUET_DIR,
     PG_CONFIG,
     MYSQL_CONFIG,
+    SESSIONS_PER_DAY,
+    STORAGE_SCHEMAS,
 )
 
-from generator.utils import generate_session_id, generate_ts
+from generator.utils import generate_dt, generate_session_id, session_base
+from generator.users import UserTable, generate_user_table
+from generator.vectorized import EVENT_NAMES, generate_events_vectorized, users_rng
+from generator.parallel import generate_events_parallel
+from generator.pipeline import fan_out
+from generator.sinks import (
+    DuckDBSink,
+    MySQLSink,
+    ParquetSink,
+    PostgresSink,
+    daily_to_arrow,
+    events_to_arrow,
+)
+from generator.snapshots import find_snapshot, iter_snapshot_batches, save_snapshot
 
 # 타입 alias
 EventRow = Tuple[int, str, str, datetime, str, str]
@@ -40,32 +59,18 @@ ProgressCallback = Callable[[int], None]
 # ----------------------------------------
 
 
-def generate_users() -> Dict[int, Dict[str, object]]:
+def generate_users(config: GenerationConfig = DEFAULT_CONFIG) -> UserTable:
     """
-    일자별로 신규 유저를 생성해 전체 유저 딕셔너리를 반환.
-    {user_id: {"signup_date": date, "device": ..., "channel": ...}}
+    일자별로 신규 유저를 생성해 UserTable(컬럼 배열)로 반환.
+    user_id 는 1 부터 연속, 전체 유저 수는 config.n_users 에서 자른다.
     """
-    users: Dict[int, Dict[str, object]] = {}
-    cur_user_id = 1
-    total_days = (END_DATE - START_DATE).days
-
-    for d in range(total_days):
-        day = START_DATE + timedelta(days=d)
-        new_users = random.randint(*NEW_USERS_DAILY)
-
-        for _ in range(new_users):
-            users[cur_user_id] = {
-                "signup_date": day,
-                "device": random.choice(DEVICES),
-                "channel": random.choice(CHANNELS),
-            }
-            cur_user_id += 1
-
-        # 안전장치: 최대 유저 수를 초과하지 않도록
-        if cur_user_id > N_USERS:
-            break
-
-    return users
+    return generate_user_table(
+        users_rng(config.seed),
+        config.start_date,
+        config.total_days,
+        config.new_users_daily,
+        config.n_users,
+    )
 
 
 # ----------------------------------------
@@ -74,8 +79,13 @@ def generate_users() -> Dict[int, Dict[str, object]]:
 
 
 def generate_events(
-    users: Dict[int, Dict[str, object]],
+    users: UserTable,
     progress_callback: Optional[ProgressCallback] = None,
+    start_date: date = START_DATE,
+    first_day: int = 0,
+    last_day: Optional[int] = None,
+    promotion_days: Collection[date] = PROMOTION_DAYS,
+    compact: bool = False,
 ) -> Iterable[Tuple[List[EventRow], List[DailyRow]]]:
     """
     (events_batch, daily_batch)를 yield 하는 제너레이터.
@@ -83,21 +93,26 @@ def generate_events(
     daily_batch:  [(date, revenue, purchases), ...]
 
     progress_callback: 전체 날짜 진행률(0~100)을 int로 넘기는 콜백
+    start_date 기준 [first_day, last_day) 구간만 생성 (기본: START_DATE ~ END_DATE)
+    compact: session_id 를 uuid 문자열 대신 하루 단위 정수 일련번호로 생성
     """
-    total_days = (END_DATE - START_DATE).days
+    if last_day is None:
+        last_day = (END_DATE - start_date).days
+    total_days = last_day - first_day
     events_batch: List[EventRow] = []
     daily_batch: List[DailyRow] = []
     BATCH_THRESHOLD = 200_000
 
-    user_ids = list(users.keys())
+    # range 는 복사 없이 random.sample 가능 (user_id 는 연속)
+    user_ids = range(users.first_user_id, users.first_user_id + len(users))
 
-    for d in tqdm(range(total_days), desc="Generating events"):
-        day = START_DATE + timedelta(days=d)
+    for d in tqdm(range(first_day, last_day), desc="Generating events"):
+        day = start_date + timedelta(days=d)
         day_str = str(day)
 
         # 프로그레스 업데이트 (일 기준)
         if total_days > 0 and progress_callback is not None:
-            progress = int((d / total_days) * 100)
+            progress = int(((d - first_day) / total_days) * 100)
             progress_callback(progress)
 
         # 오늘 활성 유저
@@ -112,15 +127,19 @@ def generate_events(
 
         revenue_today = 0
         purchase_count = 0
+        next_session = session_base(day, SESSIONS_PER_DAY)
 
-        boost = PROMOTION_BOOST if day in PROMOTION_DAYS else 1.0
+        boost = PROMOTION_BOOST if day in promotion_days else 1.0
 
         for user in active_users:
-            base = users.get(user, {})
-            device = base.get("device", random.choice(DEVICES))
-            channel = base.get("channel", random.choice(CHANNELS))
+            device = users.device_of(user)
+            channel = users.channel_of(user)
 
-            session_id = generate_session_id()
+            if compact:
+                session_id = next_session
+                next_session += 1
+            else:
+                session_id = generate_session_id()
 
             # VISIT (무조건 1개)
             events_batch.append(
@@ -128,9 +147,9 @@ def generate_events(
                     user,
                     session_id,
                     "visit",
-                    generate_ts(day_str),
-                    device,  # type: ignore[arg-type]
-                    channel,  # type: ignore[arg-type]
+                    generate_dt(day),
+                    device,
+                    channel,
                 )
             )
 
@@ -141,9 +160,9 @@ def generate_events(
                         user,
                         session_id,
                         "view_product",
-                        generate_ts(day_str),
-                        device,  # type: ignore[arg-type]
-                        channel,  # type: ignore[arg-type]
+                        generate_dt(day),
+                        device,
+                        channel,
                     )
                 )
 
@@ -154,9 +173,9 @@ def generate_events(
                         user,
                         session_id,
                         "add_to_cart",
-                        generate_ts(day_str),
-                        device,  # type: ignore[arg-type]
-                        channel,  # type: ignore[arg-type]
+                        generate_dt(day),
+                        device,
+                        channel,
                     )
                 )
 
@@ -167,9 +186,9 @@ def generate_events(
                         user,
                         session_id,
                         "checkout",
-                        generate_ts(day_str),
-                        device,  # type: ignore[arg-type]
-                        channel,  # type: ignore[arg-type]
+                        generate_dt(day),
+                        device,
+                        channel,
                     )
                 )
 
@@ -184,9 +203,9 @@ def generate_events(
                         user,
                         session_id,
                         "purchase",
-                        generate_ts(day_str),
-                        device,  # type: ignore[arg-type]
-                        channel,  # type: ignore[arg-type]
+                        generate_dt(day),
+                        device,
+                        channel,
                     )
                 )
 
@@ -208,16 +227,63 @@ def generate_events(
 # ----------------------------------------
 
 
-def init_duckdb(conn: duckdb.DuckDBPyConnection) -> None:
+# compact 스키마의 ENUM 타입 (DuckDB/Postgres) 과 라벨 (= 사전 인코딩 코드 순서)
+ENUM_TYPES = {
+    "event_name_t": list(EVENT_NAMES),
+    "device_t": DEVICES,
+    "channel_t": CHANNELS,
+}
+
+
+def _enum_labels(labels: Sequence[str]) -> str:
+    return ", ".join(f"'{label}'" for label in labels)
+
+
+def init_duckdb(
+    conn: duckdb.DuckDBPyConnection, truncate: bool = True, compact: bool = False
+) -> None:
+    """
+    truncate=True 면 테이블을 지우고 새로 만든다 (text ↔ compact 전환 포함).
+    compact=True 면 session_id BIGINT, event_name/device/channel ENUM.
+    """
+    if truncate:
+        for table_name in ("users", "events", "daily_metrics"):
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        for type_name in ENUM_TYPES:
+            conn.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+    if compact:
+        for type_name, labels in ENUM_TYPES.items():
+            conn.execute(
+                f"CREATE TYPE IF NOT EXISTS {type_name} AS ENUM ({_enum_labels(labels)})"
+            )
+        session_t, event_t, device_t, channel_t = (
+            "BIGINT", "event_name_t", "device_t", "channel_t"
+        )
+    else:
+        session_t, event_t, device_t, channel_t = (
+            "VARCHAR", "VARCHAR", "VARCHAR", "VARCHAR"
+        )
+
     conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER,
+            signup_date DATE,
+            device {device_t},
+            channel {channel_t}
+        )
         """
+    )
+    conn.execute(
+        f"""
         CREATE TABLE IF NOT EXISTS events (
             user_id INTEGER,
-            session_id VARCHAR,
-            event_name VARCHAR,
+            session_id {session_t},
+            event_name {event_t},
             event_time TIMESTAMP,
-            device VARCHAR,
-            channel VARCHAR
+            device {device_t},
+            channel {channel_t}
         )
         """
     )
@@ -230,20 +296,51 @@ def init_duckdb(conn: duckdb.DuckDBPyConnection) -> None:
         )
         """
     )
-    conn.execute("DELETE FROM events")
-    conn.execute("DELETE FROM daily_metrics")
 
 
-def init_postgres(cur) -> None:
+def init_postgres(cur, truncate: bool = True, compact: bool = False) -> None:
+    # text ↔ compact 전환이 있을 수 있어 TRUNCATE 대신 테이블째 다시 만든다
+    if truncate:
+        cur.execute("DROP TABLE IF EXISTS users, events, daily_metrics")
+        for type_name in ENUM_TYPES:
+            cur.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+    if compact:
+        # Postgres 에는 CREATE TYPE IF NOT EXISTS 가 없다
+        for type_name, labels in ENUM_TYPES.items():
+            cur.execute(
+                f"""
+                DO $$ BEGIN
+                    CREATE TYPE {type_name} AS ENUM ({_enum_labels(labels)});
+                EXCEPTION WHEN duplicate_object THEN NULL;
+                END $$
+                """
+            )
+        session_t, event_t, device_t, channel_t = (
+            "BIGINT", "event_name_t", "device_t", "channel_t"
+        )
+    else:
+        session_t, event_t, device_t, channel_t = "TEXT", "TEXT", "TEXT", "TEXT"
+
     cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT,
+            signup_date DATE,
+            device {device_t},
+            channel {channel_t}
+        )
         """
+    )
+    cur.execute(
+        f"""
         CREATE TABLE IF NOT EXISTS events (
             user_id INT,
-            session_id TEXT,
-            event_name TEXT,
+            session_id {session_t},
+            event_name {event_t},
             event_time TIMESTAMP,
-            device TEXT,
-            channel TEXT
+            device {device_t},
+            channel {channel_t}
         )
         """
     )
@@ -256,20 +353,41 @@ def init_postgres(cur) -> None:
         )
         """
     )
-    cur.execute("DELETE FROM events")
-    cur.execute("DELETE FROM daily_metrics")
 
 
-def init_mysql(cur) -> None:
+def init_mysql(cur, truncate: bool = True, compact: bool = False) -> None:
+    if truncate:
+        cur.execute("DROP TABLE IF EXISTS users, events, daily_metrics")
+
+    if compact:
+        session_t = "BIGINT"
+        event_t = f"ENUM({_enum_labels(ENUM_TYPES['event_name_t'])})"
+        device_t = f"ENUM({_enum_labels(ENUM_TYPES['device_t'])})"
+        channel_t = f"ENUM({_enum_labels(ENUM_TYPES['channel_t'])})"
+    else:
+        session_t, event_t, device_t, channel_t = (
+            "VARCHAR(64)", "VARCHAR(50)", "VARCHAR(20)", "VARCHAR(20)"
+        )
+
     cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT,
+            signup_date DATE,
+            device {device_t},
+            channel {channel_t}
+        )
         """
+    )
+    cur.execute(
+        f"""
         CREATE TABLE IF NOT EXISTS events (
             user_id INT,
-            session_id VARCHAR(64),
-            event_name VARCHAR(50),
+            session_id {session_t},
+            event_name {event_t},
             event_time DATETIME,
-            device VARCHAR(20),
-            channel VARCHAR(20)
+            device {device_t},
+            channel {channel_t}
         )
         """
     )
@@ -282,8 +400,23 @@ def init_mysql(cur) -> None:
         )
         """
     )
-    cur.execute("DELETE FROM events")
-    cur.execute("DELETE FROM daily_metrics")
+
+
+def detect_storage_schema(con: duckdb.DuckDBPyConnection) -> Optional[str]:
+    """
+    기존 DuckDB events 테이블의 session_id 타입으로 저장 스키마를 판별.
+    (append 는 기존 테이블의 스키마를 그대로 따라야 한다)
+    """
+    row = con.execute(
+        """
+        SELECT data_type
+        FROM information_schema.columns
+        WHERE table_name = 'events' AND column_name = 'session_id'
+        """
+    ).fetchone()
+    if row is None:
+        return None
+    return "compact" if row[0] == "BIGINT" else "text"
 
 
 # ----------------------------------------
@@ -291,9 +424,17 @@ def init_mysql(cur) -> None:
 # ----------------------------------------
 
 
-def register_dataset_version(generator_type: str = "advanced") -> None:
+def register_dataset_version(
+    generator_type: str = "advanced",
+    start_date: date = START_DATE,
+    end_date: date = END_DATE,
+    config_hash: Optional[str] = None,
+) -> None:
     """
     DuckDB 내부에 dataset_versions 테이블로 버전 메타를 기록.
+    events 요약(사용자/이벤트 수, 기간)은 events_summary 에 버전과 함께 저장.
+    end_date 는 생성된 마지막 날짜의 다음 날 (append 모드의 다음 시작점).
+    config_hash 는 GenerationConfig.config_hash() (스냅샷 재사용 키, append 는 None)
     """
     con = duckdb.connect(DUCKDB_PATH)
     con.execute(
@@ -305,123 +446,314 @@ def register_dataset_version(generator_type: str = "advanced") -> None:
           start_date DATE,
           end_date DATE,
           n_users BIGINT,
-          n_events BIGINT
+          n_events BIGINT,
+          config_hash VARCHAR
         )
         """
     )
+    # config_hash 컬럼 이전에 만들어진 DB 호환
+    con.execute(
+        "ALTER TABLE dataset_versions ADD COLUMN IF NOT EXISTS config_hash VARCHAR"
+    )
     cur_max = con.execute(
         "SELECT COALESCE(MAX(version_id), 0) FROM dataset_versions"
     ).fetchone()[0]
     new_id = int(cur_max) + 1
 
-    n_users = con.execute(
-        "SELECT COUNT(DISTINCT user_id) FROM events"
-    ).fetchone()[0]
-    n_events = con.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    # 대시보드(/analytics/summary)용 요약: events 를 한 번만 훑어서 같이 계산해 둔다
+    con.execute(
+        """
+        CREATE OR REPLACE TABLE events_summary AS
+        SELECT
+          CAST(? AS BIGINT) AS version_id,
+          COUNT(DISTINCT user_id) AS total_users,
+          COUNT(*) AS total_events,
+          MIN(event_time) AS start_time,
+          MAX(event_time) AS end_time,
+          CAST(? AS TIMESTAMP) AS computed_at
+        FROM events
+        """,
+        (new_id, datetime.utcnow()),
+    )
+    n_users, n_events = con.execute(
+        "SELECT total_users, total_events FROM events_summary"
+    ).fetchone()
 
     con.execute(
-        "INSERT INTO dataset_versions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        """
+        INSERT INTO dataset_versions
+          (version_id, created_at, generator_type, start_date, end_date,
+           n_users, n_events, config_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
         (
             new_id,
             datetime.utcnow(),
             generator_type,
-            START_DATE,
-            END_DATE,
+            start_date,
+            end_date,
             int(n_users),
             int(n_events),
+            config_hash,
         ),
     )
     con.close()
 
 
+def load_append_state() -> Optional[Tuple[date, date, UserTable, str]]:
+    """
+    append 모드의 출발점: 최신 dataset_versions 의 (start_date, end_date),
+    DuckDB users 테이블에서 복원한 UserTable, 기존 테이블의 저장 스키마.
+    기존 데이터셋(또는 users 테이블)이 없으면 None.
+    """
+    if not os.path.exists(DUCKDB_PATH):
+        return None
+
+    con = duckdb.connect(DUCKDB_PATH)
+    try:
+        row = con.execute(
+            """
+            SELECT start_date, end_date
+            FROM dataset_versions
+            ORDER BY version_id DESC
+            LIMIT 1
+            """
+        ).fetchone()
+        if row is None:
+            return None
+
+        users_tbl = con.execute(
+            """
+            SELECT user_id, signup_date, device::VARCHAR AS device,
+                   channel::VARCHAR AS channel
+            FROM users
+            ORDER BY user_id
+            """
+        ).fetch_arrow_table()
+        storage_schema = detect_storage_schema(con)
+    except duckdb.CatalogException:
+        return None
+    finally:
+        con.close()
+
+    return row[0], row[1], UserTable.from_arrow(users_tbl), storage_schema or "text"
+
+
 # ----------------------------------------
 # MAIN orchestration
 # ----------------------------------------
 
 
-def generate_data(
-    save_to: Sequence[str] = ("duckdb", "postgres", "mysql"),
-    progress_callback: Optional[ProgressCallback] = None,
-) -> None:
+def _open_sinks(
+    save_to: Sequence[str],
+    truncate: bool,
+    part: Optional[str] = None,
+    compact: bool = False,
+) -> List[Tuple[str, object]]:
     """
-    고급형 데이터 생성기.
-    - save_to: ("duckdb", "postgres", "mysql") 중 하나 또는 여러 개 선택 가능
-    - progress_callback: 진행률(0~100)을 int로 받는 콜백 (옵션)
+    save_to 에 해당하는 sink 들을 열고 테이블을 준비한다.
+    truncate=False(append)면 기존 행을 남기고, Postgres 인덱스도 유지한다.
+    compact: 테이블을 compact 저장 스키마로 만든다
     """
-    print("📌 사용자 생성 중...")
-    if progress_callback is not None:
-        progress_callback(0)
-
-    users = generate_users()
+    sinks: List[Tuple[str, object]] = []
 
-    print("📌 이벤트 생성 및 저장 시작 (streaming)...")
-
-    # DuckDB 준비
-    duck_con: Optional[duckdb.DuckDBPyConnection] = None
     if "duckdb" in save_to:
         os.makedirs(os.path.dirname(DUCKDB_PATH), exist_ok=True)
         duck_con = duckdb.connect(DUCKDB_PATH)
-        init_duckdb(duck_con)
+        init_duckdb(duck_con, truncate=truncate, compact=compact)
+        sinks.append(("duckdb", DuckDBSink(duck_con)))
+
+    if "parquet" in save_to:
+        sinks.append(("parquet", ParquetSink(PARQUET_DIR, part=part)))
 
-    # Postgres 준비
-    pg_con = pg_cur = None
     if "postgres" in save_to:
         pg_con = psycopg2.connect(**PG_CONFIG)
-        pg_cur = pg_con.cursor()
-        init_postgres(pg_cur)
+        with pg_con.cursor() as pg_cur:
+            init_postgres(pg_cur, truncate=truncate, compact=compact)
+        # append 는 적재량이 작아서 인덱스를 유지한 채 넣는 편이 싸다
+        sinks.append(("postgres", PostgresSink(pg_con, rebuild_indexes=truncate)))
 
-    # MySQL 준비
-    my_con = my_cur = None
     if "mysql" in save_to:
-        my_con = mysql.connector.connect(**MYSQL_CONFIG)
+        my_con = mysql.connector.connect(**MYSQL_CONFIG, allow_local_infile=True)
         my_cur = my_con.cursor()
-        init_mysql(my_cur)
-
-    # 스트리밍으로 배치 삽입
-    for events_batch, daily_batch in generate_events(
-        users, progress_callback=progress_callback
-    ):
-        if duck_con is not None:
-            duck_con.executemany(
-                "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events_batch
-            )
-            duck_con.executemany(
-                "INSERT INTO daily_metrics VALUES (?, ?, ?)", daily_batch
-            )
+        init_mysql(my_cur, truncate=truncate, compact=compact)
+        my_cur.close()
+        sinks.append(("mysql", MySQLSink(my_con)))
 
-        if pg_cur is not None:
-            pg_cur.executemany(
-                "INSERT INTO events VALUES (%s, %s, %s, %s, %s, %s)", events_batch
-            )
-            pg_cur.executemany(
-                "INSERT INTO daily_metrics VALUES (%s, %s, %s)", daily_batch
+    return sinks
+
+
+def generate_data(
+    save_to: Sequence[str] = ("duckdb", "postgres", "mysql"),
+    progress_callback: Optional[ProgressCallback] = None,
+    event_engine: str = "python",
+    workers: int = 1,
+    seed: Optional[int] = None,
+    mode: str = "full",
+    config: Optional[GenerationConfig] = None,
+    use_cache: bool = True,
+    storage_schema: Optional[str] = None,
+) -> None:
+    """
+    고급형 데이터 생성기.
+    - save_to: ("duckdb", "postgres", "mysql", "parquet") 중 하나 또는 여러 개 선택 가능
+      ("parquet"은 PARQUET_DIR 아래 테이블별 Parquet 파일로 기록)
+    - progress_callback: 진행률(0~100)을 int로 받는 콜백 (옵션)
+    - event_engine: "python" (유저별 루프) 또는 "numpy" (하루 단위 벡터 연산)
+    - workers: 2 이상이면 날짜 샤드를 여러 프로세스에서 생성 (numpy 엔진 전용)
+    - seed: 생성 시드 (기본 GENERATION_SEED). 기간·프로모션 일자도 seed 에서 파생
+    - mode: "full" (전체 재생성) 또는 "append" (마지막 버전의 end_date ~ 오늘까지만
+      생성해서 기존 테이블 뒤에 추가). 기존 데이터셋이 없으면 full 로 동작.
+      추가하는 신규 가입자는 (seed, 추가 시작 날짜) 로 파생한 별도 난수 스트림에서 뽑는다
+    - config: 명시적 생성 설정 (주어지면 seed/event_engine 대신 사용)
+    - use_cache: full 모드에서 같은 config_hash 의 스냅샷이 있으면 생성 대신 복원
+    - storage_schema: "text" 또는 "compact" (기본 STORAGE_SCHEMA).
+      append 모드는 기존 테이블의 스키마를 따른다
+    """
+    if config is None:
+        config = GenerationConfig.from_seed(
+            GENERATION_SEED if seed is None else seed, event_engine=event_engine
+        )
+    if storage_schema is not None:
+        config = replace(config, storage_schema=storage_schema)
+    event_engine = config.event_engine
+
+    if event_engine not in ("python", "numpy"):
+        raise ValueError(f"Unknown event engine: {event_engine}")
+    if workers > 1 and event_engine != "numpy":
+        raise ValueError("parallel generation requires event_engine='numpy'")
+    if mode not in ("full", "append"):
+        raise ValueError(f"Unknown generation mode: {mode}")
+    if config.storage_schema not in STORAGE_SCHEMAS:
+        raise ValueError(f"Unknown storage schema: {config.storage_schema}")
+
+    if progress_callback is not None:
+        progress_callback(0)
+
+    config_hash = config.config_hash()
+
+    # 같은 설정으로 만든 스냅샷이 있으면 생성 없이 그대로 복원
+    snapshot = find_snapshot(config_hash) if mode == "full" and use_cache else None
+    if snapshot is not None:
+        print(f"♻️ 스냅샷 복원 (config {config_hash})...")
+        sinks = _open_sinks(save_to, truncate=True, compact=config.compact)
+        fan_out(iter_snapshot_batches(snapshot), sinks)
+        if "duckdb" in save_to:
+            register_dataset_version(
+                generator_type="advanced-cache",
+                start_date=config.start_date,
+                end_date=config.end_date,
+                config_hash=config_hash,
             )
+        if progress_callback is not None:
+            progress_callback(100)
+        print("✨ 스냅샷 복원 완료!")
+        return
+
+    print("📌 사용자 생성 중...")
 
-        if my_cur is not None:
-            my_cur.executemany(
-                "INSERT INTO events VALUES (%s, %s, %s, %s, %s, %s)", events_batch
+    start_date = config.start_date
+    first_day = 0
+    last_day = config.total_days
+    promotion_days = config.promotion_days
+
+    state = load_append_state() if mode == "append" else None
+    if mode == "append" and state is None:
+        print("⚠️ 기존 데이터셋이 없어 전체 생성으로 진행합니다.")
+        mode = "full"
+
+    if state is not None:
+        start_date, prev_end, existing_users, existing_schema = state
+        config = replace(config, storage_schema=existing_schema)
+        first_day = (prev_end - start_date).days
+        last_day = (config.end_date - start_date).days
+
+        if first_day >= last_day:
+            print("✅ 이미 최신 데이터셋입니다. (추가할 날짜 없음)")
+            if progress_callback is not None:
+                progress_callback(100)
+            return
+
+        # 기존 유저 + 새 날짜의 신규 가입자 (sink 에는 신규 가입자만 기록)
+        new_users = generate_user_table(
+            users_rng(config.seed, first_day),
+            start_date + timedelta(days=first_day),
+            last_day - first_day,
+            config.new_users_daily,
+            max(0, config.n_users - len(existing_users)),
+            first_user_id=existing_users.first_user_id + len(existing_users),
+        )
+        users = existing_users.extend(new_users)
+    else:
+        users = new_users = generate_users(config)
+
+    truncate = mode == "full"
+    end_date = start_date + timedelta(days=last_day)
+
+    print(f"📌 이벤트 생성 및 저장 시작 (streaming, {mode})...")
+
+    # append 는 기존 Parquet 파일을 덮어쓰지 않도록 구간별 part 파일로 기록
+    part = None
+    if not truncate:
+        part = (start_date + timedelta(days=first_day)).strftime("%Y%m%d")
+    compact = config.compact
+    sinks = _open_sinks(save_to, truncate=truncate, part=part, compact=compact)
+
+    day_range = dict(
+        start_date=start_date,
+        first_day=first_day,
+        last_day=last_day,
+        promotion_days=promotion_days,
+        compact=compact,
+    )
+    if event_engine == "numpy":
+        if workers > 1:
+            batches = generate_events_parallel(
+                users,
+                progress_callback=progress_callback,
+                seed=config.seed,
+                workers=workers,
+                **day_range,
             )
-            my_cur.executemany(
-                "INSERT INTO daily_metrics VALUES (%s, %s, %s)", daily_batch
+        else:
+            batches = generate_events_vectorized(
+                users,
+                progress_callback=progress_callback,
+                seed=config.seed,
+                **day_range,
             )
+    else:
+        random.seed(config.seed)
+        batches = generate_events(
+            users, progress_callback=progress_callback, **day_range
+        )
 
-    # 커밋 및 연결 종료
-    if duck_con is not None:
-        duck_con.close()
-
-    if pg_con is not None:
-        pg_con.commit()
-        pg_cur.close()
-        pg_con.close()
+    # 배치마다 Arrow Table로 한 번만 변환해서 모든 sink가 공유
+    # (users 차원 테이블 청크를 먼저 흘려보낸 뒤 이벤트 배치)
+    user_batches = (
+        {"users": table} for table in new_users.iter_arrow(compact=compact)
+    )
+    event_batches = (
+        {
+            "events": events_to_arrow(raw_events, compact=compact),
+            "daily_metrics": daily_to_arrow(raw_daily),
+        }
+        for raw_events, raw_daily in batches
+    )
 
-    if my_con is not None:
-        my_con.commit()
-        my_cur.close()
-        my_con.close()
+    # sink별 스레드가 bounded queue 에서 꺼내 적재 (커밋/연결 종료 포함)
+    fan_out(chain(user_batches, event_batches), sinks)
 
-    # 버전 메타 기록 (DuckDB 기준)
+    # 버전 메타 기록 + 스냅샷 저장 (DuckDB 기준, 전체 생성만 캐시 대상)
     if "duckdb" in save_to:
-        register_dataset_version(generator_type="advanced")
+        if truncate:
+            save_snapshot(config_hash)
+        register_dataset_version(
+            generator_type="advanced" if truncate else "advanced-append",
+            start_date=start_date,
+            end_date=end_date,
+            config_hash=config_hash if truncate else None,
+        )
 
     # 최종 프로그레스 100%
     if progress_callback is not None:
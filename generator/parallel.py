@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from typing import Collection, Deque, Iterable, List, Optional, Tuple
+
+from generator.config import START_DATE, END_DATE, PROMOTION_DAYS
+from generator.users import UserTable
+from generator.vectorized import (
+    DailyRow,
+    EventColumns,
+    ProgressCallback,
+    generate_day_range,
+    resolve_seed,
+)
+
+# 샤드 하나 ≈ 하루 2만 이벤트 × 10일 ≈ 기존 BATCH_THRESHOLD(20만)
+SHARD_DAYS = 10
+
+# 백엔드(uvicorn, 스레드 여러 개)에서 fork 하면 다른 스레드가 잡고 있던 락까지 복사되므로
+# 깨끗한 forkserver 프로세스에서 워커를 띄운다 (UserTable 은 initargs 로 피클해서 넘김)
+_MP_CONTEXT = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# 워커 프로세스 전역 상태 (initializer에서 한 번만 설정)
+_worker_users: Optional[UserTable] = None
+
+
+def _init_worker(users: UserTable) -> None:
+    global _worker_users
+    _worker_users = users
+
+
+def _run_shard(
+    seed: int,
+    first_day: int,
+    last_day: int,
+    start_date: date,
+    promotion_days: Tuple[date, ...],
+    compact: bool,
+) -> Tuple[EventColumns, List[DailyRow]]:
+    return generate_day_range(
+        _worker_users,
+        seed,
+        first_day,
+        last_day,
+        start_date=start_date,
+        promotion_days=promotion_days,
+        compact=compact,
+    )
+
+
+# ----------------------------------------
+# 병렬 Event 생성 (날짜 샤딩)
+# ----------------------------------------
+
+
+def generate_events_parallel(
+    users: UserTable,
+    progress_callback: Optional[ProgressCallback] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    shard_days: int = SHARD_DAYS,
+    start_date: date = START_DATE,
+    first_day: int = 0,
+    last_day: Optional[int] = None,
+    promotion_days: Collection[date] = PROMOTION_DAYS,
+    compact: bool = False,
+) -> Iterable[Tuple[EventColumns, List[DailyRow]]]:
+    """
+    start_date 기준 [first_day, last_day) 구간을 shard_days 단위로 잘라
+    ProcessPoolExecutor에서 생성하고 (events_columns, daily_batch)를
+    날짜 순서대로 yield 한다.
+
+    - 난수는 (seed, 날짜 인덱스)로 파생하므로 workers/shard_days와 무관하게
+      generate_events_vectorized(seed=seed)와 같은 결과가 나온다.
+    - 동시에 떠 있는 샤드는 workers * 2개로 제한해 메모리를 묶어 둔다.
+    """
+    if last_day is None:
+        last_day = (END_DATE - start_date).days
+    total_days = last_day - first_day
+    workers = workers or os.cpu_count() or 1
+    seed = resolve_seed(seed)
+
+    if len(users) == 0 or total_days <= 0:
+        return
+
+    promotion_days = tuple(promotion_days)
+    shards = iter(
+        (first, min(first + shard_days, last_day))
+        for first in range(first_day, last_day, shard_days)
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(_MP_CONTEXT),
+        initializer=_init_worker,
+        initargs=(users,),
+    ) as executor:
+        pending: Deque[Tuple[int, Future]] = deque()
+
+        def submit_next() -> None:
+            shard = next(shards, None)
+            if shard is not None:
+                future = executor.submit(
+                    _run_shard,
+                    seed,
+                    shard[0],
+                    shard[1],
+                    start_date,
+                    promotion_days,
+                    compact,
+                )
+                pending.append((shard[0], future))
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        # 완료 순서가 아니라 제출(=날짜) 순서대로 꺼낸다
+        while pending:
+            shard_first, future = pending.popleft()
+            cols, daily_batch = future.result()
+            submit_next()
+
+            if progress_callback is not None:
+                done_days = shard_first - first_day
+                progress_callback(int((done_days / total_days) * 100))
+
+            yield cols, daily_batch
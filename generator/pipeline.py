@@ -0,0 +1,102 @@
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+
+# sink 하나당 대기열에 쌓아 둘 수 있는 최대 배치 수
+# (메모리 상한 ≈ (SINK_QUEUE_BATCHES + 1) × sink 수 × 배치 크기, 배치는 sink 간 공유)
+SINK_QUEUE_BATCHES = 2
+
+# put()이 막혀 있는 동안 sink 에러를 확인하는 주기(초)
+_PUT_POLL_SECONDS = 0.5
+
+_DONE = object()
+
+# {테이블 이름: Arrow Table}
+Batch = Dict[str, pa.Table]
+
+
+class SinkWorker(threading.Thread):
+    """
+    sink 하나를 전담하는 소비자 스레드.
+    - 대기열이 가득 차면 생산자의 put()이 블록된다 (backpressure)
+    - 쓰기 중 예외가 나면 error 에 담고, 생산자가 막히지 않도록 나머지는 버린다
+    """
+
+    def __init__(self, name: str, sink, max_pending: int = SINK_QUEUE_BATCHES):
+        super().__init__(name=f"sink-{name}", daemon=True)
+        self.sink = sink
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.error: Optional[BaseException] = None
+        self.failed_upstream = False
+
+    def run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.sink.write(item)
+            except BaseException as e:
+                self.error = e
+
+        try:
+            if self.error is None and not self.failed_upstream:
+                self.sink.close()
+            else:
+                self.sink.abort()
+        except BaseException as e:
+            if self.error is None:
+                self.error = e
+
+    def put(self, item: Batch) -> None:
+        while True:
+            if self.error is not None:
+                raise self.error
+            try:
+                self.queue.put(item, timeout=_PUT_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self, ok: bool = True) -> None:
+        self.failed_upstream = not ok
+        self.queue.put(_DONE)
+        self.join()
+
+
+def fan_out(
+    batches: Iterable[Batch],
+    sinks: Sequence[Tuple[str, object]],
+    max_pending: int = SINK_QUEUE_BATCHES,
+) -> None:
+    """
+    {테이블 이름: Arrow Table} 배치를 모든 sink 에 동시에 흘려보낸다.
+    생성은 호출 스레드에서, 적재는 sink 별 스레드에서 진행되므로
+    전체 시간은 (생성 + 모든 sink 합)이 아니라 가장 느린 단계에 수렴한다.
+
+    sinks: [(이름, sink), ...]  sink 는 write(batch) / close() / abort()
+    하나라도 실패하면 생성을 멈추고 나머지 sink 는 abort() 한 뒤 예외를 올린다.
+    """
+    workers: List[SinkWorker] = [
+        SinkWorker(name, sink, max_pending=max_pending) for name, sink in sinks
+    ]
+    for worker in workers:
+        worker.start()
+
+    ok = False
+    try:
+        for item in batches:
+            for worker in workers:
+                worker.put(item)
+        ok = True
+    finally:
+        for worker in workers:
+            worker.finish(ok=ok)
+
+    for worker in workers:
+        if worker.error is not None:
+            raise worker.error
@@ -0,0 +1,356 @@
+import glob
+import io
+import os
+import tempfile
+from typing import Dict, List, Optional, Sequence, Union
+
+import duckdb
+import mysql.connector
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from generator.users import CHANNEL_DICTIONARY, DEVICE_DICTIONARY
+from generator.utils import batch
+from generator.vectorized import EVENT_COLUMNS, EVENT_NAMES, DailyRow, EventColumns
+
+# generate_events(rows) / generate_events_vectorized(columns) 둘 다 받는다
+EventBatch = Union[EventColumns, Sequence[tuple]]
+
+EVENTS_SCHEMA = pa.schema(
+    [
+        ("user_id", pa.int32()),
+        ("session_id", pa.string()),
+        ("event_name", pa.string()),
+        ("event_time", pa.timestamp("s")),
+        ("device", pa.string()),
+        ("channel", pa.string()),
+    ]
+)
+
+# compact 저장 스키마: 정수 session_id + 사전 인코딩(int8 코드) 문자열 컬럼
+EVENTS_COMPACT_SCHEMA = pa.schema(
+    [
+        ("user_id", pa.int32()),
+        ("session_id", pa.int64()),
+        ("event_name", pa.dictionary(pa.int8(), pa.string())),
+        ("event_time", pa.timestamp("s")),
+        ("device", pa.dictionary(pa.int8(), pa.string())),
+        ("channel", pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+# 사전 인코딩 컬럼의 고정 사전 (코드 = 인덱스, DB ENUM 라벨 순서와 동일)
+EVENT_NAME_DICTIONARY = pa.array(EVENT_NAMES)
+COMPACT_DICTIONARIES: Dict[str, pa.Array] = {
+    "event_name": EVENT_NAME_DICTIONARY,
+    "device": DEVICE_DICTIONARY,
+    "channel": CHANNEL_DICTIONARY,
+}
+
+DAILY_SCHEMA = pa.schema(
+    [
+        ("date", pa.date32()),
+        ("revenue", pa.float64()),
+        ("purchases", pa.int32()),
+    ]
+)
+
+# sink 가 적재하는 테이블 (users 차원 테이블 → 이벤트 → 일별 지표)
+LOAD_TABLES = ("users", "events", "daily_metrics")
+
+# 적재 중에는 지우고, 적재가 끝난 뒤 한 번에 다시 만드는 Postgres 인덱스
+PG_INDEXES: Dict[str, str] = {
+    "idx_users_user_id": "users (user_id)",
+    "idx_events_user_id": "events (user_id)",
+    "idx_events_event_time": "events (event_time)",
+    "idx_daily_metrics_date": "daily_metrics (date)",
+}
+
+# MySQL multi-row INSERT 한 문장에 담을 행 수 (max_allowed_packet 여유 고려)
+MYSQL_INSERT_ROWS = 5000
+
+
+# ----------------------------------------
+# Arrow 변환
+# ----------------------------------------
+
+
+def _to_arrow(values, field: pa.Field) -> pa.Array:
+    arr = pa.array(values)
+    if arr.type != field.type:
+        # python 엔진의 "YYYY-MM-DD HH:MM:SS" 문자열, int64 user_id 등
+        arr = arr.cast(field.type)
+    return arr
+
+
+def _to_dictionary(values, dictionary: pa.Array) -> pa.DictionaryArray:
+    """
+    int8 코드 배열(numpy 엔진) 또는 문자열(python 엔진)을 고정 사전의
+    사전 인코딩 배열로 변환. 문자열은 사전에서 인덱스를 찾는다.
+    """
+    arr = pa.array(values)
+    if not pa.types.is_integer(arr.type):
+        arr = pc.index_in(arr, value_set=dictionary)
+    return pa.DictionaryArray.from_arrays(arr.cast(pa.int8()), dictionary)
+
+
+def events_to_arrow(batch: EventBatch, compact: bool = False) -> pa.Table:
+    """
+    이벤트 배치(numpy 컬럼 dict 또는 EventRow 튜플 리스트)를 Arrow Table로 변환.
+    numpy 숫자/timestamp 컬럼은 복사 없이 Arrow 버퍼로 넘어간다.
+    compact=True 면 EVENTS_COMPACT_SCHEMA (정수 session_id, 사전 인코딩 컬럼).
+    """
+    schema = EVENTS_COMPACT_SCHEMA if compact else EVENTS_SCHEMA
+    if isinstance(batch, dict):
+        columns = [batch[c] for c in EVENT_COLUMNS]
+    elif batch:
+        columns = [list(c) for c in zip(*batch)]
+    else:
+        return schema.empty_table()
+
+    arrays = [
+        _to_dictionary(col, COMPACT_DICTIONARIES[field.name])
+        if pa.types.is_dictionary(field.type)
+        else _to_arrow(col, field)
+        for col, field in zip(columns, schema)
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def daily_to_arrow(rows: Sequence[DailyRow]) -> pa.Table:
+    if not rows:
+        return DAILY_SCHEMA.empty_table()
+    columns = [list(c) for c in zip(*rows)]
+    arrays = [_to_arrow(col, field) for col, field in zip(columns, DAILY_SCHEMA)]
+    return pa.Table.from_arrays(arrays, schema=DAILY_SCHEMA)
+
+
+def arrow_to_csv(table: pa.Table) -> io.BytesIO:
+    """
+    Arrow Table → 헤더 없는 CSV 버퍼 (COPY / LOAD DATA 입력용).
+    NULL 은 따옴표 없는 빈 값으로 기록된다.
+    """
+    buf = io.BytesIO()
+    pa_csv.write_csv(table, buf, pa_csv.WriteOptions(include_header=False))
+    buf.seek(0)
+    return buf
+
+
+def arrow_to_rows(table: pa.Table) -> List[tuple]:
+    """
+    Arrow Table → 파이썬 튜플 리스트 (executemany 기반 sink 용).
+    """
+    return list(zip(*(col.to_pylist() for col in table.columns)))
+
+
+# ----------------------------------------
+# Sinks
+# ----------------------------------------
+
+
+class DuckDBSink:
+    """
+    Arrow Table을 DuckDB에 등록한 뒤 INSERT ... SELECT 로 한 번에 적재.
+    executemany(행 단위 바인딩) 대신 DuckDB의 벡터화 스캔을 탄다.
+    """
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        self.conn = conn
+
+    def _insert(self, table_name: str, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        view = f"_{table_name}_batch"
+        self.conn.register(view, table)
+        try:
+            self.conn.execute(f"INSERT INTO {table_name} SELECT * FROM {view}")
+        finally:
+            self.conn.unregister(view)
+
+    def write(self, batch: Dict[str, pa.Table]) -> None:
+        for table_name, table in batch.items():
+            self._insert(table_name, table)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def abort(self) -> None:
+        self.conn.close()
+
+
+class PostgresSink:
+    """
+    배치를 메모리 CSV 버퍼로 만들어 COPY ... FROM STDIN 으로 스트리밍.
+    - rebuild_indexes: 생성 시 PG_INDEXES 를 지우고 close() 에서 다시 만든다
+      (전체 재생성용. append 처럼 적재량이 작으면 유지한 채 넣는다)
+    - 전체 적재가 한 트랜잭션이라 중간에 실패하면 이전 데이터가 그대로 남는다
+      대신 init_postgres 의 DROP TABLE / DROP INDEX 부터 close() 의 commit 까지
+      ACCESS EXCLUSIVE 락이 유지되어 그동안 조회는 막힌다
+      (백엔드 조회는 SQL_PG_LOCK_TIMEOUT_SECONDS 에서 lock timeout 오류로 끝난다)
+    """
+
+    def __init__(self, conn, rebuild_indexes: bool = True):
+        self.conn = conn
+        self.cur = conn.cursor()
+        if rebuild_indexes:
+            for name in PG_INDEXES:
+                self.cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def _copy(self, table_name: str, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        self.cur.copy_expert(
+            f"COPY {table_name} FROM STDIN WITH (FORMAT csv)",
+            arrow_to_csv(table),
+            size=1 << 20,
+        )
+
+    def write(self, batch: Dict[str, pa.Table]) -> None:
+        for table_name, table in batch.items():
+            self._copy(table_name, table)
+
+    def close(self) -> None:
+        try:
+            for name, target in PG_INDEXES.items():
+                self.cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+            for table_name in LOAD_TABLES:
+                self.cur.execute(f"ANALYZE {table_name}")
+            self.conn.commit()
+        finally:
+            self.cur.close()
+            self.conn.close()
+
+    def abort(self) -> None:
+        try:
+            self.conn.rollback()
+        finally:
+            self.cur.close()
+            self.conn.close()
+
+
+class MySQLSink:
+    """
+    배치를 임시 CSV 파일로 떨군 뒤 LOAD DATA LOCAL INFILE 로 적재.
+    - 서버/클라이언트에서 local_infile 이 막혀 있으면 multi-row INSERT 로 전환
+    - 배치마다 커밋해서 undo log 가 한 트랜잭션에 쌓이지 않게 한다
+    - 적재 중에는 unique/foreign key 체크 off
+      (DISABLE KEYS 는 MyISAM 전용이라 InnoDB 에서는 아무 효과가 없다.
+       보조 인덱스가 생기면 Postgres 처럼 지우고 다시 만들어야 한다)
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.use_load_data = True
+        self.cur.execute("SET unique_checks = 0")
+        self.cur.execute("SET foreign_key_checks = 0")
+
+    def _load_data(self, table_name: str, table: pa.Table) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
+            f.write(arrow_to_csv(table).getbuffer())
+            path = f.name
+        try:
+            self.cur.execute(
+                f"""
+                LOAD DATA LOCAL INFILE %s INTO TABLE {table_name}
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                """,
+                (path,),
+            )
+        finally:
+            os.remove(path)
+
+    def _insert_multirow(self, table_name: str, table: pa.Table) -> None:
+        row = "(" + ", ".join(["%s"] * table.num_columns) + ")"
+        for chunk in batch(arrow_to_rows(table), n=MYSQL_INSERT_ROWS):
+            self.cur.execute(
+                f"INSERT INTO {table_name} VALUES " + ", ".join([row] * len(chunk)),
+                [v for r in chunk for v in r],
+            )
+
+    def _load(self, table_name: str, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        if self.use_load_data:
+            try:
+                self._load_data(table_name, table)
+                return
+            except mysql.connector.Error as e:
+                print(f"⚠️ LOAD DATA LOCAL INFILE 실패, multi-row INSERT로 전환: {e}")
+                self.use_load_data = False
+        self._insert_multirow(table_name, table)
+
+    def write(self, batch: Dict[str, pa.Table]) -> None:
+        for table_name, table in batch.items():
+            self._load(table_name, table)
+        self.conn.commit()
+
+    def close(self) -> None:
+        try:
+            self.cur.execute("SET unique_checks = 1")
+            self.cur.execute("SET foreign_key_checks = 1")
+            self.conn.commit()
+        finally:
+            self.cur.close()
+            self.conn.close()
+
+    def abort(self) -> None:
+        # 이미 커밋된 배치는 남는다 (배치 단위 커밋)
+        try:
+            self.conn.rollback()
+        finally:
+            self.cur.close()
+            self.conn.close()
+
+
+class ParquetSink:
+    """
+    배치의 각 테이블을 out_dir/<테이블>.parquet 파일로 바로 기록.
+    (DuckDB 를 거치지 않고 외부 도구에서 바로 읽을 수 있는 산출물)
+
+    part 가 주어지면 <테이블>-<part>.parquet 로 기록 (append 모드).
+    전체 재생성(part=None) 시에는 이전 part 파일을 지운다.
+    읽을 때는 '<테이블>*.parquet' 글롭으로 전부 읽으면 된다.
+    """
+
+    def __init__(
+        self, out_dir: str, part: Optional[str] = None, compression: str = "zstd"
+    ):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.part = part
+        self.compression = compression
+        self.writers: Dict[str, pq.ParquetWriter] = {}
+
+        if part is None:
+            for table_name in LOAD_TABLES:
+                for path in glob.glob(os.path.join(out_dir, f"{table_name}-*.parquet")):
+                    os.remove(path)
+
+    def _path(self, table_name: str) -> str:
+        suffix = "" if self.part is None else f"-{self.part}"
+        return os.path.join(self.out_dir, f"{table_name}{suffix}.parquet")
+
+    def write(self, batch: Dict[str, pa.Table]) -> None:
+        for table_name, table in batch.items():
+            if table.num_rows == 0:
+                continue
+            writer = self.writers.get(table_name)
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    self._path(table_name),
+                    table.schema,
+                    compression=self.compression,
+                )
+                self.writers[table_name] = writer
+            writer.write_table(table)
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+    def abort(self) -> None:
+        self.close()
@@ -0,0 +1,87 @@
+import os
+import shutil
+from typing import Dict, Iterator, Optional
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from generator.config import DUCKDB_PATH, SNAPSHOT_DIR
+from generator.sinks import LOAD_TABLES
+
+# 스냅샷을 sink 로 다시 흘려보낼 때의 배치 크기 (생성 배치와 동일한 수준)
+SNAPSHOT_BATCH_ROWS = 200_000
+
+
+# ----------------------------------------
+# config hash 별 데이터셋 스냅샷 (Parquet)
+# ----------------------------------------
+
+
+def snapshot_path(config_hash: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, config_hash)
+
+
+def find_snapshot(config_hash: str) -> Optional[str]:
+    """
+    dataset_versions 에 같은 config_hash 로 기록된 버전이 있고
+    스냅샷 파일이 모두 남아 있으면 그 디렉토리를 반환.
+    """
+    path = snapshot_path(config_hash)
+    if not all(
+        os.path.exists(os.path.join(path, f"{t}.parquet")) for t in LOAD_TABLES
+    ):
+        return None
+    if not os.path.exists(DUCKDB_PATH):
+        return None
+
+    con = duckdb.connect(DUCKDB_PATH)
+    try:
+        row = con.execute(
+            "SELECT 1 FROM dataset_versions WHERE config_hash = ? LIMIT 1",
+            [config_hash],
+        ).fetchone()
+    except (duckdb.CatalogException, duckdb.BinderException):
+        # dataset_versions 가 없거나 config_hash 컬럼 이전의 DB
+        return None
+    finally:
+        con.close()
+
+    return path if row is not None else None
+
+
+def save_snapshot(config_hash: str) -> str:
+    """
+    현재 DuckDB 의 users/events/daily_metrics 를 스냅샷 디렉토리에 Parquet 로 저장.
+    임시 디렉토리에 다 쓴 뒤 rename 하므로 중간 상태의 스냅샷은 보이지 않는다.
+    """
+    path = snapshot_path(config_hash)
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    con = duckdb.connect(DUCKDB_PATH)
+    try:
+        for table_name in LOAD_TABLES:
+            out = os.path.join(tmp_path, f"{table_name}.parquet")
+            con.execute(
+                f"COPY {table_name} TO '{out}' (FORMAT parquet, COMPRESSION zstd)"
+            )
+    finally:
+        con.close()
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def iter_snapshot_batches(
+    path: str, batch_rows: int = SNAPSHOT_BATCH_ROWS
+) -> Iterator[Dict[str, pa.Table]]:
+    """
+    스냅샷을 {테이블: Arrow Table} 배치로 읽어 fan_out 에 그대로 넘길 수 있게 한다.
+    """
+    for table_name in LOAD_TABLES:
+        parquet_file = pq.ParquetFile(os.path.join(path, f"{table_name}.parquet"))
+        for record_batch in parquet_file.iter_batches(batch_size=batch_rows):
+            yield {table_name: pa.Table.from_batches([record_batch])}
@@ -0,0 +1,163 @@
+from datetime import date
+from typing import Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from generator.config import DEVICES, CHANNELS
+
+USERS_SCHEMA = pa.schema(
+    [
+        ("user_id", pa.int32()),
+        ("signup_date", pa.date32()),
+        ("device", pa.string()),
+        ("channel", pa.string()),
+    ]
+)
+
+# compact 저장 스키마: device/channel 을 int8 코드 + 사전(DEVICES/CHANNELS)으로
+USERS_COMPACT_SCHEMA = pa.schema(
+    [
+        ("user_id", pa.int32()),
+        ("signup_date", pa.date32()),
+        ("device", pa.dictionary(pa.int8(), pa.string())),
+        ("channel", pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+# users 테이블을 sink로 보낼 때의 청크 크기
+USERS_CHUNK = 500_000
+
+DEVICE_NAMES = np.array(DEVICES)
+CHANNEL_NAMES = np.array(CHANNELS)
+DEVICE_DICTIONARY = pa.array(DEVICES)
+CHANNEL_DICTIONARY = pa.array(CHANNELS)
+
+
+class UserTable:
+    """
+    유저 차원 테이블 (struct-of-arrays).
+    유저 한 명당 dict 대신 컬럼 배열 4개만 들고 있어서
+    500만 명 기준 약 70MB 수준이다.
+
+    user_id 는 first_user_id 부터 연속이므로 user_id → 행 인덱스는
+    user_id - first_user_id 한 번으로 끝난다.
+    """
+
+    def __init__(
+        self,
+        signup_date: np.ndarray,
+        device_code: np.ndarray,
+        channel_code: np.ndarray,
+        first_user_id: int = 1,
+    ):
+        n = len(signup_date)
+        self.first_user_id = first_user_id
+        self.user_id = np.arange(first_user_id, first_user_id + n, dtype=np.int32)
+        self.signup_date = signup_date.astype("datetime64[D]", copy=False)
+        self.device_code = device_code.astype(np.int8, copy=False)
+        self.channel_code = channel_code.astype(np.int8, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.user_id)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> "UserTable":
+        """
+        users 테이블(USERS_SCHEMA, user_id 오름차순)에서 UserTable 복원.
+        """
+        first_user_id = table["user_id"][0].as_py() if table.num_rows else 1
+        device_code = pc.index_in(table["device"], value_set=pa.array(DEVICES))
+        channel_code = pc.index_in(table["channel"], value_set=pa.array(CHANNELS))
+        return cls(
+            signup_date=table["signup_date"].to_numpy().astype("datetime64[D]"),
+            device_code=device_code.fill_null(0).to_numpy(),
+            channel_code=channel_code.fill_null(0).to_numpy(),
+            first_user_id=first_user_id,
+        )
+
+    def extend(self, other: "UserTable") -> "UserTable":
+        """
+        self 뒤에 other(user_id 가 이어지는 신규 유저)를 붙인 새 UserTable.
+        """
+        return UserTable(
+            signup_date=np.concatenate([self.signup_date, other.signup_date]),
+            device_code=np.concatenate([self.device_code, other.device_code]),
+            channel_code=np.concatenate([self.channel_code, other.channel_code]),
+            first_user_id=self.first_user_id,
+        )
+
+    def index_of(self, user_id: int) -> int:
+        return user_id - self.first_user_id
+
+    def device_of(self, user_id: int) -> str:
+        return DEVICES[self.device_code[self.index_of(user_id)]]
+
+    def channel_of(self, user_id: int) -> str:
+        return CHANNELS[self.channel_code[self.index_of(user_id)]]
+
+    def signup_date_of(self, user_id: int) -> date:
+        return self.signup_date[self.index_of(user_id)].item()
+
+    def iter_arrow(
+        self, chunk_size: int = USERS_CHUNK, compact: bool = False
+    ) -> Iterator[pa.Table]:
+        """
+        users 테이블을 chunk_size 행씩 Arrow Table로 내보낸다.
+        (문자열 컬럼은 청크 단위로만 만들어 메모리 피크를 묶어 둔다)
+        compact=True 면 문자열 대신 코드 배열을 그대로 사전 인코딩 컬럼으로 쓴다.
+        """
+        for lo in range(0, len(self), chunk_size):
+            hi = min(lo + chunk_size, len(self))
+            if compact:
+                yield pa.Table.from_arrays(
+                    [
+                        pa.array(self.user_id[lo:hi]),
+                        pa.array(self.signup_date[lo:hi]),
+                        pa.DictionaryArray.from_arrays(
+                            self.device_code[lo:hi], DEVICE_DICTIONARY
+                        ),
+                        pa.DictionaryArray.from_arrays(
+                            self.channel_code[lo:hi], CHANNEL_DICTIONARY
+                        ),
+                    ],
+                    schema=USERS_COMPACT_SCHEMA,
+                )
+                continue
+            yield pa.Table.from_arrays(
+                [
+                    pa.array(self.user_id[lo:hi]),
+                    pa.array(self.signup_date[lo:hi]),
+                    pa.array(DEVICE_NAMES[self.device_code[lo:hi]]),
+                    pa.array(CHANNEL_NAMES[self.channel_code[lo:hi]]),
+                ],
+                schema=USERS_SCHEMA,
+            )
+
+
+def generate_user_table(
+    rng: np.random.Generator,
+    start_date: date,
+    total_days: int,
+    new_users_daily: tuple,
+    max_users: int,
+    first_user_id: int = 1,
+) -> UserTable:
+    """
+    일자별 신규 가입자 수를 한 번에 뽑아 UserTable 생성.
+    전체 유저 수는 max_users 에서 자른다.
+    """
+    lo, hi = new_users_daily
+    counts = rng.integers(lo, hi + 1, size=total_days)
+    days = np.datetime64(start_date, "D") + np.arange(total_days)
+    signup_date = np.repeat(days, counts)[:max_users]
+
+    n = len(signup_date)
+    return UserTable(
+        signup_date=signup_date,
+        device_code=rng.integers(0, len(DEVICES), size=n, dtype=np.int8),
+        channel_code=rng.integers(0, len(CHANNELS), size=n, dtype=np.int8),
+        first_user_id=first_user_id,
+    )
+
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime, time
 import random
 import uuid
 
 def generate_session_id():
-    return str(uuid.uuid4())
+    """UUID v4 형식이지만 시드를 준 random 에서 뽑는다 (같은 seed → 같은 session_id)"""
+    return str(uuid.UUID(int=random.getrandbits(128), version=4))
 
 def generate_ts(day, hour=None):
     if hour is None:
@@ -12,6 +13,18 @@ def generate_ts(day, hour=None):
     second = random.randint(0, 59)
     return f"{day} {hour:02}:{minute:02}:{second:02}"
 
+def generate_dt(day: date, hour=None):
+    """generate_ts 와 같은 난수 순서로 datetime 을 바로 만든다 (문자열 포맷 없음)"""
+    if hour is None:
+        hour = random.randint(0, 23)
+    minute = random.randint(0, 59)
+    second = random.randint(0, 59)
+    return datetime.combine(day, time(hour, minute, second))
+
+def session_base(day: date, sessions_per_day: int):
+    """compact 스키마의 하루 첫 session_id (YYYYMMDD × sessions_per_day)"""
+    return (day.year * 10000 + day.month * 100 + day.day) * sessions_per_day
+
 def batch(iterable, n=5000):
     """yield fixed-size chunks"""
     l = len(iterable)
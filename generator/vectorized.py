@@ -0,0 +1,252 @@
+from datetime import date, timedelta
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from generator.config import (
+    START_DATE,
+    END_DATE,
+    PROB_VIEW,
+    PROB_CART,
+    PROB_CHECKOUT,
+    PROB_PURCHASE,
+    PROMOTION_DAYS,
+    PROMOTION_BOOST,
+    SESSIONS_PER_DAY,
+)
+from generator.users import CHANNEL_NAMES, DEVICE_NAMES, UserTable
+from generator.utils import session_base
+
+# 타입 alias
+EventColumns = Dict[str, np.ndarray]
+DailyRow = Tuple[str, float, int]
+ProgressCallback = Callable[[int], None]
+
+EVENT_COLUMNS = ("user_id", "session_id", "event_name", "event_time", "device", "channel")
+
+# 퍼널 단계 순서 = 이벤트 코드
+EVENT_NAMES = np.array(["visit", "view_product", "add_to_cart", "checkout", "purchase"])
+
+BATCH_THRESHOLD = 200_000
+SECONDS_PER_DAY = 86_400
+
+# uuid4 문자열(8-4-4-4-12)에서 hex 문자가 들어가는 위치
+_UUID_HEX_POS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+_HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+# ----------------------------------------
+# 내부 유틸
+# ----------------------------------------
+
+
+def _uuid4_array(rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    uuid4 문자열 n개를 한 번에 생성 (uuid.uuid4()를 n번 호출하지 않음).
+    """
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+
+    out = np.full((n, 36), ord("-"), dtype=np.uint8)
+    out[:, _UUID_HEX_POS[0::2]] = _HEX_CHARS[raw >> 4]
+    out[:, _UUID_HEX_POS[1::2]] = _HEX_CHARS[raw & 0x0F]
+    return out.view("S36").ravel().astype(str)
+
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """
+    seed가 없으면 OS 엔트로피로 하나 뽑는다 (이후 모든 파생 시드의 뿌리).
+    """
+    if seed is None:
+        return int(np.random.SeedSequence().entropy)
+    return int(seed)
+
+
+def day_rng(seed: int, day_index: int) -> np.random.Generator:
+    """
+    (seed, 날짜 인덱스)에서 파생한 날짜별 난수 생성기.
+    날짜마다 독립 스트림이므로 샤드 크기·워커 수와 무관하게 같은 결과가 나온다.
+    """
+    return np.random.default_rng([seed, day_index])
+
+
+def users_rng(seed: int, first_day: int = 0) -> np.random.Generator:
+    """
+    유저 테이블 생성용 난수 생성기 (날짜 스트림과 겹치지 않는 별도 스트림).
+    first_day > 0 (append 로 first_day 부터 추가하는 가입자) 이면 시작 날짜마다 다른 스트림
+    → 추가한 유저가 처음 만든 유저들의 속성 순서를 되풀이하지 않는다
+    """
+    spawn_key = (1,) if first_day == 0 else (1, first_day)
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+
+
+def _concat_columns(parts: List[EventColumns]) -> EventColumns:
+    return {c: np.concatenate([p[c] for p in parts]) for c in EVENT_COLUMNS}
+
+
+# ----------------------------------------
+# 하루치 이벤트 생성
+# ----------------------------------------
+
+
+def generate_day(
+    rng: np.random.Generator,
+    day: date,
+    user_ids: np.ndarray,
+    device_codes: np.ndarray,
+    channel_codes: np.ndarray,
+    boost: float = 1.0,
+    compact: bool = False,
+) -> Tuple[EventColumns, DailyRow]:
+    """
+    하루치 이벤트를 numpy 배열로 한 번에 생성.
+    - 활성 유저 k명을 비복원 추출
+    - (k, 5) 난수 행렬로 퍼널 단계별 Bernoulli 마스크 생성 (visit은 항상 True)
+    - 마스크를 행 우선으로 펼쳐 세션별 visit → purchase 순서를 유지
+    - boost: 프로모션 일자의 구매 확률 배수
+    - compact: session_id 는 int64 일련번호, event_name/device/channel 은
+      int8 코드(EVENT_NAMES/DEVICES/CHANNELS 인덱스)로 둔다.
+      uuid 는 마지막에 뽑으므로 나머지 값은 text 스키마와 같다.
+    """
+    k = min(len(user_ids), int(rng.integers(3000, 12001)))
+    active = rng.choice(len(user_ids), size=k, replace=False)
+
+    probs = np.array([1.0, PROB_VIEW, PROB_CART, PROB_CHECKOUT, PROB_PURCHASE * boost])
+    mask = rng.random((k, len(probs))) < probs
+    mask[:, 0] = True
+
+    sess_idx, stage = np.nonzero(mask)
+    n_events = len(sess_idx)
+    user_idx = active[sess_idx]
+
+    day_start = np.datetime64(day, "s")
+    offsets = rng.integers(0, SECONDS_PER_DAY, size=n_events).astype("timedelta64[s]")
+
+    n_purchase = int(mask[:, 4].sum())
+    revenue = float(rng.integers(5, 201, size=n_purchase).sum())
+
+    if compact:
+        cols: EventColumns = {
+            "user_id": user_ids[user_idx],
+            "session_id": session_base(day, SESSIONS_PER_DAY) + sess_idx.astype(np.int64),
+            "event_name": stage.astype(np.int8),
+            "event_time": day_start + offsets,
+            "device": device_codes[user_idx],
+            "channel": channel_codes[user_idx],
+        }
+    else:
+        session_ids = _uuid4_array(rng, k)
+        cols = {
+            "user_id": user_ids[user_idx],
+            "session_id": session_ids[sess_idx],
+            "event_name": EVENT_NAMES[stage],
+            "event_time": day_start + offsets,
+            "device": DEVICE_NAMES[device_codes[user_idx]],
+            "channel": CHANNEL_NAMES[channel_codes[user_idx]],
+        }
+    return cols, (str(day), revenue, n_purchase)
+
+
+def generate_day_range(
+    users: UserTable,
+    seed: int,
+    first_day: int,
+    last_day: int,
+    start_date: date = START_DATE,
+    promotion_days: Collection[date] = PROMOTION_DAYS,
+    compact: bool = False,
+) -> Tuple[EventColumns, List[DailyRow]]:
+    """
+    [first_day, last_day) 구간(start_date 기준 인덱스)을 한 덩어리로 생성.
+    병렬 모드의 샤드 단위. 설정값은 인자로 받으므로 워커 프로세스의
+    모듈 상태와 무관하다.
+    """
+    parts: List[EventColumns] = []
+    daily_batch: List[DailyRow] = []
+
+    for d in range(first_day, last_day):
+        day = start_date + timedelta(days=d)
+        boost = PROMOTION_BOOST if day in promotion_days else 1.0
+        cols, daily = generate_day(
+            day_rng(seed, d),
+            day,
+            users.user_id,
+            users.device_code,
+            users.channel_code,
+            boost=boost,
+            compact=compact,
+        )
+        parts.append(cols)
+        daily_batch.append(daily)
+
+    return _concat_columns(parts), daily_batch
+
+
+# ----------------------------------------
+# Event 생성 (columnar streaming)
+# ----------------------------------------
+
+
+def generate_events_vectorized(
+    users: UserTable,
+    progress_callback: Optional[ProgressCallback] = None,
+    seed: Optional[int] = None,
+    start_date: date = START_DATE,
+    first_day: int = 0,
+    last_day: Optional[int] = None,
+    promotion_days: Collection[date] = PROMOTION_DAYS,
+    compact: bool = False,
+) -> Iterable[Tuple[EventColumns, List[DailyRow]]]:
+    """
+    generate_events 의 numpy 버전.
+    (events_columns, daily_batch)를 yield 한다.
+    events_columns: {"user_id": ndarray, "session_id": ndarray, ...} (EVENT_COLUMNS 순서)
+    daily_batch:    [(date, revenue, purchases), ...]
+
+    start_date 기준 [first_day, last_day) 구간만 생성 (기본: START_DATE ~ END_DATE).
+    seed가 같으면 병렬 모드(generate_events_parallel)와 동일한 데이터를 만든다.
+    compact=True 면 문자열 대신 코드 배열을 내보낸다 (generate_day 참고).
+    """
+    if last_day is None:
+        last_day = (END_DATE - start_date).days
+    total_days = last_day - first_day
+    seed = resolve_seed(seed)
+
+    if len(users) == 0:
+        return
+
+    parts: List[EventColumns] = []
+    daily_batch: List[DailyRow] = []
+    buffered = 0
+
+    for d in range(first_day, last_day):
+        day = start_date + timedelta(days=d)
+
+        if total_days > 0 and progress_callback is not None:
+            progress_callback(int(((d - first_day) / total_days) * 100))
+
+        boost = PROMOTION_BOOST if day in promotion_days else 1.0
+        cols, daily = generate_day(
+            day_rng(seed, d),
+            day,
+            users.user_id,
+            users.device_code,
+            users.channel_code,
+            boost=boost,
+            compact=compact,
+        )
+        parts.append(cols)
+        daily_batch.append(daily)
+        buffered += len(cols["user_id"])
+
+        # 배치 기준량을 넘으면 여러 날짜를 합쳐서 yield
+        if buffered >= BATCH_THRESHOLD:
+            yield _concat_columns(parts), daily_batch
+            parts = []
+            daily_batch = []
+            buffered = 0
+
+    # 마지막 남은 배치
+    if parts:
+        yield _concat_columns(parts), daily_batch
@@ -0,0 +1,16 @@
+# 저장소 루트에서: python -m pytest tests
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# generator 는 저장소 루트 기준, backend 는 backend 디렉터리 기준으로 import 한다
+for path in (ROOT, os.path.join(ROOT, "backend")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# settings 를 처음 import 하기 전에 테스트용 임시 경로로 돌려 둔다
+_TMP_DIR = tempfile.mkdtemp(prefix="pa_training_tests_")
+os.environ.setdefault("DUCKDB_PATH", os.path.join(_TMP_DIR, "event_log.duckdb"))
+os.environ.setdefault("SQL_RESULT_DIR", os.path.join(_TMP_DIR, "sql_results"))
@@ -0,0 +1,86 @@
+import duckdb
+import pyarrow as pa
+import pytest
+
+from utils.compare import compare_arrow
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    yield con
+    con.close()
+
+
+def _table(con, sql: str) -> pa.Table:
+    return con.execute(sql).fetch_record_batch().read_all()
+
+
+def test_duplicate_column_names(con):
+    expected = _table(con, "SELECT 1 AS x, 2 AS x, 3 AS y")
+    same = _table(con, "SELECT 1 AS x, 2 AS x, 3 AS y")
+    result = compare_arrow(con, expected, same)
+    assert result["correct"]
+    assert result["column_match"] == "position"
+
+    wrong = _table(con, "SELECT 1 AS x, 9 AS x, 3 AS y")
+    result = compare_arrow(con, expected, wrong)
+    assert not result["correct"]
+    assert result["missing_count"] == 1 and result["extra_count"] == 1
+    # 샘플 행의 키는 정답 컬럼 이름 (겹치면 _2)
+    assert result["missing_rows"] == [{"x": 1, "x_2": 2, "y": 3}]
+    assert result["extra_rows"] == [{"x": 1, "x_2": 9, "y": 3}]
+
+
+def test_column_order_and_case_are_ignored(con):
+    expected = _table(con, "SELECT * FROM (VALUES (1, 'a'), (2, 'b')) t(id, name)")
+    actual = _table(con, 'SELECT * FROM (VALUES (\'b\', 2), (\'a\', 1)) t("NAME", "Id")')
+    result = compare_arrow(con, expected, actual)
+    assert result["correct"]
+    assert result["column_match"] == "name"
+    assert result["order_matches"] is False
+
+
+def test_check_order(con):
+    expected = _table(con, "SELECT * FROM range(3) t(i)")
+    reversed_ = _table(con, "SELECT * FROM range(3) t(i) ORDER BY i DESC")
+    assert compare_arrow(con, expected, reversed_)["correct"]
+    assert not compare_arrow(con, expected, reversed_, check_order=True)["correct"]
+    assert compare_arrow(con, expected, expected, check_order=True)["correct"]
+
+
+def test_aliases_fall_back_to_position(con):
+    expected = _table(con, "SELECT 1 AS total, 2 AS cnt")
+    actual = _table(con, "SELECT 1 AS s, 2 AS c")
+    result = compare_arrow(con, expected, actual)
+    assert result["correct"]
+    assert result["column_match"] == "position"
+
+
+def test_float_tolerance(con):
+    expected = _table(con, "SELECT 0.1 + 0.2 AS v, 10 AS n")
+    actual = _table(con, "SELECT 0.3::DOUBLE AS v, 10.0 AS n")
+    assert compare_arrow(con, expected, actual)["correct"]
+
+    close = _table(con, "SELECT 0.3001::DOUBLE AS v, 10 AS n")
+    assert not compare_arrow(con, expected, close)["correct"]
+    assert compare_arrow(con, expected, close, float_tolerance=1e-3)["correct"]
+
+
+def test_multiset_counts_duplicates(con):
+    expected = _table(con, "SELECT * FROM (VALUES (1), (1), (2)) t(v)")
+    actual = _table(con, "SELECT * FROM (VALUES (1), (2), (2)) t(v)")
+    result = compare_arrow(con, expected, actual)
+    assert not result["correct"]
+    assert result["missing_count"] == 1 and result["extra_count"] == 1
+    assert result["missing_rows"] == [{"v": 1}]
+    assert result["extra_rows"] == [{"v": 2}]
+
+
+def test_column_count_mismatch(con):
+    expected = _table(con, "SELECT 1 AS a, 2 AS b")
+    actual = _table(con, "SELECT 1 AS a")
+    result = compare_arrow(con, expected, actual)
+    assert not result["correct"]
+    assert result["column_match"] == "mismatch"
+    assert "column count differs" in result["error"]
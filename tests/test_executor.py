@@ -0,0 +1,44 @@
+import threading
+import time
+
+import pytest
+
+from db.executor import QueryCancelled, QueryJob
+
+
+def test_cancel_after_bound_exits_is_a_no_op():
+    calls = []
+    job = QueryJob(timeout=1)
+    with job.bound(lambda: calls.append("cancel")):
+        pass
+    job.cancel()
+    assert calls == []
+    assert job.cancelled
+
+
+def test_cancel_before_start_raises():
+    job = QueryJob(timeout=1)
+    job.cancel()
+    with pytest.raises(QueryCancelled):
+        with job.bound(lambda: None):
+            pass
+
+
+def test_bound_exit_waits_for_running_cancel():
+    # 취소가 실행 중이면 bound() 를 벗어나지(= connection 을 반납하지) 못한다
+    events = []
+    started = threading.Event()
+
+    def slow_cancel():
+        started.set()
+        time.sleep(0.2)
+        events.append("cancel done")
+
+    job = QueryJob(timeout=1)
+    with job.bound(slow_cancel):
+        canceller = threading.Thread(target=job.cancel)
+        canceller.start()
+        assert started.wait(1)
+    events.append("released")
+    canceller.join()
+    assert events == ["cancel done", "released"]
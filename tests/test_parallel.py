@@ -0,0 +1,48 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from generator.parallel import generate_events_parallel
+from generator.users import generate_user_table
+from generator.vectorized import EVENT_COLUMNS, generate_events_vectorized
+
+START = date(2024, 1, 1)
+DAYS = 23
+
+
+@pytest.fixture(scope="module")
+def users():
+    return generate_user_table(np.random.default_rng(1), START, DAYS, (50, 100), 2_000)
+
+
+def _collect(batches):
+    columns, daily = [], []
+    for cols, daily_batch in batches:
+        columns.append(cols)
+        daily.extend(daily_batch)
+    return {c: np.concatenate([b[c] for b in columns]) for c in EVENT_COLUMNS}, daily
+
+
+@pytest.mark.parametrize("workers, shard_days", [(2, 5), (3, 10)])
+def test_parallel_matches_vectorized(users, workers, shard_days):
+    options = dict(seed=7, start_date=START, last_day=DAYS, promotion_days=(date(2024, 1, 5),))
+    expected, expected_daily = _collect(generate_events_vectorized(users, **options))
+    actual, actual_daily = _collect(
+        generate_events_parallel(users, workers=workers, shard_days=shard_days, **options)
+    )
+    assert len(expected["user_id"]) > 0
+    for c in EVENT_COLUMNS:
+        assert np.array_equal(actual[c], expected[c]), c
+    assert actual_daily == expected_daily
+
+
+def test_parallel_day_range(users):
+    # [first_day, last_day) 만 생성해도 같은 날짜는 전체 생성과 같은 결과
+    options = dict(seed=3, start_date=START)
+    part, _ = _collect(
+        generate_events_parallel(users, workers=2, shard_days=4, first_day=10, last_day=DAYS, **options)
+    )
+    full, _ = _collect(generate_events_vectorized(users, first_day=10, last_day=DAYS, **options))
+    for c in EVENT_COLUMNS:
+        assert np.array_equal(part[c], full[c]), c
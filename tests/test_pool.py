@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(**options):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    options.setdefault("health_check", lambda conn: conn.healthy)
+    return ConnectionPool(connect, **options), opened
+
+
+def test_reuses_released_connection():
+    pool, opened = _pool(max_size=2)
+    with pool.connection() as a:
+        pass
+    with pool.connection() as b:
+        pass
+    assert a is b and len(opened) == 1
+
+
+def test_acquire_times_out_when_exhausted():
+    pool, _ = _pool(max_size=1, acquire_timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_waiter_gets_released_connection():
+    pool, opened = _pool(max_size=1, acquire_timeout=2)
+    conn = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(conn)
+    waiter.join(2)
+    assert got == [conn] and len(opened) == 1
+
+
+def test_unhealthy_and_broken_connections_are_replaced():
+    pool, opened = _pool(max_size=1)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.healthy = False
+    fresh = pool.acquire()
+    assert fresh is not conn and conn.closed
+    pool.release(fresh, broken=True)
+    assert fresh.closed and pool.stats()["size"] == 0
+
+
+def test_warm_up_and_idle_pruning():
+    pool, opened = _pool(min_size=2, max_size=4, idle_timeout=0)
+    pool.warm_up()
+    assert pool.stats() == {"size": 2, "idle": 2, "in_use": 0, "min_size": 2, "max_size": 4}
+
+    conns = [pool.acquire() for _ in range(4)]
+    for conn in conns:
+        pool.release(conn)
+    pool.acquire()  # 꺼낼 때 idle_timeout 이 지난 것 중 min_size 를 넘는 만큼 닫는다
+    assert pool.stats()["size"] == 2
+    assert sum(conn.closed for conn in opened) == 2
+
+
+def test_close_rejects_new_acquires():
+    pool, opened = _pool()
+    pool.release(pool.acquire())
+    pool.close()
+    assert all(conn.closed for conn in opened)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
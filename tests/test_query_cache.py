@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from db.query_cache import QueryCache, is_cacheable, is_read_only, normalize_sql
+
+
+@pytest.mark.parametrize(
+    "query, normalized",
+    [
+        ("SELECT  *\n  FROM events ;", "select * from events"),
+        ("select 1 -- 주석\n", "select 1"),
+        ("SELECT /* a\n b */ 1", "select 1"),
+        ("SELECT 'Mixed  Case' AS \"Col\" FROM T", "select 'Mixed  Case' as \"Col\" from t"),
+        ("select 'it''s -- not a comment'", "select 'it''s -- not a comment'"),
+    ],
+)
+def test_normalize_sql(query, normalized):
+    assert normalize_sql(query) == normalized
+
+
+def test_normalize_sql_same_key_for_formatting_differences():
+    assert normalize_sql("SELECT a FROM t;") == normalize_sql("select a\nfrom   t")
+
+
+def _read_only(query: str) -> bool:
+    return is_read_only(normalize_sql(query))
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT 1",
+        "EXPLAIN SELECT * FROM events",
+        "EXPLAIN ANALYZE SELECT * FROM events",
+        "SHOW TABLES",
+        "DESCRIBE events",
+        "desc events",
+        "SUMMARIZE events",
+        "PRAGMA table_info('events')",
+        "pragma version",
+    ],
+)
+def test_read_only_heads(query):
+    assert _read_only(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "EXPLAIN ANALYZE DELETE FROM events",
+        "explain (analyze) update events set device = 'pc'",
+        "PRAGMA threads = 4",
+        "pragma enable_profiling",
+        "SHOW TABLES; DROP TABLE events",
+        "INSERT INTO events SELECT * FROM events",
+        "CREATE TABLE t AS SELECT 1",
+        "WITH d AS (DELETE FROM events RETURNING *) SELECT * FROM d",
+    ],
+)
+def test_writes(query):
+    assert not _read_only(query)
+
+
+def test_keywords_inside_literals_do_not_count():
+    assert _read_only("SELECT * FROM events WHERE event_name = 'delete'")
+
+
+def test_volatile_functions_are_not_cached():
+    assert _read_only("SELECT now()")
+    assert not is_cacheable(normalize_sql("SELECT now()"))
+    assert not is_cacheable(normalize_sql("SELECT random() FROM range(3)"))
+
+
+def test_explain_analyze_is_not_cached():
+    assert is_cacheable(normalize_sql("EXPLAIN SELECT 1"))
+    assert not is_cacheable(normalize_sql("EXPLAIN ANALYZE SELECT 1"))
+
+
+class Entry:
+    def __init__(self, nbytes: int):
+        self.nbytes = nbytes
+
+
+def _cache(**options):
+    options.setdefault("max_bytes", 100)
+    options.setdefault("max_entry_bytes", 50)
+    return QueryCache(version_check=60, **options)
+
+
+def test_cache_hit_and_lru_eviction():
+    cache = _cache()
+
+    async def run():
+        keys = [await cache.key("duckdb", f"SELECT {i}") for i in range(3)]
+        for key in keys:
+            cache.put(key, Entry(40))
+        return keys
+
+    keys = asyncio.run(run())
+    # 40 * 3 > 100 → 가장 오래된 것부터 밀려난다
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]).nbytes == 40
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_and_uncacheable_entries_are_skipped():
+    cache = _cache()
+
+    async def run():
+        return await cache.key("duckdb", "SELECT 1"), await cache.key("duckdb", "DELETE FROM t")
+
+    key, write_key = asyncio.run(run())
+    assert write_key is None
+    cache.put(key, Entry(51))
+    assert cache.get(key) is None
+
+
+def test_invalidate_engine_drops_entries_and_in_flight_puts():
+    cache = _cache()
+
+    async def key(engine):
+        return await cache.key(engine, "SELECT 1")
+
+    duck, pg = asyncio.run(key("duckdb")), asyncio.run(key("postgres"))
+    cache.put(duck, Entry(1))
+    cache.put(pg, Entry(1))
+
+    cache.invalidate("postgres")
+    assert cache.get(duck) is not None
+    assert cache.get(pg) is None
+    # 쓰기 전에 만든 키로 끝난 조회 결과는 담지 않는다
+    cache.put(pg, Entry(1))
+    assert cache.get(pg) is None
+    # 새 키는 새 세대
+    new_pg = asyncio.run(key("postgres"))
+    assert new_pg != pg
+    cache.put(new_pg, Entry(1))
+    assert cache.get(new_pg) is not None
+
+
+def test_suspended_disables_cache():
+    cache = _cache()
+    with cache.suspended():
+        assert asyncio.run(cache.key("duckdb", "SELECT 1")) is None
+    assert asyncio.run(cache.key("duckdb", "SELECT 1")) is not None
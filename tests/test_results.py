@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from db.results import ResultSet, spill_rows
+
+COLUMNS = ["n", "s"]
+
+
+def _rows(count):
+    # 따옴표 / 쉼표 / 줄바꿈이 든 값도 한 줄에 한 행으로 기록돼야 한다
+    return [(i, f'v"{i},\n') for i in range(count)]
+
+
+def _spill(tmp_path, rows, page_size, batch_rows=3, **limits):
+    """spill_rows 로 기록한 결과를 ResultSet 으로 읽어 페이지 응답(JSON) 목록으로"""
+    closed = []
+
+    def batches():
+        try:
+            yield COLUMNS
+            for i in range(0, len(rows), batch_rows):
+                yield rows[i:i + batch_rows]
+        finally:
+            closed.append(True)
+
+    path = str(tmp_path / "result.jsonl")
+    progress = spill_rows(batches(), path, page_size, **limits)
+
+    async def run():
+        rs = ResultSet("h", "duckdb", next(progress), page_size, path)
+        for item in progress:
+            await rs.update(*item)
+        await rs.finish()
+        pages = []
+        for page in range(len(rs.offsets) + 1):
+            pages.append(json.loads(await rs.page_body(page)))
+        return rs, pages
+
+    rs, pages = asyncio.run(run())
+    return rs, pages, bool(closed)
+
+
+@pytest.mark.parametrize("count, page_size", [(10, 4), (8, 4), (3, 5), (1, 1)])
+def test_pages_cover_all_rows_in_order(tmp_path, count, page_size):
+    rows = _rows(count)
+    rs, pages, _ = _spill(tmp_path, rows, page_size)
+
+    got = [row for page in pages for row in page["rows"]]
+    assert got == [{"n": n, "s": s} for n, s in rows]
+    for page in pages:
+        assert len(page["rows"]) <= page_size
+        assert page["total_rows"] == count
+        assert page["truncated"] is False
+    # 마지막으로 행이 있는 페이지부터 has_more=False
+    last = (count - 1) // page_size
+    assert [p["has_more"] for p in pages] == [i < last for i in range(len(pages))]
+    assert pages[last + 1]["rows"] == []
+
+
+def test_empty_result(tmp_path):
+    rs, pages, _ = _spill(tmp_path, [], 4)
+    assert pages[0]["rows"] == [] and pages[0]["has_more"] is False
+    assert pages[0]["columns"] == COLUMNS
+
+
+def test_max_rows_truncates_and_closes_stream(tmp_path):
+    rs, pages, closed = _spill(tmp_path, _rows(20), 4, max_rows=6)
+    assert rs.row_count == 6 and rs.truncated
+    assert [len(p["rows"]) for p in pages] == [4, 2, 0]
+    assert pages[0]["truncated"] is True
+    assert closed
+
+
+def test_max_bytes_truncates(tmp_path):
+    rows = _rows(9)
+    line = len(json.dumps(dict(zip(COLUMNS, rows[0])), ensure_ascii=False)) + 1
+    # 상한에 닿기 전까지는 기록한다 (2줄 + 1바이트 → 3행째까지)
+    rs, pages, _ = _spill(tmp_path, rows, 4, max_bytes=2 * line + 1)
+    assert rs.truncated
+    assert rs.row_count == 3
+    assert [r["n"] for p in pages for r in p["rows"]] == [0, 1, 2]
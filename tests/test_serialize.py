@@ -0,0 +1,17 @@
+import json
+import math
+from decimal import Decimal
+
+from utils.serialize import dumps
+
+
+def test_dumps_writes_non_finite_floats_as_null():
+    text = dumps({"a": math.nan, "b": [math.inf, 1.5], "c": (Decimal("NaN"), -math.inf)})
+    assert json.loads(text) == {"a": None, "b": [None, 1.5], "c": [None, None]}
+    assert "NaN" not in text and "Infinity" not in text
+
+
+def test_dumps_keeps_regular_values():
+    assert json.loads(dumps({"n": 1, "f": 0.25, "s": "한글", "none": None})) == {
+        "n": 1, "f": 0.25, "s": "한글", "none": None,
+    }
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import sql
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(sql.router, prefix="/sql")
+    with TestClient(app) as c:
+        yield c
+
+
+def _run(client, query, **options):
+    return client.post("/sql/run", json={"engine": "duckdb", "query": query, **options})
+
+
+@pytest.mark.parametrize(
+    "options", [{"paginate": False}, {}, {"stream": True}, {"profile": True}]
+)
+def test_duckdb_write_then_read(client, options):
+    # 쓰기 문장은 writer cursor 로 (읽기 전용 트랜잭션에서 실패하지 않는다)
+    assert _run(client, "CREATE OR REPLACE TABLE t_write AS SELECT 1 AS v", **options).status_code == 200
+    assert _run(client, "SELECT v FROM t_write", paginate=False).json()["rows"] == [{"v": 1}]
+
+    assert _run(client, "INSERT INTO t_write VALUES (2)", **options).status_code == 200
+    # 쓰기 뒤의 조회는 캐시된 이전 결과가 아니라 새 결과
+    rows = _run(client, "SELECT v FROM t_write ORDER BY v", paginate=False).json()["rows"]
+    assert rows == [{"v": 1}, {"v": 2}]
+
+
+@pytest.mark.parametrize("options", [{"paginate": False}, {}, {"profile": True}])
+def test_duckdb_null_integers_stay_integers(client, options):
+    # pandas 를 거치면 NULL → NaN, 1 → 1.0 이 되어 JSON 이 깨진다
+    r = _run(client, "SELECT NULL::INT AS a UNION ALL SELECT 1 ORDER BY a NULLS FIRST", **options)
+    assert r.status_code == 200
+    assert "NaN" not in r.text
+    assert r.json()["rows"] == [{"a": None}, {"a": 1}]
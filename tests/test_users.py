@@ -0,0 +1,33 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from generator.users import generate_user_table
+from generator.vectorized import users_rng
+
+START = date(2024, 1, 1)
+
+
+def _users(first_day: int, days: int, first_user_id: int = 1):
+    return generate_user_table(
+        users_rng(7, first_day),
+        START + timedelta(days=first_day),
+        days,
+        (50, 100),
+        10_000,
+        first_user_id=first_user_id,
+    )
+
+
+def test_users_rng_is_reproducible():
+    a, b = _users(0, 10), _users(0, 10)
+    assert np.array_equal(a.device_code, b.device_code)
+    assert np.array_equal(a.channel_code, b.channel_code)
+
+
+def test_appended_users_do_not_repeat_initial_attributes():
+    initial = _users(0, 10)
+    appended = _users(10, 10, first_user_id=initial.first_user_id + len(initial))
+    n = min(len(initial), len(appended))
+    assert not np.array_equal(initial.device_code[:n], appended.device_code[:n])
+    assert not np.array_equal(initial.channel_code[:n], appended.channel_code[:n])